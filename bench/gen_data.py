@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# PSAI benchmark data generator.
+#
+# Writes synthetic tools.csv, news_log.json, articles.csv, candidates.json and
+# press.json (headlines as a press feed would deliver them) at a given scale,
+# using the real column lists and item shapes. The mix follows the live data:
+# most tracker rows are pending_review discovery stubs, a minority are approved
+# tools with feeds, repos and star counts.
+#
+#   python bench/gen_data.py --tools 10000 --out /tmp/psai-bench/10000
+
+import argparse, csv, json, os, random, sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from merge_candidates import FIELDNAMES
+
+TOOL_FIELDS = [f for f in FIELDNAMES if f != "Date Added"]  # tools.csv has no Date Added column
+CATEGORIES = ["Editor/IDE", "Agent", "Code Review", "Orchestration", "MCP", "Misc"]
+SOURCE_TYPES = ["Press", "Scraped", ""]
+SEVERITIES = ["Minor"] * 77 + ["Major"] * 15 + ["Security"] * 8
+WORDS = ["code", "pilot", "agent", "mcp", "forge", "review", "lens", "smith", "flow", "cursor", "devin",
+         "sweep", "patch", "stack", "graph", "orchestr", "ide", "assist", "copilot", "chain", "bolt", "tab",
+         "wave", "spark", "nova", "shell", "lint", "test", "docs", "mind", "hub", "kit", "ops", "byte"]
+VERBS = ["adds", "ships", "launches", "fixes", "releases", "introduces", "deprecates", "patches"]
+THINGS = ["multi-file edits", "a CVE fix", "MCP server support", "breaking config changes", "GA release",
+          "faster indexing", "a security patch", "agent mode", "code review bots", "new pricing"]
+
+def monikerize(name):
+    return "".join(c if c.isalnum() else "-" for c in name.lower()).strip("-")
+
+def tool_name(rng, i):
+    n = " ".join(w.capitalize() for w in rng.sample(WORDS, rng.choice([1, 2, 2, 3])))
+    return n if rng.random() < 0.7 else f"{n} {i}"
+
+def gen_tools(rng, n, approved_share=0.1):
+    rows, seen = [], set()
+    for i in range(n):
+        name = tool_name(rng, i)
+        while name.lower() in seen:
+            name = f"{name} {i}"
+        seen.add(name.lower())
+        mon = monikerize(name)
+        approved = rng.random() < approved_share
+        row = {k: "" for k in TOOL_FIELDS}
+        row.update({"Tool": name, "Moniker": mon, "Source Type": rng.choice(SOURCE_TYPES)})
+        if approved:
+            repo = f"https://github.com/{mon}/{mon}"
+            row.update({
+                "Category": rng.choice(CATEGORIES), "Severity": rng.choice(SEVERITIES),
+                "RSS Available": "✅", "Feed URL": f"{repo}/releases.atom" if rng.random() < 0.6 else "",
+                "Tracking Method": "RSS direct", "Repo URL": repo, "Repo Status": "Active",
+                "Stars": str(int(rng.paretovariate(1.2) * 50)), "Contributors": str(rng.randint(1, 900)),
+                "Docs URL": f"https://{mon}.dev/docs", "Website URL": f"https://{mon}.dev",
+            })
+        else:
+            row.update({"Category": "pending_review", "Status": "pending_review", "Discovery Method":
+                        rng.choice(["Auto-Discovery", "site_rescan"]),
+                        "Website URL": f"https://www.producthunt.com/products/{mon}"})
+        rows.append(row)
+    return rows
+
+def gen_log(rng, tools, n, now):
+    approved = [t for t in tools if t["Status"] != "pending_review"] or tools
+    items = []
+    for _ in range(n):
+        t = rng.choice(approved)
+        date = (now - timedelta(days=rng.randint(0, 29))).date().isoformat()
+        items.append({"date": date, "tool": t["Tool"], "moniker": t["Moniker"],
+                      "category": t["Category"] or "Updates", "severity": rng.choice(SEVERITIES),
+                      "headline": f"v{rng.randint(0, 3)}.{rng.randint(0, 99)}.{rng.randint(0, 20)}: {rng.choice(VERBS)} {rng.choice(THINGS)}",
+                      "link": f"{t['Repo URL'] or t['Website URL']}/releases/tag/v{rng.randint(0, 999)}",
+                      "source": t["Feed URL"] or t["Repo URL"]})
+    items.sort(key=lambda x: (x["date"], x["tool"]), reverse=True)
+    return {"items": items}
+
+def gen_articles(rng, n, now):
+    rows = []
+    for i in range(n):
+        title = f"Show HN: {tool_name(rng, i)} – {rng.choice(VERBS)} {rng.choice(THINGS)}"
+        row = {k: "" for k in FIELDNAMES}
+        row.update({"Tool": title, "Moniker": monikerize(title), "Category": "Article", "Severity": "Minor",
+                    "RSS Available": "❌", "Tracking Method": "HTML/Blog", "Website URL": f"https://example.com/a/{i}",
+                    "Source Type": "Press", "Discovery Method": "Auto-Discovery",
+                    "Date Added": (now - timedelta(days=rng.randint(0, 29))).date().isoformat()})
+        rows.append(row)
+    rows.sort(key=lambda r: r["Date Added"])  # the store is date-ordered
+    return rows
+
+def gen_candidates(rng, tools, n):
+    items = []
+    for i in range(n):
+        if i % 4 == 0 and tools:  # some repeats of known tools, as discovery produces
+            t = rng.choice(tools)
+            name, url = t["Tool"], t["Website URL"]
+        else:
+            name = tool_name(rng, i + 10**7)
+            url = f"https://www.producthunt.com/products/{monikerize(name)}" if i % 3 else f"https://{monikerize(name)}.ai"
+        items.append({"tool": name, "moniker": monikerize(name), "category": "pending_review",
+                      "website_url": url, "source_type": "Press", "status": "pending_review"})
+    return {"items": items}
+
+def gen_press(rng, tools, n):
+    names = [t["Tool"] for t in tools]
+    return [f"{rng.choice(names)} {rng.choice(VERBS)} {rng.choice(THINGS)}" if rng.random() < 0.2
+            else f"Show HN: {tool_name(rng, i + 10**8)} {rng.choice(VERBS)} {rng.choice(THINGS)}" for i in range(n)]
+
+def write_csv(path, fields, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields)
+        w.writeheader()
+        w.writerows(rows)
+
+def generate(out, n_tools, seed=1):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    os.makedirs(out, exist_ok=True)
+    tools = gen_tools(rng, n_tools)
+    write_csv(os.path.join(out, "tools.csv"), TOOL_FIELDS, tools)
+    with open(os.path.join(out, "news_log.json"), "w", encoding="utf-8") as f:
+        log = gen_log(rng, tools, max(100, n_tools * 2), now)
+        # Newest first with the "order" marker, as harvest writes it
+        log["items"].sort(key=lambda it: (it.get("date", ""), it.get("tool", "")), reverse=True)
+        json.dump({"order": "date-desc", **log}, f, ensure_ascii=False, indent=2)
+    write_csv(os.path.join(out, "articles.csv"), FIELDNAMES, gen_articles(rng, max(50, n_tools // 2), now))
+    with open(os.path.join(out, "candidates.json"), "w", encoding="utf-8") as f:
+        json.dump(gen_candidates(rng, tools, max(20, n_tools // 10)), f, ensure_ascii=False, indent=2)
+    with open(os.path.join(out, "press.json"), "w", encoding="utf-8") as f:
+        json.dump(gen_press(rng, tools, 500), f, ensure_ascii=False)
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tools", type=int, required=True, help="Number of tracker rows")
+    ap.add_argument("--out", required=True, help="Output directory")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+    generate(args.out, args.tools, args.seed)
+    print(f"Wrote synthetic dataset with {args.tools} tools to {args.out}")
+
+if __name__ == "__main__":
+    main()
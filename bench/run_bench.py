@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# PSAI benchmark suite for the CPU-bound stages.
+#
+# For each scale (number of tracker rows) a synthetic dataset is generated with
+# gen_data.py, then every stage runs in its own subprocess (so module-level
+# config picks up the bench paths and peak memory is per stage). Each stage is
+# timed best-of-N and run once more under tracemalloc for its peak. Results are
+# compared with bench/baseline.json; --check exits non-zero on regressions.
+#
+#   python bench/run_bench.py                          # 1k, 10k, 100k
+#   python bench/run_bench.py --scales 1000 --check
+#   python bench/run_bench.py --scales 1000,10000 --update-baseline
+
+import argparse, json, os, shutil, subprocess, sys, tempfile, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.join(HERE, "..", "scripts")
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+
+def _copy(data, work, *names):
+    for n in names:
+        shutil.copyfile(os.path.join(data, n), os.path.join(work, n))
+
+def _clear_cache():
+    import datacache
+    datacache.clear()
+
+# Each stage takes (data_dir, work_dir) and returns (setup, run); setup is untimed and runs before every repeat.
+
+def stage_merge(data, work):
+    import merge_candidates as m
+    m.IN_CANDIDATES = os.path.join(work, "candidates.json")
+    m.IN_TOOLS = m.OUT_TOOLS = os.path.join(work, "tools.csv")
+    m.IN_ARTICLES = m.OUT_ARTICLES = os.path.join(work, "articles.csv")
+    return (lambda: _copy(data, work, "tools.csv", "articles.csv", "candidates.json")), m.main
+
+def stage_harvest_match(data, work):
+    from harvest import match_tool
+    from datacache import load_csv
+    tools = load_csv(os.path.join(data, "tools.csv"))
+    names = {t["Tool"].lower() for t in tools if t.get("Status") != "pending_review"}
+    with open(os.path.join(data, "press.json"), encoding="utf-8") as f:
+        headlines = json.load(f)
+    return (lambda: None), (lambda: sum(1 for h in headlines if match_tool(h, names)))
+
+def stage_latest_per_tool(data, work):
+    from update_tracker import latest_per_tool
+    with open(os.path.join(data, "news_log.json"), encoding="utf-8") as f:
+        items = json.load(f)["items"]
+    return (lambda: None), (lambda: latest_per_tool(items))
+
+def stage_tracker(data, work):
+    import update_tracker
+    index = os.path.join(work, "latest_per_tool.json")
+    def setup():
+        _copy(data, work, "tools.csv")
+        if os.path.exists(index): os.remove(index)
+        _clear_cache()
+    args = ["--tracker", os.path.join(work, "tools.csv"), "--log", os.path.join(data, "news_log.json"),
+            "--index", index, "--out", os.path.join(work, "tools.csv")]
+    return setup, (lambda: update_tracker.main(args))
+
+def stage_include_row(data, work):
+    from build_sources_pages import include_row
+    from datacache import load_csv
+    rows = load_csv(os.path.join(data, "tools.csv"))
+    return (lambda: None), (lambda: sum(1 for r in rows if include_row(r)))
+
+def stage_render_feed(data, work):
+    import build_feed_from_log
+    return _clear_cache, (lambda: build_feed_from_log.main(["--site", "https://bench.invalid"]))
+
+def stage_render_sources(data, work):
+    import build_sources_pages
+    return _clear_cache, build_sources_pages.main
+
+def stage_render_articles(data, work):
+    import build_articles_page
+    return (lambda: None), build_articles_page.main
+
+def stage_cold_load(data, work):
+    # A fresh process's first load of the big files, served from their snapshots
+    import datacache, snapshot
+    from tool_registry import load_registry
+    def run():
+        datacache.load_csv(os.path.join(data, "tools.csv"))
+        datacache.load_json(os.path.join(data, "news_log.json"), {})
+        load_registry(os.path.join(data, "tools.csv"))
+    run()  # writes the snapshots
+    return _clear_cache, run
+
+STAGES = {
+    "merge_candidates": stage_merge,
+    "harvest_match": stage_harvest_match,
+    "latest_per_tool": stage_latest_per_tool,
+    "update_tracker": stage_tracker,
+    "include_row": stage_include_row,
+    "render_feed": stage_render_feed,
+    "render_sources": stage_render_sources,
+    "render_articles": stage_render_articles,
+    "cold_load": stage_cold_load,
+}
+
+def bench_env(data, work, stage):
+    """Points every script's env-configured path at the bench directories."""
+    env = dict(os.environ)
+    env.update({
+        "PSAI_TOOLS_CSV": os.path.join(data, "tools.csv"),
+        "PSAI_LOG_PATH": os.path.join(data, "news_log.json"),
+        "PSAI_ARTICLES_CSV": os.path.join(data, "articles.csv"),
+        "PSAI_LATEST_INDEX": os.path.join(work, "missing_latest_per_tool.json"),
+        "PSAI_FEED_JSON": os.path.join(work, "public", "feed.json"),
+        "PSAI_FEED_RSS": os.path.join(work, "public", "rss.xml"),
+        "PSAI_FEEDS_DIR": os.path.join(work, "public", "feeds"),
+        "PSAI_INDEX": os.path.join(work, "public", "index.html"),
+        "PSAI_OUT_LIST": os.path.join(work, "public", "sources.html"),
+        "PSAI_OUT_TABLE": os.path.join(work, "public", "sources_table.html"),
+        "PSAI_SOURCES_JSON": os.path.join(work, "public", "sources.json"),
+        "PSAI_ARTICLES_HTML": os.path.join(work, "public", "articles.html"),
+        "PSAI_ARTICLES_ARCHIVE": os.path.join(work, "articles_archive.csv.gz"),
+        "PSAI_METRICS_PATH": os.path.join(work, "metrics.json"),
+        "PSAI_METRICS_HISTORY": os.path.join(work, "metrics_history.json"),
+        "PSAI_METRICS_FETCHES": os.path.join(work, "metrics_fetches.json"),
+        "PSAI_STATE_DIR": os.path.join(work, ".psai"),
+        "PSAI_HARVEST_JOURNAL": "",
+        # Only cold_load measures snapshots; the other stages keep timing the parsers
+        "PSAI_SNAPSHOT_DIR": os.path.join(work, ".psai", "snapshots") if stage == "cold_load" else "",
+        "PSAI_PROFILE": "",
+    })
+    return env
+
+def run_child(stage, data, work, repeat):
+    import io, contextlib, tracemalloc
+    sys.path.insert(0, SCRIPTS)
+    setup, run = STAGES[stage](data, work)
+    best = None
+    sink = io.StringIO()
+    for _ in range(repeat):
+        setup()
+        with contextlib.redirect_stdout(sink):
+            t0 = time.perf_counter()
+            run()
+            dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+        sink.seek(0); sink.truncate()
+    setup()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(sink):
+        run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(json.dumps({"seconds": round(best, 4), "peak_kb": round(peak / 1024, 1)}))
+
+def bench_scale(scale, stages, repeat, root):
+    sys.path.insert(0, HERE)
+    from gen_data import generate
+    data = generate(os.path.join(root, str(scale), "data"), scale)
+    results = {}
+    for stage in stages:
+        work = os.path.join(root, str(scale), "work", stage)
+        os.makedirs(os.path.join(work, "public"), exist_ok=True)
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", stage, "--data", data, "--work", work,
+               "--repeat", str(repeat)]
+        p = subprocess.run(cmd, env=bench_env(data, work, stage), cwd=work, capture_output=True, text=True)
+        if p.returncode != 0:
+            results[stage] = {"error": (p.stderr.strip().splitlines() or ["failed"])[-1]}
+        else:
+            results[stage] = json.loads(p.stdout.strip().splitlines()[-1])
+        r = results[stage]
+        print(f"  {scale:>7} {stage:<17} " + (f"{r['seconds']:>9.4f}s {r['peak_kb'] / 1024:>8.1f} MB" if "seconds" in r else f"ERROR {r['error']}"),
+              flush=True)
+    return results
+
+def compare(results, baseline, tolerance, min_delta_s):
+    """Returns a list of human-readable regressions against the baseline."""
+    out = []
+    for scale, stages in results.items():
+        for stage, r in stages.items():
+            b = baseline.get("scales", {}).get(scale, {}).get(stage)
+            if not b or "seconds" not in r or "seconds" not in b:
+                continue
+            if r["seconds"] > b["seconds"] * (1 + tolerance) and r["seconds"] - b["seconds"] > min_delta_s:
+                out.append(f"{scale} {stage}: {r['seconds']:.4f}s vs baseline {b['seconds']:.4f}s")
+            if r["peak_kb"] > b["peak_kb"] * (1 + tolerance) and r["peak_kb"] - b["peak_kb"] > 1024:
+                out.append(f"{scale} {stage}: peak {r['peak_kb'] / 1024:.1f} MB vs baseline {b['peak_kb'] / 1024:.1f} MB")
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="PSAI synthetic-scale benchmarks")
+    ap.add_argument("--scales", default="1000,10000,100000", help="Comma-separated tracker sizes")
+    ap.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed repeats per stage (best is kept)")
+    ap.add_argument("--baseline", default=BASELINE_PATH)
+    ap.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown before flagging (0.5 = +50%%)")
+    ap.add_argument("--min-delta", type=float, default=0.02, help="Ignore regressions smaller than this many seconds")
+    ap.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    ap.add_argument("--check", action="store_true", help="Exit 1 when a stage regressed against the baseline")
+    ap.add_argument("--out", help="Also write the results as JSON here")
+    ap.add_argument("--keep", action="store_true", help="Keep the generated data directory")
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    ap.add_argument("--data", help=argparse.SUPPRESS)
+    ap.add_argument("--work", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, args.data, args.work, args.repeat)
+        return 0
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {', '.join(unknown)}. Known: {', '.join(STAGES)}")
+    root = tempfile.mkdtemp(prefix="psai-bench-")
+    results = {}
+    try:
+        for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+            print(f"--- {scale} tools ---", flush=True)
+            results[str(scale)] = bench_scale(scale, stages, args.repeat, root)
+    finally:
+        if args.keep:
+            print(f"Bench data kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"scales": results}, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance, args.min_delta)
+    for r in regressions:
+        print(f"! Regression: {r}")
+    if not regressions and baseline:
+        print("No regressions against baseline.")
+
+    if args.update_baseline:
+        merged = baseline.get("scales", {})
+        for scale, stages_res in results.items():
+            merged.setdefault(scale, {}).update({k: v for k, v in stages_res.items() if "seconds" in v})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "scales": merged}, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+    return 1 if (args.check and regressions) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# PSAI: alert engine over the items harvest added since the last run.
+#
+# harvest appends every new item to data/new_items.jsonl; this reads the queue
+# from the byte offset kept in data/alert_state.json, so a run costs O(new
+# items) and an item is never evaluated twice. Rules come from
+# data/alert_rules.csv:
+#
+#   name,tools,severities,min_items,window_h,sinks
+#   major-security-burst,*,Major|Security,3,24,file|smtp|github
+#
+# A rule keeps the matching items queued within its last window_h hours; once
+# there are min_items of them and at least one has not been alerted on, one
+# alert goes out listing the window. Items already alerted on never trigger
+# again, and alert keys already sent are remembered for 30 days. Alerts wait
+# in an outbox until every sink named by the rule has taken them: a failed
+# sink is retried on the next run, up to PSAI_ALERT_MAX_ATTEMPTS times.
+#
+# Sinks (skipped when not configured):
+#   file    - appends to PSAI_ALERT_FILE (default .psai/alerts.log)
+#   smtp    - SMTP_SERVER, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, MAIL_FROM, MAIL_TO
+#             (PSAI_SMTP_STARTTLS=0 for a local server without TLS)
+#   github  - opens an issue in GITHUB_REPOSITORY using GITHUB_TOKEN / GH_TOKEN
+#   webhook - POSTs {"text", "alert"} JSON to PSAI_ALERT_WEBHOOK
+# Every sink can be pointed at scripts/standin_server.py (--base-url for the
+# HTTP sinks, --smtp-port for mail).
+
+import argparse, csv, hashlib, json, os, smtplib
+from datetime import datetime, timedelta, timezone
+from email.mime.text import MIMEText
+import metrics, news_log
+
+RULES_PATH = os.getenv("PSAI_ALERT_RULES", "data/alert_rules.csv")
+STATE_PATH = os.getenv("PSAI_ALERT_STATE", "data/alert_state.json")
+FILE_SINK_PATH = os.getenv("PSAI_ALERT_FILE", ".psai/alerts.log")
+WEBHOOK_URL = os.getenv("PSAI_ALERT_WEBHOOK", "")
+GITHUB_API = os.getenv("PSAI_GITHUB_API", "https://api.github.com").rstrip("/")
+MAX_ATTEMPTS = int(os.getenv("PSAI_ALERT_MAX_ATTEMPTS", "5"))
+SENT_KEEP_D = 30
+TS = "%Y-%m-%dT%H:%M:%SZ"
+
+def parse_ts(s):
+    try:
+        return datetime.strptime(s, TS).replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+def _set(cell):
+    vals = {v.strip() for v in (cell or "").split("|") if v.strip()}
+    return None if not vals or "*" in vals else vals
+
+class Rule:
+    def __init__(self, row):
+        self.name = row["name"].strip()
+        self.tools = _set(row.get("tools"))
+        self.severities = _set(row.get("severities"))
+        self.min_items = max(1, int(row.get("min_items") or 1))
+        self.window = timedelta(hours=float(row.get("window_h") or 24))
+        self.sinks = sorted(_set(row.get("sinks")) or {"file"})
+
+    def matches(self, it):
+        return ((self.tools is None or it.get("tool") in self.tools)
+                and (self.severities is None or it.get("severity") in self.severities))
+
+    def subject(self, n):
+        what = "/".join(sorted(self.severities)) if self.severities else "new"
+        who = f" for {', '.join(sorted(self.tools))}" if self.tools else ""
+        return f"PSAI Alert: {n} {what} update(s){who} in {self.window.total_seconds() / 3600:g}h"
+
+def load_rules(path=RULES_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return [Rule(r) for r in csv.DictReader(f) if (r.get("name") or "").strip()]
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        state = {}
+    for k, v in (("cursor", 0), ("head", ""), ("windows", {}), ("outbox", []), ("sent", {})):
+        state.setdefault(k, v)
+    return state
+
+def save_state(state, path=STATE_PATH):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+def evaluate(rules, state, items, now):
+    """New alerts for items (just read from the queue); updates the rule windows in state."""
+    out = []
+    queued = {a["key"] for a in state["outbox"]} | state["sent"].keys()
+    for rule in rules:
+        cut = now - rule.window
+        win = [w for w in state["windows"].get(rule.name, []) if (parse_ts(w["queued"]) or now) >= cut]
+        for it in items:
+            if rule.matches(it) and (parse_ts(it.get("queued")) or now) >= cut:
+                win.append({"id": news_log.item_key(it), "queued": it.get("queued") or now.strftime(TS),
+                            **{k: it.get(k, "") for k in ("date", "tool", "severity", "headline", "link")}})
+        fresh = [w for w in win if not w.get("alerted")]
+        if len(win) >= rule.min_items and fresh:
+            key = hashlib.sha1("|".join([rule.name] + sorted(w["id"] for w in win)).encode("utf-8")).hexdigest()[:16]
+            if key not in queued:
+                lines = [f"{'* ' if not w.get('alerted') else '  '}[{w['date']}] {w['tool']} — {w['headline']} ({w['severity']})"
+                         + (f"\n    {w['link']}" if w["link"] else "") for w in win]
+                out.append({"key": key, "rule": rule.name, "created": now.strftime(TS), "subject": rule.subject(len(win)),
+                            "text": "\n".join(lines), "items": [w["id"] for w in win], "pending": rule.sinks, "attempts": 0})
+                queued.add(key)
+            for w in fresh:
+                w["alerted"] = True
+        state["windows"][rule.name] = win
+    return out
+
+class FileSink:
+    name = "file"
+    def configured(self):
+        return bool(FILE_SINK_PATH)
+    def send(self, alert):
+        os.makedirs(os.path.dirname(FILE_SINK_PATH) or ".", exist_ok=True)
+        with open(FILE_SINK_PATH, "a", encoding="utf-8") as f:
+            f.write(f"== {alert['created']} {alert['subject']}\n{alert['text']}\n\n")
+
+class SmtpSink:
+    name = "smtp"
+    def configured(self):
+        return all(os.getenv(k) for k in ("SMTP_SERVER", "MAIL_FROM", "MAIL_TO"))
+    def send(self, alert):
+        msg = MIMEText(alert["text"], "plain", "utf-8")
+        msg["Subject"] = alert["subject"]
+        msg["From"] = os.getenv("MAIL_FROM")
+        msg["To"] = os.getenv("MAIL_TO")
+        with smtplib.SMTP(os.getenv("SMTP_SERVER"), int(os.getenv("SMTP_PORT") or 587), timeout=30) as s:
+            if os.getenv("PSAI_SMTP_STARTTLS", "1") != "0":
+                s.starttls()
+            if os.getenv("SMTP_USERNAME"):
+                s.login(os.getenv("SMTP_USERNAME"), os.getenv("SMTP_PASSWORD", ""))
+            s.sendmail(msg["From"], [a.strip() for a in msg["To"].split(",")], msg.as_string())
+
+def _post(url, payload, headers=None):
+    import httpclient  # needs requests; only the HTTP sinks load it
+    r = httpclient.post(url, json=payload, headers=headers)
+    r.raise_for_status()
+    return r
+
+class GitHubIssueSink:
+    name = "github"
+    def token(self):
+        return os.getenv("GITHUB_TOKEN") or os.getenv("GH_TOKEN")
+    def configured(self):
+        return bool(self.token() and os.getenv("GITHUB_REPOSITORY"))
+    def send(self, alert):
+        r = _post(f"{GITHUB_API}/repos/{os.getenv('GITHUB_REPOSITORY')}/issues",
+                  {"title": alert["subject"], "body": f"```\n{alert['text']}\n```", "labels": ["psai-alert"]},
+                  {"Authorization": f"Bearer {self.token()}", "Accept": "application/vnd.github+json"})
+        print(f"  Opened {r.json().get('html_url', 'issue')}")
+
+class WebhookSink:
+    name = "webhook"
+    def configured(self):
+        return bool(WEBHOOK_URL)
+    def send(self, alert):
+        _post(WEBHOOK_URL, {"text": f"{alert['subject']}\n{alert['text']}", "alert": alert})
+
+SINKS = {cls.name: cls for cls in (FileSink, SmtpSink, GitHubIssueSink, WebhookSink)}
+
+def deliver(state, now):
+    """Sends every outbox alert to its pending sinks; done alerts move to state["sent"]."""
+    left = []
+    for alert in state["outbox"]:
+        alert["attempts"] += 1
+        for name in list(alert["pending"]):
+            sink = SINKS.get(name)
+            if sink is None or not sink().configured():
+                print(f"  - {alert['key']}: sink '{name}' not configured, skipped")
+                alert["pending"].remove(name)
+                continue
+            try:
+                sink().send(alert)
+            except Exception as e:
+                print(f"  ! {alert['key']}: {name} failed (attempt {alert['attempts']}): {e}")
+                continue
+            alert["pending"].remove(name)
+            metrics.count("alerts_sent")
+            print(f"  + {alert['key']}: sent via {name}")
+        if alert["pending"] and alert["attempts"] < MAX_ATTEMPTS:
+            left.append(alert)
+        else:
+            state["sent"][alert["key"]] = now.strftime(TS)
+    state["outbox"] = left
+    keep = now - timedelta(days=SENT_KEEP_D)
+    state["sent"] = {k: t for k, t in state["sent"].items() if (parse_ts(t) or now) >= keep}
+
+@metrics.instrumented("alerts")
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Evaluate alert rules over newly harvested items and deliver alerts")
+    ap.add_argument("--rules", default=RULES_PATH)
+    ap.add_argument("--state", default=STATE_PATH)
+    ap.add_argument("--queue", default=news_log.QUEUE_PATH, help="new_items.jsonl written by harvest")
+    ap.add_argument("--base-url", default=os.getenv("PSAI_BASE_URL", ""), help="Send the HTTP sinks to a stand-in server")
+    ap.add_argument("--dry-run", action="store_true", help="Print the alerts that would be sent; change nothing")
+    args = ap.parse_args(argv)
+    if args.base_url:
+        import httpclient
+        httpclient.set_base_url(args.base_url)
+
+    now = datetime.now(timezone.utc)
+    rules = load_rules(args.rules)
+    state = load_state(args.state)
+    head = news_log.queue_head(args.queue)
+    cursor = state["cursor"] if state["head"] == head else 0
+    items, cursor = news_log.read_new(args.queue, cursor)
+    metrics.count("items_parsed", len(items))
+    alerts = evaluate(rules, state, items, now)
+    print(f"{len(items)} new item(s), {len(rules)} rule(s), {len(alerts)} new alert(s), {len(state['outbox'])} waiting")
+    if args.dry_run:
+        for a in alerts:
+            print(f"\n{a['subject']} -> {', '.join(a['pending'])}\n{a['text']}")
+        return
+    state["outbox"].extend(alerts)
+    deliver(state, now)
+    # Everything read: start the queue over so it never grows past one day's items
+    if cursor and cursor == os.path.getsize(args.queue):
+        open(args.queue, "w").close()
+        cursor = 0
+    state.update(cursor=cursor, head=news_log.queue_head(args.queue), updated=now.strftime(TS))
+    save_state(state, args.state)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# PSAI: date-ordered articles store (data/articles.csv).
+#
+# Invariant: one physical line per record, rows ascending by "Date Added" (ISO
+# YYYY-MM-DD, so string order is date order). Appends keep the order, pruning
+# finds the cutoff with a binary search and moves the expired prefix into a
+# gzip archive, and readers can walk the file newest-first without sorting.
+
+import csv, gzip, io, os, bisect
+from datetime import datetime, timedelta, timezone
+
+DATE_FIELD = "Date Added"
+ARCHIVE_PATH = os.getenv("PSAI_ARTICLES_ARCHIVE", "data/articles_archive.csv.gz")
+
+def _one_line(v):
+    v = "" if v is None else str(v)
+    return " ".join(v.split()) if ("\n" in v or "\r" in v) else v
+
+def _format(values):
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerow([_one_line(v) for v in values])
+    return buf.getvalue()
+
+def _parse(line):
+    return next(csv.reader([line]), [])
+
+def _split(text):
+    # Records end at "\n" only: str.splitlines would also break on \x0c, \x85,
+    # \u2028 and the like, which can sit inside a title
+    lines = [l + "\n" for l in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    return [l for l in lines if l]
+
+def read_lines(path):
+    """Returns (header line, record lines) without parsing the records."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        lines = _split(f.read())
+    if not lines:
+        return "", []
+    return lines[0], [l for l in lines[1:] if l.strip()]
+
+def _date_of(fields, date_col):
+    return fields[date_col] if date_col < len(fields) else ""
+
+def _dated(d):
+    try:
+        datetime.strptime(d, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+def _header(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        first = f.readline()
+    return _parse(first), first
+
+def _write(path, head_line, lines):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.write(head_line)
+        f.writelines(lines)
+    os.replace(tmp, path)
+
+def _last_date(path, date_col):
+    # Read just the tail of the file to find the newest date.
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - 65536))
+        tail = f.read().decode("utf-8", errors="replace").split("\n")
+    # tail[0] is either the header or a partial line
+    for line in reversed(tail[1:]):
+        if line.strip():
+            return _date_of(_parse(line), date_col)
+    return ""
+
+def append_articles(path, fieldnames, rows):
+    """Appends rows keeping the store date-ordered. Missing dates become today."""
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    rows = [dict(r, **{DATE_FIELD: r.get(DATE_FIELD) or today}) for r in rows]
+    rows.sort(key=lambda r: r[DATE_FIELD])
+    if not rows:
+        return
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(_format(fieldnames))
+            f.writelines(_format([r.get(k, "") for k in fieldnames]) for r in rows)
+        return
+
+    header, _ = _header(path)
+    date_col = header.index(DATE_FIELD)
+    if rows[0][DATE_FIELD] >= _last_date(path, date_col):
+        # Common case: everything new is dated today, so a plain append keeps the order.
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            f.writelines(_format([r.get(k, "") for k in header]) for r in rows)
+        return
+
+    # Back-dated rows: merge them in at their sorted position.
+    head_line, lines = read_lines(path)
+    keys = [_date_of(_parse(l), date_col) for l in lines]
+    for r in rows:
+        i = bisect.bisect_right(keys, r[DATE_FIELD])
+        keys.insert(i, r[DATE_FIELD])
+        lines.insert(i, _format([r.get(k, "") for k in header]))
+    _write(path, head_line, lines)
+
+def cutoff_index(lines, date_col, cutoff):
+    """Index of the first record dated after cutoff; only O(log n) lines are parsed."""
+    return bisect.bisect_right(lines, cutoff, key=lambda l: _date_of(_parse(l), date_col))
+
+def prune(path, days, archive_path=ARCHIVE_PATH):
+    """Moves rows older than `days` into the gzip archive. Returns (pruned, kept)."""
+    head_line, lines = read_lines(path)
+    header = _parse(head_line)
+    if DATE_FIELD not in header:
+        raise ValueError(f"'{DATE_FIELD}' column not found")
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d")
+    date_col = header.index(DATE_FIELD)
+    cut = cutoff_index(lines, date_col, cutoff)
+    # Rows with no or a malformed date sort before the cutoff too; they stay (at the front, keeping the order)
+    old, undated = [], []
+    for l in lines[:cut]:
+        (old if _dated(_date_of(_parse(l), date_col)) else undated).append(l)
+    if not old:
+        return 0, len(lines)
+
+    os.makedirs(os.path.dirname(archive_path) or ".", exist_ok=True)
+    new_archive = not os.path.exists(archive_path)
+    # Each run appends a new gzip member; gzip readers see one continuous CSV.
+    with gzip.open(archive_path, "at", encoding="utf-8", newline="") as gz:
+        if new_archive:
+            gz.write(head_line)
+        gz.writelines(old)
+    _write(path, head_line, undated + lines[cut:])
+    return len(old), len(lines) - len(old)
+
+def iter_newest_first(path):
+    """Yields row dicts newest-first straight from the ordered store."""
+    head_line, lines = read_lines(path)
+    header = _parse(head_line)
+    for line in reversed(lines):
+        yield dict(zip(header, _parse(line)))
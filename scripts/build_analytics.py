@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# PSAI: release-velocity analytics over news_log.json -> data/analytics.json.
+#
+# The last PSAI_ANALYTICS_DAYS (default 90) of items from the log (plus any
+# extra --log files, e.g. older shards) are loaded into columns: days ago,
+# tool code, category code, severity code. Per tool, in one pass over those
+# columns: items in the last 7 days and the 7 before (acceleration = the
+# difference), items in 30 days, mean days between items (cadence) and the
+# severity mix over the last 14 days. The hot score ranks tools for the
+# dashboard:  last7 + max(0, acceleration) + 2 * security14 + major14.
+# Per category, daily item counts over the last 30 days feed the trend charts.
+#
+# NumPy is used when installed (bincount / ufunc.at); otherwise the same
+# numbers come from a plain-Python pass.
+
+import argparse, json, os
+from array import array
+from datetime import date, datetime, timezone
+import metrics, news_log
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LOG_PATH = os.getenv("PSAI_LOG_PATH", "data/news_log.json")
+OUT_PATH = os.getenv("PSAI_ANALYTICS", "data/analytics.json")
+HISTORY_DAYS = int(os.getenv("PSAI_ANALYTICS_DAYS", "90"))
+TREND_DAYS = 30
+HOT_LIMIT = 15
+SEVERITIES = ("Minor", "Major", "Security")
+
+class Columns:
+    def __init__(self):
+        self.age = array("i")
+        self.tool = array("i")
+        self.cat = array("i")
+        self.sev = array("b")
+        self.tools, self.cats = [], []
+        self._tool_code, self._cat_code = {}, {}
+        self.tool_cat = []
+
+    def _code(self, codes, names, key):
+        c = codes.get(key)
+        if c is None:
+            c = codes[key] = len(names)
+            names.append(key)
+        return c
+
+    def add(self, it, today):
+        try:
+            age = (today - date.fromisoformat(it.get("date", "")[:10])).days
+        except ValueError:
+            return
+        if age < 0:
+            age = 0
+        cat = self._code(self._cat_code, self.cats, it.get("category") or "Other")
+        t = self._code(self._tool_code, self.tools, it.get("tool") or "")
+        if t == len(self.tool_cat):
+            self.tool_cat.append(cat)
+        self.age.append(age)
+        self.tool.append(t)
+        self.cat.append(cat)
+        sev = it.get("severity")
+        self.sev.append(SEVERITIES.index(sev) if sev in SEVERITIES else 0)
+
+def load_columns(paths, today, days=HISTORY_DAYS):
+    cols = Columns()
+    since = date.fromordinal(today.toordinal() - days + 1).isoformat()
+    for path in paths:
+        if os.path.exists(path):
+            for it in news_log.iter_items(path, since=since):
+                cols.add(it, today)
+    return cols
+
+def _stats_numpy(c):
+    n, ncat = len(c.tools), len(c.cats)
+    age = np.frombuffer(c.age, dtype=np.int32)
+    tool = np.frombuffer(c.tool, dtype=np.int32)
+    cat = np.frombuffer(c.cat, dtype=np.int32)
+    sev = np.frombuffer(c.sev, dtype=np.int8).astype(np.int32)
+    def per_tool(mask):
+        return np.bincount(tool[mask], minlength=n)
+    last7 = per_tool(age < 7)
+    prev7 = per_tool((age >= 7) & (age < 14))
+    last30 = per_tool(age < 30)
+    recent = age < 14
+    mix = np.bincount(tool[recent] * 3 + sev[recent], minlength=3 * n).reshape(n, 3)
+    total = np.bincount(tool, minlength=n)
+    newest = np.full(n, np.iinfo(np.int32).max, dtype=np.int32)
+    oldest = np.zeros(n, dtype=np.int32)
+    np.minimum.at(newest, tool, age)
+    np.maximum.at(oldest, tool, age)
+    cadence = (oldest - newest) / np.maximum(total - 1, 1)
+    accel = last7 - prev7
+    score = last7 + np.maximum(accel, 0) + 2 * mix[:, 2] + mix[:, 1]
+    t = age < TREND_DAYS
+    trend = np.bincount(cat[t] * TREND_DAYS + (TREND_DAYS - 1 - age[t]), minlength=ncat * TREND_DAYS).reshape(ncat, TREND_DAYS)
+    return {"last7": last7.tolist(), "prev7": prev7.tolist(), "last30": last30.tolist(), "total": total.tolist(),
+            "newest": newest.tolist(), "cadence": cadence.tolist(), "accel": accel.tolist(),
+            "mix": mix.tolist(), "score": score.tolist(), "trend": trend.tolist()}
+
+def _stats_python(c):
+    n, ncat = len(c.tools), len(c.cats)
+    last7, prev7, last30, total = [0] * n, [0] * n, [0] * n, [0] * n
+    newest, oldest = [1 << 31] * n, [0] * n
+    mix = [[0, 0, 0] for _ in range(n)]
+    trend = [[0] * TREND_DAYS for _ in range(ncat)]
+    for age, t, ct, s in zip(c.age, c.tool, c.cat, c.sev):
+        total[t] += 1
+        if age < newest[t]: newest[t] = age
+        if age > oldest[t]: oldest[t] = age
+        if age < 7: last7[t] += 1
+        elif age < 14: prev7[t] += 1
+        if age < 14: mix[t][s] += 1
+        if age < 30: last30[t] += 1
+        if age < TREND_DAYS: trend[ct][TREND_DAYS - 1 - age] += 1
+    accel = [a - b for a, b in zip(last7, prev7)]
+    cadence = [(o - w) / max(k - 1, 1) for o, w, k in zip(oldest, newest, total)]
+    score = [l + max(a, 0) + 2 * m[2] + m[1] for l, a, m in zip(last7, accel, mix)]
+    return {"last7": last7, "prev7": prev7, "last30": last30, "total": total, "newest": newest,
+            "cadence": cadence, "accel": accel, "mix": mix, "score": score, "trend": trend}
+
+def compute(cols, today, limit=HOT_LIMIT):
+    s = (_stats_numpy if np is not None else _stats_python)(cols)
+    order = sorted(range(len(cols.tools)), key=lambda i: (-s["score"][i], s["newest"][i], cols.tools[i]))
+    hot = []
+    for i in order[:limit]:
+        if s["score"][i] <= 0:
+            break
+        hot.append({"tool": cols.tools[i], "category": cols.cats[cols.tool_cat[i]], "score": int(s["score"][i]),
+                    "last7": int(s["last7"][i]), "prev7": int(s["prev7"][i]), "last30": int(s["last30"][i]),
+                    "accel": int(s["accel"][i]), "cadence_days": round(float(s["cadence"][i]), 2),
+                    "severity_mix": dict(zip(SEVERITIES, (int(x) for x in s["mix"][i])))})
+    trends = {cols.cats[k]: [int(x) for x in row] for k, row in enumerate(s["trend"]) if any(row)}
+    return {"generated": today.isoformat(), "items": len(cols.age), "tools": len(cols.tools),
+            "engine": "numpy" if np is not None else "python", "trend_days": TREND_DAYS,
+            "hot": hot, "category_trends": dict(sorted(trends.items(), key=lambda kv: -sum(kv[1])))}
+
+@metrics.instrumented("analytics")
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--log", action="append", help="news_log.json (repeat to add older shards)")
+    ap.add_argument("--out", default=OUT_PATH)
+    ap.add_argument("--days", type=int, default=HISTORY_DAYS, help="History window in days")
+    args = ap.parse_args(argv)
+    today = datetime.now(timezone.utc).date()
+    cols = load_columns(args.log or [LOG_PATH], today, args.days)
+    result = compute(cols, today)
+    metrics.count("items_parsed", result["items"])
+    tmp = args.out + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, args.out)
+    print(f"Analytics over {result['items']} items / {result['tools']} tools ({result['engine']}) -> {args.out}")
+
+if __name__ == "__main__":
+    main()
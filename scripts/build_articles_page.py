@@ -1,6 +1,7 @@
 #!/usr/bin/env python
-import csv, os, html
-from datetime import datetime, timezone
+import os, html
+import metrics
+from articles_store import iter_newest_first
 
 # I/O Configuration
 IN_CSV   = os.getenv("PSAI_ARTICLES_CSV", "data/articles.csv")
@@ -62,6 +63,7 @@ def build_page(rows_html):
   </div>
 """ + HTML_FOOT
 
+@metrics.instrumented("build_articles")
 def main():
     if not os.path.exists(IN_CSV):
         print(f"Articles file not found at {IN_CSV}. Skipping page generation.")
@@ -70,39 +72,35 @@ def main():
         open(OUT_HTML, "w", encoding="utf-8").write(build_page("<tr><td colspan='4'>No articles found.</td></tr>"))
         return
 
-    with open(IN_CSV, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-
-    # Sort by date, most recent first
-    rows.sort(key=lambda r: r.get("Date Added", ""), reverse=True)
-
+    # articles.csv is kept date-ordered (see articles_store), so walking it backwards is newest-first
     row_html_parts = []
-    if not rows:
-        row_html_parts.append("<tr><td colspan='4'>No articles found.</td></tr>")
-    else:
-        for r in rows:
-            date = html.escape(r.get("Date Added", ""))
-            title = html.escape(r.get("Tool", "")) # The 'Tool' column holds the title for articles
-            source = html.escape(r.get("Source Type", "Unknown"))
-            link = html.escape(r.get("Website URL", "#"))
-            link_html = f'<a href="{link}" target="_blank" rel="noopener">{link}</a>' if link != "#" else "N/A"
+    count = 0
+    for r in iter_newest_first(IN_CSV):
+        date = html.escape(r.get("Date Added", ""))
+        title = html.escape(r.get("Tool", "")) # The 'Tool' column holds the title for articles
+        source = html.escape(r.get("Source Type", "Unknown"))
+        link = html.escape(r.get("Website URL", "#"))
+        link_html = f'<a href="{link}" target="_blank" rel="noopener">{link}</a>' if link != "#" else "N/A"
 
-            row_html_parts.append(f"""
+        row_html_parts.append(f"""
             <tr>
               <td>{date}</td>
               <td>{title}</td>
               <td>{source}</td>
               <td>{link_html}</td>
             </tr>""")
+        count += 1
+    if not count:
+        row_html_parts.append("<tr><td colspan='4'>No articles found.</td></tr>")
 
+    metrics.count("items_rendered", count)
     final_html = build_page("".join(row_html_parts))
 
     os.makedirs(os.path.dirname(OUT_HTML), exist_ok=True)
     with open(OUT_HTML, "w", encoding="utf-8") as f:
         f.write(final_html)
 
-    print(f"Built {os.path.basename(OUT_HTML)} with {len(rows)} articles.")
+    print(f"Built {os.path.basename(OUT_HTML)} with {count} articles.")
 
 if __name__ == "__main__":
     main()
@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
 # PSAI: Generate public/feed.json (JSON Feed 1.1) + public/rss.xml (RSS 2.0) from data/news_log.json
 # and generate public/news_feed.html from the same data.
+# Feeds are paged (feed.json -> feed-2.json ..., rss.xml -> rss-2.xml ...) and split into
+# per-category / per-severity feeds under public/feeds/.
 
-import os, json, re, html, datetime
+import os, json, re, html, datetime, glob, argparse, email.utils, shutil
+import metrics, news_log
 
 LOG_PATH = os.getenv("PSAI_LOG_PATH", "data/news_log.json")
 OUT_JSON = os.getenv("PSAI_FEED_JSON", "public/feed.json")
 OUT_RSS  = os.getenv("PSAI_FEED_RSS",  "public/rss.xml")
 OUT_HTML = os.getenv("PSAI_INDEX",     "public/news_feed.html")
 SITE_URL = os.getenv("PSAI_SITE_URL",  "")
+FEEDS_DIR = os.getenv("PSAI_FEEDS_DIR", "public/feeds")
+PUBLIC_DIR = os.path.dirname(OUT_JSON) or "."
+PAGE_SIZE = int(os.getenv("PSAI_FEED_PAGE_SIZE", "100"))
 
 CSS = """
 body{font-family:system-ui,'Segoe UI',Roboto,Helvetica,Arial,sans-serif;margin:0}
@@ -58,80 +64,179 @@ def ensure_dir(path):
     os.makedirs(d, exist_ok=True)
 
 def load_items():
+    """Log items newest first, streamed (iter_items only sorts logs not already written date-desc)."""
     if not os.path.exists(LOG_PATH):
         raise SystemExit(f"news_log not found at {LOG_PATH}")
-    with open(LOG_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    items = data.get("items", [])
-    items.sort(key=lambda x: x.get("date",""), reverse=True)
-    return items
+    return news_log.iter_items(LOG_PATH)
 
-def to_json_feed(items):
-    site = SITE_URL.rstrip("/")
-    jf = {
-        "version": "https://jsonfeed.org/version/1.1",
-        "title": "PSAI — 30-Day AI Coding Tools Updates",
-        "home_page_url": f"{site}/" if site else None,
-        "feed_url": f"{site}/feed.json" if site else None,
-        "items": []
-    }
-    for it in items:
-        pid = f"{it.get('date','')}-{it.get('moniker','')}-{(it.get('headline','') or '')[:30]}"
-        jf["items"].append({
-            "id": pid,
-            "url": it.get("link") or (f"{site}/" if site else None),
-            "title": f"[{it.get('tool','')}] {it.get('headline','')}",
-            "content_text": f"{it.get('severity','Minor')} — {it.get('impact','')}",
-            "date_published": f"{it.get('date','')}T09:20:00-04:00",
-            "tags": [t for t in [it.get("category","Updates"), it.get("severity","Minor")] if t]
-        })
-    return jf
+def slugify(s):
+    return re.sub(r"[^a-z0-9]+", "-", (s or "").lower()).strip("-") or "other"
+
+def item_id(it):
+    # Same identity harvest uses for dedup, so ids survive rebuilds and re-sorts.
+    return "psai-" + news_log.item_key(it)
+
+def rfc822(date):
+    try:
+        dt = datetime.datetime.strptime(date, "%Y-%m-%d").replace(hour=13, minute=20, tzinfo=datetime.timezone.utc)
+    except (TypeError, ValueError):
+        return ""
+    return email.utils.format_datetime(dt)
 
 def esc(s):
-    return (s or "").replace("&","&amp;").replace("<","&lt;").replace(">","&gt;")
+    return (s or "").replace("&","&amp;").replace("<","&lt;").replace(">","&gt;").replace('"',"&quot;")
+
+def page_path(base, n):
+    # Page 1 keeps the canonical name (feed.json, rss.xml); later pages are feed-2.json, rss-2.xml, ...
+    if n == 1:
+        return base
+    stem, ext = os.path.splitext(base)
+    return f"{stem}-{n}{ext}"
+
+def clear_pages(base):
+    # Drop pages left over from a longer previous build.
+    stem, ext = os.path.splitext(base)
+    for p in glob.glob(f"{glob.escape(stem)}-*{ext}"):
+        if p[len(stem)+1:len(p)-len(ext)].isdigit():
+            os.remove(p)
+
+def public_url(path):
+    site = SITE_URL.rstrip("/")
+    rel = os.path.relpath(path, PUBLIC_DIR).replace(os.sep, "/")
+    return f"{site}/{rel}" if site else None
+
+def link_url(path, from_path):
+    # Absolute when the site URL is known, otherwise relative to the page linking to it.
+    return public_url(path) or os.path.relpath(path, os.path.dirname(from_path) or ".").replace(os.sep, "/")
 
-def to_rss(items):
+def headline(it, default=""):
+    # The tool's own wording when its feed was folded into a press mention (neardup.NewsClusters)
+    return it.get("feed_headline") or it.get("headline", default)
+
+def json_item(it):
     site = SITE_URL.rstrip("/")
+    return {
+        "id": item_id(it),
+        "url": it.get("link") or (f"{site}/" if site else None),
+        "title": f"[{it.get('tool','')}] {headline(it)}",
+        "content_text": f"{it.get('severity','Minor')} — {it.get('impact','')}",
+        "date_published": f"{it.get('date','')}T09:20:00-04:00",
+        "tags": [t for t in [it.get("category","Updates"), it.get("severity","Minor")] if t]
+    }
+
+def rss_item(it):
+    site = SITE_URL.rstrip("/")
+    title = f"[{it.get('tool','')}] {headline(it)}"
+    link  = it.get("link") or (f"{site}/" if site else "")
+    pub   = rfc822(it.get("date",""))
+    desc  = f"{it.get('severity','Minor')} — {it.get('impact','')}"
     out = [
-        '<?xml version="1.0" encoding="UTF-8"?>',
-        '<rss version="2.0">',
-        '<channel>',
-        '<title>PSAI — 30-Day AI Coding Tools Updates</title>',
-        f'<link>{esc(site or "https://example.invalid")}/</link>',
-        '<description>Rolling feed of changes to tracked AI coding tools</description>'
+        '<item>',
+        f'<title>{esc(title)}</title>',
+        f'<link>{esc(link)}</link>' if link else '',
+        f'<guid isPermaLink="false">{item_id(it)}</guid>',
+        f'<pubDate>{esc(pub)}</pubDate>' if pub else '',
+        f'<category>{esc(it.get("category",""))}</category>' if it.get("category") else '',
+        f'<description>{esc(desc)}</description>',
+        '</item>'
     ]
-    for it in items:
-        title = f"[{it.get('tool','')}] {it.get('headline','')}"
-        link  = it.get("link") or (f"{site}/" if site else "")
-        pub   = it.get("date","")
-        desc  = f"{it.get('severity','Minor')} — {it.get('impact','')}"
-        out += [
-            '<item>',
-            f'<title>{esc(title)}</title>',
-            f'<link>{esc(link)}</link>' if link else '',
-            f'<pubDate>{esc(pub)}</pubDate>' if pub else '',
-            f'<description>{esc(desc)}</description>',
-            '</item>'
+    return "\n".join(x for x in out if x) + "\n"
+
+class PagedFeed:
+    """Streams one logical feed into numbered JSON Feed 1.1 + RSS 2.0 page files.
+
+    Items are written as they arrive and only the open page's file handles are
+    held, so memory does not grow with the number of items.  Pages link forward
+    with JSON Feed ``next_url`` and RFC 5005 ``atom:link rel="next"``.
+    """
+
+    def __init__(self, title, json_path, rss_path, page_size=None):
+        self.title = title
+        self.json_path = json_path
+        self.rss_path = rss_path
+        self.page_size = max(1, page_size or PAGE_SIZE)
+        self.page = 0
+        self.count = 0
+        self.total = 0
+        self.last_build = ""
+        self.fj = self.fr = None
+
+    def _open(self, first_item):
+        self.page += 1
+        self.count = 0
+        if self.page == 1:
+            # Newest item of the whole feed; stays put until new items arrive, so clients can cache.
+            self.last_build = rfc822(first_item.get("date","")) if first_item else ""
+        jp, rp = page_path(self.json_path, self.page), page_path(self.rss_path, self.page)
+        ensure_dir(jp); ensure_dir(rp)
+        self.fj = open(jp, "w", encoding="utf-8")
+        self.fr = open(rp, "w", encoding="utf-8")
+        site = SITE_URL.rstrip("/")
+        head = {
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": self.title,
+            "home_page_url": f"{site}/" if site else None,
+            "feed_url": public_url(jp),
+        }
+        self.fj.write(json.dumps(head, ensure_ascii=False, indent=2)[:-2] + ',\n  "items": [')
+        rss = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">',
+            '<channel>',
+            f'<title>{esc(self.title)}</title>',
+            f'<link>{esc(site or "https://example.invalid")}/</link>',
+            '<description>Rolling feed of changes to tracked AI coding tools</description>',
+            f'<atom:link rel="self" type="application/rss+xml" href="{esc(public_url(rp))}"/>' if site else '',
+            f'<atom:link rel="first" type="application/rss+xml" href="{esc(link_url(self.rss_path, rp))}"/>' if self.page > 1 else '',
+            f'<atom:link rel="previous" type="application/rss+xml" href="{esc(link_url(page_path(self.rss_path, self.page - 1), rp))}"/>' if self.page > 1 else '',
+            f'<lastBuildDate>{self.last_build}</lastBuildDate>' if self.last_build else '',
         ]
-    out += ['</channel></rss>']
-    return "\n".join(x for x in out if x)
-
-def render_html(items, site_url):
-    rows_html = []
-    for it in items:
-        sev = html.escape(it.get("severity","Minor"))
-        badge = f'<span class="badge {sev}">{sev}</span>'
-        date = html.escape(it.get("date",""))
-        tool = html.escape(it.get("tool",""))
-        head = html.escape(it.get("headline","Update"))
-        link = it.get("link") or site_url or "#"
-        link_html = f'<a href="{html.escape(link)}" target="_blank" rel="noopener">{head}</a>'
-        impact = html.escape(it.get("impact",""))
-        moniker = html.escape(it.get("moniker",""))
-        data_text = " ".join([sev,date,tool,head,impact,moniker]).lower()
-        rows_html.append(f'<tr data-sev="{sev}" data-text="{html.escape(data_text)}">'
-                         f'<td>{date}</td><td>{tool}<br><small class="mono">{moniker}</small></td>'
-                         f'<td>{link_html}</td><td>{badge}</td><td>{impact}</td></tr>')
+        self.fr.write("\n".join(x for x in rss if x) + "\n")
+
+    def _close_page(self, has_next):
+        jp, rp = page_path(self.json_path, self.page), page_path(self.rss_path, self.page)
+        tail = "\n  ]"
+        if has_next:
+            tail += ',\n  "next_url": ' + json.dumps(link_url(page_path(self.json_path, self.page + 1), jp))
+        self.fj.write(tail + "\n}\n")
+        if has_next:
+            self.fr.write(f'<atom:link rel="next" type="application/rss+xml" href="{esc(link_url(page_path(self.rss_path, self.page + 1), rp))}"/>\n')
+        self.fr.write('</channel></rss>')
+        self.fj.close(); self.fr.close()
+        self.fj = self.fr = None
+
+    def add(self, it):
+        if self.fj is not None and self.count >= self.page_size:
+            self._close_page(has_next=True)
+        if self.fj is None:
+            self._open(it)
+        self.fj.write(("\n    " if self.count == 0 else ",\n    ") + json.dumps(json_item(it), ensure_ascii=False))
+        self.fr.write(rss_item(it))
+        self.count += 1
+        self.total += 1
+
+    def close(self):
+        if self.fj is None:
+            self._open(None)
+        self._close_page(has_next=False)
+        return self.page
+
+def html_row(it, site_url):
+    sev = html.escape(it.get("severity","Minor"))
+    badge = f'<span class="badge {sev}">{sev}</span>'
+    date = html.escape(it.get("date",""))
+    tool = html.escape(it.get("tool",""))
+    head = html.escape(headline(it, "Update"))
+    link = it.get("link") or site_url or "#"
+    link_html = f'<a href="{html.escape(link)}" target="_blank" rel="noopener">{head}</a>'
+    impact = html.escape(it.get("impact",""))
+    moniker = html.escape(it.get("moniker",""))
+    data_text = " ".join([sev,date,tool,head,impact,moniker]).lower()
+    return (f'<tr data-sev="{sev}" data-text="{html.escape(data_text)}">'
+            f'<td>{date}</td><td>{tool}<br><small class="mono">{moniker}</small></td>'
+            f'<td>{link_html}</td><td>{badge}</td><td>{impact}</td></tr>')
+
+def html_head(count):
     # The navigation was not present in the original build_site.py, so I'm adding it here
     # to be consistent with the other pages.
     nav_html = '<div class="topnav"><strong>PSAI</strong> · <a href="./">Home</a> · <a href="news_feed.html">News Feed</a> · <a href="sources.html">Sources</a> · <a href="sources_table.html">Table</a> · <a href="articles.html">Articles</a></div>'
@@ -148,32 +253,74 @@ def render_html(items, site_url):
   <label><input id="f-major" type="checkbox" checked> Major</label>
   <label><input id="f-security" type="checkbox" checked> Security</label>
   <label><input id="f-minor" type="checkbox" checked> Minor</label>
-  <span><strong id="count">{len(items)}</strong> items (last 30 days)</span>
+  <span><strong id="count">{count}</strong> items (last 30 days)</span>
 </div>
 <table><thead><tr><th>Date</th><th>Tool</th><th>Headline</th><th>Severity</th><th>Impact</th></tr></thead>
 <tbody>
-{''.join(rows_html)}
+"""
+
+def html_foot():
+    feeds_rel = os.path.relpath(FEEDS_DIR, PUBLIC_DIR).replace(os.sep, "/")
+    return f"""
 </tbody></table>
-<footer>Built {datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M')} UTC • <a href="feed.json">JSON</a> • <a href="rss.xml">RSS</a></footer>
+<footer>Built {datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M')} UTC • <a href="feed.json">JSON</a> • <a href="rss.xml">RSS</a> • <a href="{feeds_rel}/severity-security.xml">Security RSS</a></footer>
 </main>
 <script>{JS}</script>
 </body></html>"""
 
-if __name__ == "__main__":
-    items = load_items()
-    ensure_dir(OUT_JSON); ensure_dir(OUT_RSS); ensure_dir(OUT_HTML)
+def build_all(items, site_url):
+    """Single pass over the (newest-first) items, streaming every feed page and the HTML rows.
 
-    # Write JSON Feed
-    with open(OUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(to_json_feed(items), f, ensure_ascii=False, indent=2)
+    Returns (item count, pages of the main feed, sub-feed keys)."""
+    clear_pages(OUT_JSON); clear_pages(OUT_RSS)
+    if os.path.isdir(FEEDS_DIR):
+        for p in glob.glob(os.path.join(FEEDS_DIR, "*.json")) + glob.glob(os.path.join(FEEDS_DIR, "*.xml")):
+            os.remove(p)
 
-    # Write RSS Feed
-    with open(OUT_RSS, "w", encoding="utf-8") as f:
-        f.write(to_rss(items))
+    main_feed = PagedFeed("PSAI — 30-Day AI Coding Tools Updates", OUT_JSON, OUT_RSS)
+    sub_feeds = {}
 
-    # Write HTML page
-    html_out = render_html(items, SITE_URL)
-    with open(OUT_HTML, "w", encoding="utf-8") as f:
-        f.write(html_out)
+    def sub_feed(kind, label):
+        key = f"{kind}-{slugify(label)}"
+        if key not in sub_feeds:
+            sub_feeds[key] = PagedFeed(f"PSAI — {label} Updates",
+                                       os.path.join(FEEDS_DIR, key + ".json"),
+                                       os.path.join(FEEDS_DIR, key + ".xml"))
+        return sub_feeds[key]
 
-    print(f"Wrote {OUT_JSON}, {OUT_RSS}, and {OUT_HTML}.")
+    # Rows go to a side file; the head (which shows the count) is written once the count is known
+    rows_path = OUT_HTML + ".rows"
+    with open(rows_path, "w", encoding="utf-8") as fr:
+        for it in items:
+            main_feed.add(it)
+            sub_feed("category", it.get("category") or "Updates").add(it)
+            sub_feed("severity", it.get("severity") or "Minor").add(it)
+            fr.write(html_row(it, site_url))
+    with open(OUT_HTML, "w", encoding="utf-8") as fh, open(rows_path, "r", encoding="utf-8") as fr:
+        fh.write(html_head(main_feed.total))
+        shutil.copyfileobj(fr, fh)
+        fh.write(html_foot())
+    os.remove(rows_path)
+
+    pages = main_feed.close()
+    for f in sub_feeds.values():
+        f.close()
+    return main_feed.total, pages, sorted(sub_feeds)
+
+@metrics.instrumented("build_feed")
+def main(argv=None):
+    global SITE_URL
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--site", default=SITE_URL, help="Public site URL used for absolute feed links")
+    args = ap.parse_args(argv)
+    SITE_URL = args.site or ""
+
+    items = load_items()
+    ensure_dir(OUT_JSON); ensure_dir(OUT_RSS); ensure_dir(OUT_HTML)
+    count, pages, feeds = build_all(items, SITE_URL)
+    metrics.count("items_rendered", count)
+
+    print(f"Wrote {OUT_JSON}, {OUT_RSS} ({pages} page(s) of {PAGE_SIZE}), {len(feeds)} feeds in {FEEDS_DIR}, and {OUT_HTML}.")
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,25 @@
 #!/usr/bin/env python3
 # PSAI sources page generator (filtered, cards + table, tooltips, index link inject)
+#
+# The tools go to public/sources.json once (facet values stored once, rows as
+# arrays referencing them, plus facet counts); sources.html and
+# sources_table.html are small shells that fetch it and only create DOM for
+# the rows in view, with the icons as <use> references to one inline sprite.
 
-import csv, os, re, html, json
+import os, re, html, json
 from datetime import datetime, timezone
+import metrics, feed_health, news_log
+from datacache import load_json
+from tool_registry import load_registry
+from latest_index import INDEX_PATH, load_index
 
 CSV_IN   = os.getenv("PSAI_TOOLS_CSV", "data/tools.csv")
 LOG_IN   = os.getenv("PSAI_LOG_PATH", "data/news_log.json")
 OUT_LIST = os.getenv("PSAI_OUT_LIST", "public/sources.html")
 OUT_TAB  = os.getenv("PSAI_OUT_TABLE", "public/sources_table.html")
+OUT_DATA = os.getenv("PSAI_SOURCES_JSON", "public/sources.json")
 OUT_INDEX = os.getenv("PSAI_INDEX", "public/index.html")
+ANALYTICS_IN = os.getenv("PSAI_ANALYTICS", "data/analytics.json")
 
 DEFAULT_INCLUDE = r"(agent|agentic|orchestr|mcp|ide|editor|review|code\s*assistant)"
 DEFAULT_EXCLUDE = r"^(product\s*hunt|reddit|hacker\s*news|hn\s*—|hn\s*show|latentspace|ben['’]s\s*bites|npm|pypi|docker\s*hub)\b"
@@ -57,18 +68,43 @@ th{text-align:left;background:#f8fafc;font-weight:600}
 .updates-list,.tools-list{list-style:none;padding:0;margin:10px 0 0;font-size:14px}
 .updates-list li,.tools-list li{margin-bottom:8px}
 .updates-list li strong{font-weight:500}
+.bar{height:8px;border-radius:4px;background:#93c5fd;margin-top:3px}
+.bar.err{background:#fca5a5}
+.health-list{list-style:none;padding:0;margin:10px 0 0;font-size:13px}
+.health-list li{margin-bottom:8px;word-break:break-all}
+.regress{color:#b91c1c;font-weight:600}
+.hot-list{padding-left:20px;margin:10px 0 0;font-size:14px}
+.hot-list li{margin-bottom:8px}
+.up{color:#15803d}.down{color:#b91c1c}
+.trends{display:grid;grid-template-columns:repeat(auto-fill,minmax(220px,1fr));gap:12px;margin-top:10px;font-size:13px}
+.trends svg{display:block;width:100%;height:36px}
+.toolbar{display:flex;gap:12px;align-items:center;margin:0 0 16px;flex-wrap:wrap;font-size:14px}
+.toolbar input,.toolbar select{padding:6px 10px;border:1px solid #cbd5e1;border-radius:8px;font:inherit}
+.toolbar input{min-width:240px}
+.vwrap{height:calc(100vh - 230px);min-height:320px;overflow:auto;position:relative}
+.vinner{position:relative}
+.vrow{position:absolute;left:0;right:0;top:0}
+.cards .vrow{display:grid;grid-template-columns:repeat(var(--cols),1fr);gap:16px;height:180px}
+.cards .card{height:180px;overflow:hidden}
+.card h2,.tr>div{white-space:nowrap;overflow:hidden;text-overflow:ellipsis}
+.card .status{margin:8px 0 0;font-size:13px;display:-webkit-box;-webkit-line-clamp:2;-webkit-box-orient:vertical;overflow:hidden}
+.tr{display:grid;grid-template-columns:2fr 1.4fr 1.2fr 90px 3fr 130px;align-items:center;height:44px;border-bottom:1px solid #e5e7eb;font-size:14px}
+.tr>div{padding:0 12px}
+.th{font-weight:600;background:#f8fafc;border-radius:12px 12px 0 0;border:1px solid #e5e7eb}
+.table .vwrap{border:1px solid #e5e7eb;border-top:0;border-radius:0 0 12px 12px}
+.tr .icons{margin:0;gap:6px;overflow:visible}
 """
 
-def svg(name):
-    if name=="site":
-        return '<svg viewBox="0 0 24 24" fill="none"><path d="M4 12h16M4 12c0-4 3.5-8 8-8s8 4 8 8-3.5 8-8 8-8-4-8-8Zm0 0h16" stroke="currentColor" stroke-width="1.6"/></svg>'
-    if name=="docs":
-        return '<svg viewBox="0 0 24 24" fill="none"><path d="M7 3h7l5 5v13H7z"/><path d="M14 3v5h5" stroke="currentColor" stroke-width="1.6" fill="none"/></svg>'
-    if name=="repo":
-        return '<svg viewBox="0 0 24 24" fill="none"><path d="M9 19c-4 1.5-4-2.5-6-3m12 6v-3.87a3.37 3.37 0 0 0-.94-2.61c3.14-.35 6.44-1.54 6.44-7A5.44 5.44 0 0 0 18 2.77A5.07 5.07 0 0 0 17.91 1S17.27.65 15 2.48a13.38 13.38 0 0 0-6 0C6.73.65 6.09 1 6.09 1A5.07 5.07 0 0 0 6 2.77a5.44 5.44 0 0 0-1.5 3.77c0 5.42 3.3 6.61 6.44 7A3.37 3.37 0 0 0 10 17.13V21" stroke="currentColor" stroke-width="1.6"/></svg>'
-    if name=="rss":
-        return '<svg viewBox="0 0 24 24" fill="none"><path d="M4 11a9 9 0 0 1 9 9M4 5a15 15 0 0 1 15 15M6 20a2 2 0 1 0 0-4 2 2 0 0 0 0 4Z" stroke="currentColor" stroke-width="1.6"/></svg>'
-    return ''
+ICON_PATHS = {
+    "site": '<path d="M4 12h16M4 12c0-4 3.5-8 8-8s8 4 8 8-3.5 8-8 8-8-4-8-8Zm0 0h16" stroke="currentColor" stroke-width="1.6"/>',
+    "docs": '<path d="M7 3h7l5 5v13H7z"/><path d="M14 3v5h5" stroke="currentColor" stroke-width="1.6" fill="none"/>',
+    "repo": '<path d="M9 19c-4 1.5-4-2.5-6-3m12 6v-3.87a3.37 3.37 0 0 0-.94-2.61c3.14-.35 6.44-1.54 6.44-7A5.44 5.44 0 0 0 18 2.77A5.07 5.07 0 0 0 17.91 1S17.27.65 15 2.48a13.38 13.38 0 0 0-6 0C6.73.65 6.09 1 6.09 1A5.07 5.07 0 0 0 6 2.77a5.44 5.44 0 0 0-1.5 3.77c0 5.42 3.3 6.61 6.44 7A3.37 3.37 0 0 0 10 17.13V21" stroke="currentColor" stroke-width="1.6"/>',
+    "rss": '<path d="M4 11a9 9 0 0 1 9 9M4 5a15 15 0 0 1 15 15M6 20a2 2 0 1 0 0-4 2 2 0 0 0 0 4Z" stroke="currentColor" stroke-width="1.6"/>',
+}
+# Defined once per page; every icon is <svg><use href="#i-site"/></svg>
+SPRITE = ('<svg width="0" height="0" style="position:absolute" aria-hidden="true">'
+          + "".join(f'<symbol id="i-{k}" viewBox="0 0 24 24" fill="none">{v}</symbol>' for k, v in ICON_PATHS.items())
+          + '</svg>')
 
 def norm_url(u):
     if not u: return ""
@@ -77,12 +113,6 @@ def norm_url(u):
     if re.match(r'^https?://', u): return u
     return "https://" + u
 
-def icon_link(url, label):
-    u = norm_url(url)
-    if not u:
-        return f'<span class="icon tooltip" aria-disabled="true" title="No {html.escape(label)}">{svg(label)}</span>'
-    return f'<a class="icon tooltip" href="{html.escape(u)}" target="_blank" rel="noopener" title="{html.escape(u)}" aria-label="{html.escape(label)}">{svg(label)}</a>'
-
 def sev_badge(sev):
     sev = (sev or "Minor").strip().title()
     cls = "sev-Minor"
@@ -130,34 +160,209 @@ HTML_FOOT = """
 </body></html>
 """
 
-def build_list(cards):
-    return HTML_HEAD.format(css=ICON_CSS).replace("<title>PSAI</title>", "<title>PSAI Sources</title>") + """
-  <h1>AI Coding Tools — Sources</h1>
-  <div class="sub">Filtered to core AI dev tools (agents, IDEs, reviewers, orchestration, MCP). Hover icons to see real URLs.</div>
-  <div class="grid">
-    {cards}
-  </div>
-""".format(cards=cards) + HTML_FOOT
+SOURCES_JS = r"""
+const wrap = document.getElementById('vwrap'), inner = document.getElementById('vinner');
+const q = document.getElementById('q'), count = document.getElementById('count');
+const FACETS = ['category', 'severity', 'status'];
+const ROW_H = VIEW === 'table' ? 44 : 196;  // card 180px + 16px gap
+let D = null, hay = [], shown = [], cols = 1, queued = false;
+const esc = s => String(s).replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})[c]);
+function icon(u, name) {
+  const svg = `<svg><use href="#i-${name}"/></svg>`;
+  return u ? `<a class="icon tooltip" href="${esc(u)}" target="_blank" rel="noopener" title="${esc(u)}" aria-label="${name}">${svg}</a>`
+           : `<span class="icon tooltip" aria-disabled="true" title="No ${name}">${svg}</span>`;
+}
+function badge(sev) {
+  return `<span class="badge sev-${['Major', 'Security'].includes(sev) ? sev : 'Minor'}">${esc(sev)}</span>`;
+}
+function cell(r) {
+  const [tool, mon, c, s, k, stat, site, docs, repo, feed] = r;
+  return {tool: esc(tool), mon: esc(mon), cat: esc(D.facets.category.values[c]), sev: badge(D.facets.severity.values[s]),
+          stat: esc(stat), icons: icon(site, 'site') + icon(docs, 'docs') + icon(repo, 'repo') + icon(feed, 'rss')};
+}
+function card(r) {
+  const x = cell(r);
+  return `<section class="card"><h2 title="${x.tool}">${x.tool}</h2><div class="meta"><span class="chip">${x.mon}</span>` +
+         `<span class="chip">${x.cat}</span>${x.sev}</div><div class="icons">${x.icons}</div><p class="status" title="${x.stat}">${x.stat}</p></section>`;
+}
+function trow(r) {
+  const x = cell(r);
+  return `<div class="tr"><div title="${x.tool}">${x.tool}</div><div><code>${x.mon}</code></div><div>${x.cat}</div>` +
+         `<div>${x.sev}</div><div title="${x.stat}">${x.stat}</div><div class="icons">${x.icons}</div></div>`;
+}
+// Only the rows in view (plus a few either side) exist in the DOM; the inner div keeps the full scroll height
+function render() {
+  queued = false;
+  const n = Math.ceil(shown.length / cols);
+  inner.style.height = n * ROW_H + 'px';
+  const first = Math.max(0, Math.floor(wrap.scrollTop / ROW_H) - 3);
+  const last = Math.min(n, Math.ceil((wrap.scrollTop + wrap.clientHeight) / ROW_H) + 3);
+  let h = '';
+  for (let i = first; i < last; i++) {
+    h += `<div class="vrow" style="transform:translateY(${i * ROW_H}px)">`;
+    for (let j = i * cols; j < Math.min(shown.length, (i + 1) * cols); j++)
+      h += VIEW === 'table' ? trow(D.rows[shown[j]]) : card(D.rows[shown[j]]);
+    h += '</div>';
+  }
+  inner.innerHTML = h;
+}
+function schedule() {
+  if (!queued) { queued = true; requestAnimationFrame(render); }
+}
+function layout() {
+  cols = VIEW === 'table' ? 1 : Math.max(1, Math.floor((wrap.clientWidth + 16) / 316));
+  inner.style.setProperty('--cols', cols);
+  schedule();
+}
+function apply() {
+  const qq = q.value.trim().toLowerCase();
+  const want = FACETS.map(f => document.getElementById('f-' + f).value);
+  shown = [];
+  D.rows.forEach((r, i) => {
+    if ((!qq || hay[i].includes(qq)) && FACETS.every((f, k) => want[k] === '' || +want[k] === r[2 + k])) shown.push(i);
+  });
+  count.textContent = shown.length;
+  wrap.scrollTop = 0;
+  schedule();
+}
+fetch(DATA_URL).then(r => r.json()).then(data => {
+  D = data;
+  hay = D.rows.map(r => (r[0] + ' ' + r[1] + ' ' + r[5]).toLowerCase());
+  for (const f of FACETS) {
+    const el = document.getElementById('f-' + f), fc = D.facets[f];
+    el.innerHTML = `<option value="">All</option>` + fc.values.map((v, i) => `<option value="${i}">${esc(v)} (${fc.counts[i]})</option>`).join('');
+    el.addEventListener('input', apply);
+  }
+  q.addEventListener('input', apply);
+  wrap.addEventListener('scroll', schedule, {passive: true});
+  addEventListener('resize', layout);
+  layout();
+  apply();
+}).catch(e => { count.textContent = '—'; inner.textContent = 'Could not load ' + DATA_URL + ': ' + e; });
+"""
 
-def build_table(rows_html):
-    return HTML_HEAD.format(css=ICON_CSS).replace("<title>PSAI</title>", "<title>PSAI Sources (Table)</title>") + """
-  <h1>AI Coding Tools — Sources (Table)</h1>
-  <div class="sub">Use env vars to tune filters: PSAI_INCLUDE_REGEX / PSAI_EXCLUDE_REGEX / PSAI_MIN_STARS.</div>
-  <div class="tablewrap">
-    <table>
-      <thead>
-        <tr>
-          <th>Tool</th><th>Moniker</th><th>Category</th><th>Severity</th><th>Status</th><th>Links</th>
-        </tr>
-      </thead>
-      <tbody>
-        {rows}
-      </tbody>
-    </table>
+def facet(values):
+    """Distinct values, most common first, with their counts; rows refer to a value by its position."""
+    counts = {}
+    for v in values:
+        counts[v] = counts.get(v, 0) + 1
+    order = sorted(counts, key=lambda v: (-counts[v], v))
+    return {"values": order, "counts": [counts[v] for v in order]}
+
+def status_kind(stat):
+    """The label of a tracker status ("Minor: v1.2 released" -> "Minor"), for the status facet."""
+    kind = stat.split(":", 1)[0].strip() if ":" in stat else stat
+    return kind if len(kind) <= 24 else "Other"
+
+def build_dataset(rows):
+    """The filtered tools as one compact document: facet values once, rows as arrays of indices and strings."""
+    recs = []
+    for r in rows:
+        tool = (r.get("Tool") or "").strip()
+        if not tool: continue
+        stat = (r.get("Status") or r.get("Updates") or "—").strip()
+        recs.append((tool, (r.get("Moniker") or "").strip(),
+                     (r.get("Category") or r.get("Source Type") or "Uncategorized").strip(),
+                     (r.get("Severity") or "Minor").strip().title(), status_kind(stat), stat,
+                     norm_url(r.get("Website URL", "")), norm_url(r.get("Docs URL", "")),
+                     norm_url(r.get("Repo URL", "")), norm_url(r.get("Feed URL", ""))))
+    facets = {name: facet(rec[2 + k] for rec in recs) for k, name in enumerate(("category", "severity", "status"))}
+    pos = {name: {v: i for i, v in enumerate(f["values"])} for name, f in facets.items()}
+    return {
+        "fields": ["tool", "moniker", "category", "severity", "status_kind", "status", "site", "docs", "repo", "feed"],
+        "facets": facets,
+        "rows": [[rec[0], rec[1], pos["category"][rec[2]], pos["severity"][rec[3]], pos["status"][rec[4]], *rec[5:]]
+                 for rec in recs],
+    }
+
+def build_shell(view, data_url, total):
+    """sources.html (view "cards") or sources_table.html ("table"): toolbar, scroll viewport and the renderer."""
+    title, h1, sub = {
+        "cards": ("PSAI Sources", "AI Coding Tools — Sources",
+                  "Filtered to core AI dev tools (agents, IDEs, reviewers, orchestration, MCP). Hover icons to see real URLs."),
+        "table": ("PSAI Sources (Table)", "AI Coding Tools — Sources (Table)",
+                  "Use env vars to tune filters: PSAI_INCLUDE_REGEX / PSAI_EXCLUDE_REGEX / PSAI_MIN_STARS."),
+    }[view]
+    head = ('<div class="tr th"><div>Tool</div><div>Moniker</div><div>Category</div><div>Severity</div>'
+            '<div>Status</div><div>Links</div></div>') if view == "table" else ""
+    return HTML_HEAD.format(css=ICON_CSS).replace("<title>PSAI</title>", f"<title>{title}</title>") + f"""
+  {SPRITE}
+  <h1>{h1}</h1>
+  <div class="sub">{sub}</div>
+  <div class="toolbar">
+    <input id="q" type="search" placeholder="Search tool / moniker / status…" />
+    <label>Category <select id="f-category"></select></label>
+    <label>Severity <select id="f-severity"></select></label>
+    <label>Status <select id="f-status"></select></label>
+    <span><strong id="count">{total}</strong> tools</span>
+  </div>
+  <noscript><p class="note">This page needs JavaScript; the data is in <a href="{html.escape(data_url)}">{html.escape(data_url)}</a>.</p></noscript>
+  <div class="{view}">
+    {head}
+    <div id="vwrap" class="vwrap"><div id="vinner" class="vinner"></div></div>
   </div>
-""".format(rows=rows_html) + HTML_FOOT
+  <script>const VIEW = {json.dumps(view)}, DATA_URL = {json.dumps(data_url)};</script>
+  <script>{SOURCES_JS}</script>
+""" + HTML_FOOT
+
+def build_quarantine_html(health):
+    rows = feed_health.quarantined(health)
+    if not rows:
+        return ""
+    items = "".join(f'<li>{html.escape(u)} <span class="chip">{html.escape(r.get("error", ""))} × {r.get("failures", 0)}</span>'
+                    f' <span class="note">last ok {html.escape((r.get("last_success") or "never")[:10])}'
+                    f' · next probe {html.escape(r["skip_until"][:16].replace("T", " "))}</span></li>' for u, r in rows)
+    return f'<h3>Quarantined feeds ({len(rows)})</h3><ul class="health-list">{items}</ul>'
+
+def build_health_html(report, history, health=None, limit=8):
+    """Slowest fetches of the last run as bars, plus step timings against their history median."""
+    run = next((r for r in reversed(history.get("runs", [])) if r.get("id") == report.get("id")), {})
+    fetches = [dict(zip(("url", "seconds", "status", "error"), row)) for row in run.get("slow_fetches", [])[:limit]]
+    quarantine_html = build_quarantine_html(health or {})
+    if not fetches and not report.get("steps"):
+        return "<p class=\"note\">No run metrics recorded yet.</p>" + quarantine_html
+    top = max((f.get("seconds", 0) for f in fetches), default=0) or 1
+    feeds_html = ""
+    for f in fetches:
+        url = html.escape(f.get("url", ""))
+        secs = f.get("seconds", 0)
+        err = f.get("error") or (f.get("status") if (f.get("status") or 0) >= 400 else "")
+        label = f'{secs:.1f}s' + (f' · {html.escape(str(err))}' if err else "")
+        feeds_html += (f'<li>{url} <span class="chip">{label}</span>'
+                       f'<div class="bar{" err" if err else ""}" style="width:{max(2, int(100 * secs / top))}%"></div></li>')
+    slow = {name: (cur, med) for name, cur, med in metrics.regressions(history)}
+    steps_html = ""
+    for name, rec in sorted(report.get("steps", {}).items(), key=lambda kv: kv[1].get("wall_s", 0), reverse=True):
+        flag = f' <span class="regress">▲ {slow[name][0] / (slow[name][1] or 1):.1f}× median</span>' if name in slow else ""
+        steps_html += (f'<li><strong>{html.escape(name)}</strong> {rec.get("wall_s", 0):.1f}s wall · {rec.get("cpu_s", 0):.1f}s CPU'
+                       f' · {rec.get("fetches", 0)} fetches ({rec.get("errors", 0)} failed){flag}</li>')
+    return (f'<h3>Slowest feeds (last run)</h3><ul class="health-list">{feeds_html or "<li>No fetches recorded.</li>"}</ul>'
+            f'<h3>Steps</h3><ul class="health-list">{steps_html}</ul>' + quarantine_html)
+
+def sparkline(values, w=200, h=36):
+    top = max(values) or 1
+    step = w / max(len(values) - 1, 1)
+    pts = " ".join(f"{i * step:.1f},{h - 2 - (h - 4) * v / top:.1f}" for i, v in enumerate(values))
+    return (f'<svg viewBox="0 0 {w} {h}" preserveAspectRatio="none" aria-hidden="true">'
+            f'<polyline points="{pts}" fill="none" stroke="#6366f1" stroke-width="1.5"/></svg>')
 
-def build_dashboard_page(recent_tools, todays_updates):
+def build_hot_html(analytics, trends=8):
+    """Ranked hot tools plus a 30-day trend line per category, from data/analytics.json."""
+    if not analytics.get("hot"):
+        return "<p class=\"note\">No release activity analysed yet.</p>"
+    rows = ""
+    for h in analytics["hot"]:
+        accel = h.get("accel", 0)
+        arrow = f'<span class="{"up" if accel > 0 else "down"}">{"▲" if accel > 0 else "▼"} {abs(accel)}</span>' if accel else ""
+        mix = h.get("severity_mix", {})
+        sev = " ".join(sev_badge(k) + f" {mix[k]}" for k in ("Security", "Major") if mix.get(k))
+        rows += (f'<li><strong>{html.escape(h["tool"])}</strong> <span class="chip">{html.escape(h.get("category", ""))}</span>'
+                 f' {h.get("last7", 0)} this week {arrow} · every {h.get("cadence_days", 0):g} days {sev}</li>')
+    charts = "".join(f'<div>{html.escape(cat)} <span class="note">{sum(series)} in {len(series)} days</span>{sparkline(series)}</div>'
+                     for cat, series in list(analytics.get("category_trends", {}).items())[:trends])
+    return f'<ol class="hot-list">{rows}</ol><h3>Releases per day by category</h3><div class="trends">{charts}</div>'
+
+def build_dashboard_page(recent_tools, todays_updates, health_html="", hot_html=""):
     run_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S %Z")
     recent_html = ""
     if not recent_tools:
@@ -191,27 +396,40 @@ def build_dashboard_page(recent_tools, todays_updates):
       <h2>Recently Added Tools</h2>
       <ul class="tools-list">{recent_html}</ul>
     </section>
+    <section class="card" style="grid-column:1 / -1">
+      <h2>Hot Tools</h2>
+      {hot_html}
+    </section>
+    <section class="card" style="grid-column:1 / -1">
+      <h2>Pipeline Health</h2>
+      {health_html}
+    </section>
   </div>
 """ + HTML_FOOT
 
+@metrics.instrumented("build_sources")
 def main():
     if not os.path.exists(CSV_IN):
         print(f"ERR: tracker not found at {CSV_IN}"); return
-    with open(CSV_IN, encoding="utf-8") as f:
-        all_rows = list(csv.DictReader(f))
-
-    approved_rows = [r for r in all_rows if r.get('Status', '').lower() != 'pending_review']
+    approved_rows = load_registry(CSV_IN).approved
     rows = [r for r in approved_rows if include_row(r)]
 
     # --- Dashboard page ---
     todays_updates = []
-    if os.path.exists(LOG_IN):
-        log = json.load(open(LOG_IN, "r", encoding="utf-8"))
-        today = datetime.now(timezone.utc).date().isoformat()
-        todays_updates = [item for item in log.get("items", []) if item.get("date", "") >= today]
+    today = datetime.now(timezone.utc).date().isoformat()
+    latest = load_index(INDEX_PATH)
+    if latest is not None:
+        # Latest item per tool is enough for the dashboard; no need to scan the whole log
+        todays_updates = sorted((item for item in latest["tools"].values() if item.get("date", "") >= today),
+                                key=lambda x: x.get("tool", "").lower())
+    elif os.path.exists(LOG_IN):
+        todays_updates = list(news_log.iter_items(LOG_IN, since=today))
     recent_tools = approved_rows[-10:]
     print("--- Building dashboard page ---")
-    dashboard_html = build_dashboard_page(recent_tools, todays_updates)
+    # Metrics of the last completed run (this run's report is written when the process exits)
+    health_html = build_health_html(metrics.load_report(), metrics.load_history(), feed_health.load())
+    analytics = load_json(ANALYTICS_IN, {}) if os.path.exists(ANALYTICS_IN) else {}
+    dashboard_html = build_dashboard_page(recent_tools, todays_updates, health_html, build_hot_html(analytics))
     print(f"Dashboard HTML generated ({len(dashboard_html)} bytes).")
     os.makedirs(os.path.dirname(OUT_INDEX) or ".", exist_ok=True)
     print(f"Attempting to write dashboard to {OUT_INDEX}...")
@@ -219,43 +437,19 @@ def main():
         f.write(dashboard_html)
     print(f"Successfully wrote dashboard to {OUT_INDEX}.")
 
-    # --- Sources pages (cards and table) ---
-    card_html, row_html = [], []
-    for r in rows:
-        tool = (r.get("Tool") or "").strip()
-        if not tool: continue
-        mon  = (r.get("Moniker") or "").strip()
-        cat  = (r.get("Category") or r.get("Source Type") or "Uncategorized").strip()
-        sev  = (r.get("Severity") or "Minor").strip()
-        stat = (r.get("Status") or r.get("Updates") or "—").strip()
-        site = icon_link(r.get("Website URL",""), "site")
-        docs = icon_link(r.get("Docs URL",""), "docs")
-        repo = icon_link(r.get("Repo URL",""), "repo")
-        feed = icon_link(r.get("Feed URL",""), "rss")
-        card_html.append(f"""
-        <section class="card">
-          <h2>{html.escape(tool)}</h2>
-          <div class="meta">
-            <span class="chip">{html.escape(mon or '')}</span>
-            <span class="chip">{html.escape(cat)}</span>
-            {sev_badge(sev)}
-          </div>
-          <div class="icons">{site}{docs}{repo}{feed}</div>
-          <p class="status">{html.escape(stat)}</p>
-        </section>""")
-        row_html.append(f"""
-        <tr>
-          <td>{html.escape(tool)}</td>
-          <td><code>{html.escape(mon)}</code></td>
-          <td>{html.escape(cat)}</td>
-          <td>{sev_badge(sev)}</td>
-          <td>{html.escape(stat)}</td>
-          <td style="white-space:nowrap">{site}{docs}{repo}{feed}</td>
-        </tr>""")
-    os.makedirs(os.path.dirname(OUT_LIST) or ".", exist_ok=True)
-    open(OUT_LIST, "w", encoding="utf-8").write(build_list("".join(card_html)))
-    open(OUT_TAB,  "w", encoding="utf-8").write(build_table("".join(row_html)))
-    print(f"Built {OUT_LIST} and {OUT_TAB} with {len(rows)} filtered tools.")
+    # --- Sources pages (cards and table) over one JSON dataset ---
+    dataset = build_dataset(rows)
+    os.makedirs(os.path.dirname(OUT_DATA) or ".", exist_ok=True)
+    with open(OUT_DATA, "w", encoding="utf-8") as f:
+        json.dump(dataset, f, ensure_ascii=False, separators=(",", ":"))
+    total = len(dataset["rows"])
+    for out, view in ((OUT_LIST, "cards"), (OUT_TAB, "table")):
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+        data_url = os.path.relpath(OUT_DATA, os.path.dirname(out) or ".").replace(os.sep, "/")
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(build_shell(view, data_url, total))
+    metrics.count("items_rendered", total)
+    print(f"Built {OUT_DATA} ({total} filtered tools), {OUT_LIST} and {OUT_TAB}.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# PSAI: on-disk HTTP cassette shared by httpclient.py (record) and
+# standin_server.py (replay). One entry per URL: <sha1>.json holds url, status,
+# headers and response time, <sha1>.body the raw body. Recording the same URL
+# again replaces its entry.
+
+import os, json, hashlib, threading
+
+SKIP_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection")
+_lock = threading.Lock()
+
+def key(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+def save(cassette_dir, url, status, headers, body, elapsed_s):
+    k = key(url)
+    meta = {"url": url, "status": status, "elapsed_s": round(elapsed_s, 3),
+            "headers": {h: v for h, v in headers.items() if h.lower() not in SKIP_HEADERS}}
+    with _lock:
+        os.makedirs(cassette_dir, exist_ok=True)
+        with open(os.path.join(cassette_dir, k + ".body"), "wb") as f:
+            f.write(body or b"")
+        with open(os.path.join(cassette_dir, k + ".json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+
+def load(cassette_dir, url):
+    """Returns (meta, body), or (None, None) when the URL was never recorded."""
+    k = key(url)
+    meta_path = os.path.join(cassette_dir, k + ".json")
+    if not os.path.exists(meta_path):
+        return None, None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    with open(os.path.join(cassette_dir, k + ".body"), "rb") as f:
+        return meta, f.read()
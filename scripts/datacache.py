@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# PSAI: process-wide cache of parsed data files.
+#
+# When several steps run in one process (scripts/psai.py) they share the parsed
+# form of tools.csv, news_log.json, ... instead of re-reading them. Entries are
+# keyed by path and invalidated when the file's mtime/size change, so a step
+# always sees what the previous step wrote. Callers get fresh containers; the
+# row/item dicts inside are shared and must be treated as read-only.
+# A miss first tries the on-disk snapshot of the parsed file (snapshot.py), so
+# a cold process skips re-parsing files that haven't changed since.
+
+import os, csv, json, threading
+import metrics, snapshot
+
+_lock = threading.Lock()
+_cache = {}
+
+def _stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+def _read_csv(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _cached(path, parse):
+    key = os.path.abspath(path)
+    stamp = _stamp(path)
+    with _lock:
+        hit = _cache.get(key)
+    if hit and hit[0] == stamp and hit[1] is parse:
+        metrics.cache("datacache", True)
+        return hit[2]
+    metrics.cache("datacache", False)
+    value = snapshot.load(path, parse)
+    metrics.cache("snapshot", value is not None)
+    if value is None:
+        value = parse(path)
+        if _stamp(path) == stamp:
+            snapshot.save(path, parse, value)
+    with _lock:
+        _cache[key] = (stamp, parse, value)
+    return value
+
+def load_csv(path):
+    if not os.path.exists(path): return []
+    return [dict(r) for r in _cached(path, _read_csv)]
+
+def load_json(path, default):
+    if not os.path.exists(path): return default
+    data = _cached(path, _read_json)
+    if isinstance(data, dict):
+        return {k: list(v) if isinstance(v, list) else v for k, v in data.items()}
+    return list(data) if isinstance(data, list) else data
+
+def load_parsed(path, parse):
+    """parse(path), cached like the loaders above; the result is shared, not copied. None if path is missing."""
+    if not os.path.exists(path): return None
+    return _cached(path, parse)
+
+def clear():
+    with _lock:
+        _cache.clear()
@@ -1,21 +1,57 @@
 #!/usr/bin/env python
-import os, re, json, csv, requests
+import argparse, os, re, json
 from xml.etree import ElementTree as ET
+import metrics, httpclient, feed_health, neardup
+from seen_store import SeenStore, SEEN_PATH, canonical, filters_stamp
+from datacache import load_csv
+from tool_registry import load_registry
+from merge_candidates import ARTICLE_HOST_RX
 
 SOURCES_PATH = os.getenv("PSAI_SOURCES_CSV", "data/sources.csv")
 FILTERS_PATH = os.getenv("PSAI_FILTERS_CSV", "data/filters.csv")
 TOOLS_PATH = os.getenv("PSAI_TOOLS_CSV", "data/tools.csv")
 CANDIDATES_PATH = os.getenv("PSAI_CANDIDATES_JSON", "data/candidates.json")
-HEADERS = {"User-Agent": "psai-discover/2.0"}
+ARTICLES_PATH = os.getenv("PSAI_ARTICLES_CSV", "data/articles.csv")
 
-def load_csv(path):
-    if not os.path.exists(path): return []
-    with open(path, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+def aggregator(url):
+    m = re.match(r'https?://([^/]+)', url or '')
+    return bool(m and ARTICLE_HOST_RX.search(m.group(1)))
 
-def fetch_and_parse_rss(url):
+def fold_near_duplicates(candidates, feeds, articles):
+    """One candidate per near-duplicate cluster, listing every link; drops candidates matching a known article.
+
+    Returns (kept candidates, verdict per input candidate)."""
+    titles = [a.get('Tool', '') for a in articles] + [c['tool'] for c in candidates]
+    urls = [a.get('Website URL', '') for a in articles] + [c['website_url'] for c in candidates]
+    sources = [''] * len(articles) + feeds
+    n = len(articles)
+    out, verdicts = [], ["duplicate"] * len(candidates)
+    for group in neardup.cluster(titles, urls, sources=sources):
+        if group[0] < n:
+            for i in group:
+                if i >= n:
+                    verdicts[i - n] = "known_article"
+            continue
+        members = [candidates[i - n] for i in group]
+        # The product's own site over a Product Hunt / HN / Reddit page
+        best = min(range(len(members)), key=lambda k: aggregator(members[k]['website_url']))
+        verdicts[group[best] - n] = "accepted"
+        canon = dict(members[best])
+        if len(members) > 1:
+            canon['links'] = list(dict.fromkeys(c['website_url'] for c in members if c['website_url']))
+        out.append(canon)
+    return out, verdicts
+
+def fetch_and_parse_rss(url, seen=None):
+    if not feed_health.allow(url):
+        print(f"  - Skipping quarantined feed {url}")
+        return []
     try:
-        r = requests.get(url, headers=HEADERS, timeout=30)
+        r = httpclient.get(url, headers=seen.validators(url) if seen else None)
+        if r.status_code == 304:
+            feed_health.ok(url)
+            print("  - Not modified since last run")
+            return []
         r.raise_for_status()
         root = ET.fromstring(r.text)
         items = []
@@ -30,54 +66,86 @@ def fetch_and_parse_rss(url):
                 title = entry.find('a:title', ns).text or ''
                 link = entry.find('a:link', ns).get('href') or ''
                 items.append({'title': title, 'link': link})
-        return items
     except Exception as e:
         print(f"Error fetching/parsing {url}: {e}")
+        feed_health.fail(url, e)
         return []
+    feed_health.ok(url)
+    if seen:
+        seen.note_feed(url, r.headers)
+    metrics.count("items_parsed", len(items))
+    return items
+
+@metrics.instrumented("discover")
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--base-url", default=httpclient.BASE_URL, help="Fetch through a stand-in server (see standin_server.py)")
+    ap.add_argument("--seen", default=SEEN_PATH, help="Store of entries already judged ('' re-judges everything)")
+    args = ap.parse_args(argv)
+    httpclient.set_base_url(args.base_url)
 
-def main():
     sources = load_csv(SOURCES_PATH)
     filters = load_csv(FILTERS_PATH)
-    tools = load_csv(TOOLS_PATH)
+    tools = load_registry(TOOLS_PATH)
+    articles = load_csv(ARTICLES_PATH) if os.path.exists(ARTICLES_PATH) else []
 
     include_rx = re.compile(next((f['pattern'] for f in filters if f['type'] == 'include'), '.*'), re.I)
     exclude_rx = re.compile(next((f['pattern'] for f in filters if f['type'] == 'exclude'), '^$'), re.I)
+    seen = SeenStore.open(args.seen, filters_stamp(filters)) if args.seen else None
 
-    existing_tools_by_url = {t['Website URL'] for t in tools if t.get('Website URL')}
-    existing_tools_by_name = {t['Tool'].lower() for t in tools}
-
-    candidates = []
+    candidates, feeds, keys = [], [], {}
     for source in sources:
         url = source.get('Feed URL')
         if not url or source.get('Tracking Method') != 'RSS':
             continue
 
         print(f"Scanning source: {source['Tool']}")
-        items = fetch_and_parse_rss(url)
+        items = fetch_and_parse_rss(url, seen)
         for item in items:
             title = item.get('title', '')
             link = item.get('link', '')
-            if link in existing_tools_by_url:
-                continue
-            if title.lower() in existing_tools_by_name:
+            key = canonical(link, title)
+            # Judged on an earlier run (or earlier in this one): nothing to do
+            if key in keys or (seen and seen.get(key) is not None):
                 continue
-
-            if include_rx.search(title) and not exclude_rx.search(title):
+            if (link and tools.find_url(link)) or tools.find_name(title):
+                verdict = "known_tool"
+            elif not include_rx.search(title):
+                verdict = "rejected:include"
+            elif exclude_rx.search(title):
+                verdict = "rejected:exclude"
+            else:
                 moniker = re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
-                candidate = {
+                keys[key] = len(candidates)
+                candidates.append({
                     "tool": title,
                     "moniker": moniker,
                     "category": "pending_review",
                     "website_url": link,
                     "source_type": source.get("Source Type"),
                     "status": "pending_review"
-                }
-                if candidate not in candidates:
-                    candidates.append(candidate)
-                    print(f"  + Found candidate: {title}")
+                })
+                feeds.append(url)
+                print(f"  + Found candidate: {title}")
+                continue
+            keys[key] = None
+            if seen:
+                seen.record(key, verdict)
 
+    found = len(candidates)
+    candidates, verdicts = fold_near_duplicates(candidates, feeds, articles)
+    if seen:
+        for key, i in keys.items():
+            if i is not None:
+                seen.record(key, verdicts[i])
+        seen.save()
+        print(f"Skipped {seen.hits} entries judged on earlier runs; store holds {len(seen.items)}")
+    metrics.count("items_kept", len(candidates))
+    if found > len(candidates):
+        print(f"Folded {found - len(candidates)} near-duplicate candidate(s)")
     with open(CANDIDATES_PATH, 'w', encoding='utf-8') as f:
         json.dump({"items": candidates}, f, ensure_ascii=False, indent=2)
+    feed_health.save()
     print(f"Wrote {len(candidates)} new candidates to {CANDIDATES_PATH}")
 
 if __name__ == "__main__":
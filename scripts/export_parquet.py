@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# PSAI: append-only Parquet export of the news log, tools and articles.
+#
+# news_log.json only holds 30 days and tools.csv/articles.csv only the current
+# state; this keeps the history as typed, compressed columns under
+# data/parquet/ (Hive layout, zstd):
+#
+#   news/month=2026-01/category=Agent/part-<run>-0.parquet      one row per item
+#   tools/month=2026-01/category=Agent/part-<run>-0.parquet     one row per changed tool
+#   articles/month=2026-01/category=Article/part-<run>-0.parquet
+#
+# news is partitioned by the item's month, tools by the export month and
+# articles by the month they were added. Each run only writes new files: news
+# items not exported before, and tool/article rows whose content changed since
+# the last export (a "removed" row when one disappears from the CSV). What has
+# been exported is kept in data/parquet/_state.json. Dates are date32, stars
+# and contributors integers, severity/status/repo_status dictionary-encoded.
+#
+# Reading (pyarrow, or anything that reads Hive-partitioned Parquet):
+#   import export_parquet as ep
+#   ep.read("news", since="2026-01-01", columns=["date", "tool", "severity"]).to_pandas()
+#   ep.latest("tools")   # one row per tool, as of the last export
+#
+# pyarrow is optional: without it the step prints a note and does nothing.
+
+import argparse, csv, hashlib, json, os
+from datetime import date, datetime, timezone
+import metrics, news_log
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
+
+LOG_PATH = os.getenv("PSAI_LOG_PATH", "data/news_log.json")
+TOOLS_PATH = os.getenv("PSAI_TOOLS_CSV", "data/tools.csv")
+ARTICLES_PATH = os.getenv("PSAI_ARTICLES_CSV", "data/articles.csv")
+OUT_DIR = os.getenv("PSAI_PARQUET_DIR", "data/parquet")
+COMPRESSION = os.getenv("PSAI_PARQUET_COMPRESSION", "zstd")
+PARTITIONS = ["month", "category"]
+
+# CSV header -> (column, type) for tools.csv and articles.csv
+REGISTRY_COLUMNS = [
+    ("Tool", "tool", "string"), ("Moniker", "moniker", "string"), ("Severity", "severity", "dict"),
+    ("RSS Available", "rss_available", "bool"), ("Feed URL", "feed_url", "string"),
+    ("Tracking Method", "tracking_method", "dict"), ("Repo URL", "repo_url", "string"),
+    ("Repo Status", "repo_status", "dict"), ("Stars", "stars", "int64"), ("Contributors", "contributors", "int32"),
+    ("Docs URL", "docs_url", "string"), ("Website URL", "website_url", "string"),
+    ("Source Type", "source_type", "dict"), ("Discovery Method", "discovery_method", "dict"),
+    ("Launch Status", "launch_status", "dict"), ("Last Seen Update", "last_seen_update", "date"),
+    ("Status", "status", "string"), ("Date Added", "date_added", "date"),
+]
+NEWS_COLUMNS = [("id", "string"), ("date", "date"), ("tool", "string"), ("moniker", "string"),
+                ("severity", "dict"), ("headline", "string"), ("link", "string"), ("source", "string"),
+                ("links", "list"), ("sources", "list")]
+
+def _type(kind):
+    return {"string": pa.string(), "dict": pa.dictionary(pa.int32(), pa.string()), "bool": pa.bool_(),
+            "int64": pa.int64(), "int32": pa.int32(), "date": pa.date32(), "list": pa.list_(pa.string()),
+            "ts": pa.timestamp("s", tz="UTC")}[kind]
+
+def schema(name):
+    """The fixed schema of a dataset's files (partition columns excluded)."""
+    if name == "news":
+        cols = NEWS_COLUMNS
+    else:
+        cols = [("key", "string"), ("snapshot", "date"), ("removed", "bool")] + [(c, t) for _, c, t in REGISTRY_COLUMNS]
+    return pa.schema([(c, _type(t)) for c, t in cols] + [("exported", _type("ts"))])
+
+def to_date(s):
+    try:
+        return date.fromisoformat((s or "").strip()[:10])
+    except ValueError:
+        return None
+
+def to_int(s):
+    s = (s or "").replace(",", "").strip()
+    try:
+        return int(float(s)) if s else None
+    except ValueError:
+        return None
+
+def to_bool(s):
+    s = (s or "").strip().lower()
+    if s in ("✅", "yes", "true", "1", "y"):
+        return True
+    if s in ("❌", "no", "false", "0", "n"):
+        return False
+    return None
+
+CONVERT = {"date": to_date, "int64": to_int, "int32": to_int, "bool": to_bool}
+
+def registry_row(r):
+    return {c: CONVERT.get(t, lambda v: v or None)(r.get(h)) for h, c, t in REGISTRY_COLUMNS}
+
+def registry_key(r):
+    return (r.get("Moniker") or r.get("Website URL") or r.get("Tool") or "").strip().lower()
+
+def news_row(it):
+    row = {"id": news_log.item_key(it), "date": to_date(it.get("date"))}
+    for c, _ in NEWS_COLUMNS[2:]:
+        v = it.get(c)
+        row[c] = (list(v) if v else None) if c in ("links", "sources") else (v or None)
+    return row
+
+def load_state(root):
+    try:
+        with open(os.path.join(root, "_state.json"), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        state = {}
+    for k in ("news", "tools", "articles"):
+        state.setdefault(k, {})
+    return state
+
+def save_state(state, root):
+    path = os.path.join(root, "_state.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def new_news(path, seen):
+    """Log items not exported yet; forgets ids older than anything still in the log."""
+    rows, oldest = [], None
+    if os.path.exists(path):
+        for it in news_log.iter_items(path):
+            d = it.get("date", "")[:10]
+            oldest = d if oldest is None or d < oldest else oldest
+            row = news_row(it)
+            if row["id"] not in seen:
+                seen[row["id"]] = d
+                row["category"] = it.get("category") or "Other"
+                rows.append(row)
+    for k in [k for k, d in seen.items() if oldest is None or d < oldest]:
+        del seen[k]
+    return rows
+
+def changed_registry(path, seen, today):
+    """Rows of a registry CSV that changed since the last export, plus tombstones for removed ones."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        current = {}
+        for r in csv.DictReader(f):
+            current.setdefault(registry_key(r), r)  # first row wins, as in the registry
+    current.pop("", None)
+    rows = []
+    for key, r in current.items():
+        h = hashlib.sha1(json.dumps(r, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        cat = r.get("Category") or "Other"
+        if seen.get(key, [None])[0] == h:
+            continue
+        seen[key] = [h, cat, r.get("Tool", "")]
+        rows.append({"key": key, "snapshot": today, "removed": False, "category": cat, **registry_row(r)})
+    for key in [k for k in seen if k not in current]:
+        _, cat, tool = seen.pop(key)
+        rows.append({"key": key, "snapshot": today, "removed": True, "category": cat, "tool": tool})
+    return rows
+
+def write(name, rows, root, now):
+    """Appends rows as new files in their month/category partitions."""
+    if not rows:
+        return 0
+    sch = schema(name)
+    for r in rows:
+        r["exported"] = now
+        d = r.get("date") if name == "news" else (r.get("date_added") if name == "articles" else None)
+        r["month"] = (d or r.get("snapshot") or now.date()).strftime("%Y-%m")
+    part = pa.schema([(c, pa.string()) for c in PARTITIONS])
+    table = pa.Table.from_pylist(rows, schema=pa.schema(list(sch) + list(part)))
+    ds.write_dataset(table, os.path.join(root, name), format="parquet",
+                     partitioning=ds.partitioning(part, flavor="hive"),
+                     basename_template=f"part-{now:%Y%m%dT%H%M%S}-{{i}}.parquet",
+                     existing_data_behavior="overwrite_or_ignore",
+                     file_options=ds.ParquetFileFormat().make_write_options(compression=COMPRESSION))
+    return len(rows)
+
+def dataset(name, root=OUT_DIR):
+    if pa is None:
+        raise ImportError("export_parquet needs pyarrow (pip install pyarrow)")
+    part = pa.schema([(c, pa.string()) for c in PARTITIONS])
+    return ds.dataset(os.path.join(root, name), format="parquet", partitioning=ds.partitioning(part, flavor="hive"),
+                      schema=pa.schema(list(schema(name)) + list(part)))
+
+def read(name, root=OUT_DIR, since=None, until=None, category=None, columns=None, filter=None):
+    """A dataset ("news", "tools" or "articles") as a pyarrow Table.
+
+    since/until are inclusive ISO dates on the item date (news) or the export
+    date (tools, articles); for news and tools they also prune whole month
+    partitions."""
+    d = dataset(name, root)
+    col = "date" if name == "news" else "snapshot"
+    by_month = name != "articles"  # articles are partitioned by date added, not export date
+    expr = filter
+    def both(e):
+        return e if expr is None else expr & e
+    if since:
+        expr = both(ds.field(col) >= date.fromisoformat(since))
+        if by_month:
+            expr = expr & (ds.field("month") >= since[:7])
+    if until:
+        expr = both(ds.field(col) <= date.fromisoformat(until))
+        if by_month:
+            expr = expr & (ds.field("month") <= until[:7])
+    if category:
+        expr = both(ds.field("category") == category)
+    return d.to_table(columns=columns, filter=expr)
+
+def latest(name="tools", root=OUT_DIR, as_of=None, include_removed=False):
+    """One row per tool/article: its last exported state (as of an ISO date)."""
+    t = read(name, root, until=as_of)
+    if not t.num_rows:
+        return t
+    last = t.group_by("key").aggregate([("exported", "max")]).rename_columns(["key", "exported"])
+    t = t.unify_dictionaries().join(last, keys=["key", "exported"], join_type="inner")
+    if not include_removed:
+        t = t.filter(pc.invert(t["removed"]))
+    return t.sort_by("key")
+
+@metrics.instrumented("parquet")
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Append new news items and changed tools/articles to the Parquet datasets")
+    ap.add_argument("--out", default=OUT_DIR)
+    ap.add_argument("--log", default=LOG_PATH)
+    ap.add_argument("--tools", default=TOOLS_PATH)
+    ap.add_argument("--articles", default=ARTICLES_PATH)
+    args = ap.parse_args(argv)
+    if pa is None:
+        print("pyarrow not installed; skipping Parquet export")
+        return
+
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    os.makedirs(args.out, exist_ok=True)
+    state = load_state(args.out)
+    n_news = write("news", new_news(args.log, state["news"]), args.out, now)
+    n_tools = write("tools", changed_registry(args.tools, state["tools"], now.date()), args.out, now)
+    n_arts = write("articles", changed_registry(args.articles, state["articles"], now.date()), args.out, now)
+    save_state(state, args.out)
+    metrics.count("items_kept", n_news + n_tools + n_arts)
+    print(f"Parquet export: {n_news} news item(s), {n_tools} tool row(s), {n_arts} article row(s) -> {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# PSAI: per-URL health records and circuit breaker for feeds and sites.
+#
+# harvest, discover and rescan call allow(url) before fetching and ok()/fail()
+# after. After PSAI_QUARANTINE_AFTER consecutive failures (default 3) a URL is
+# quarantined: skipped until skip_until, which starts at PSAI_QUARANTINE_BASE_H
+# hours (default 24) and doubles with every further failure up to
+# PSAI_QUARANTINE_MAX_H (default 14 days). Once the cooldown is over the next
+# run probes the URL once; a success clears the record, a failure extends the
+# quarantine. Rate limiting (429, or 403 with X-RateLimit-Remaining: 0) is not
+# held against a feed. A sharded harvest (harvest.py --shard) carries the
+# records it touched in its segment; the merge takes them in with merge().
+#
+# data/feed_health.json:
+#   {"updated": "...", "urls": {url: {"failures", "error", "last_error",
+#                                     "last_success", "skip_until", "skipped"}}}
+
+import os, json, threading
+from datetime import datetime, timedelta, timezone
+
+HEALTH_PATH = os.getenv("PSAI_FEED_HEALTH", "data/feed_health.json")
+QUARANTINE_AFTER = int(os.getenv("PSAI_QUARANTINE_AFTER", "3"))
+BASE_H = float(os.getenv("PSAI_QUARANTINE_BASE_H", "24"))
+MAX_H = float(os.getenv("PSAI_QUARANTINE_MAX_H", str(24 * 14)))
+
+_lock = threading.Lock()
+_state = None
+_touched = set()
+
+def _now():
+    return datetime.now(timezone.utc)
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _parse(s):
+    try:
+        return datetime.strptime(s, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+def load(path=None):
+    try:
+        with open(path or HEALTH_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data.setdefault("urls", {})
+        return data
+    except (OSError, json.JSONDecodeError):
+        return {"updated": "", "urls": {}}
+
+def _urls():
+    global _state
+    if _state is None:
+        _state = load()
+    return _state["urls"]
+
+def error_class(e):
+    resp = getattr(e, "response", None)
+    status = getattr(resp, "status_code", None)
+    if status:
+        return f"HTTP {status}"
+    return type(e).__name__
+
+def rate_limited(e):
+    resp = getattr(e, "response", None)
+    status = getattr(resp, "status_code", None)
+    if status == 429:
+        return True
+    return status == 403 and getattr(resp, "headers", {}).get("X-RateLimit-Remaining") == "0"
+
+def allow(url):
+    """False while url is quarantined; the skip is counted on its record."""
+    with _lock:
+        rec = _urls().get(url)
+        if not rec:
+            return True
+        _touched.add(url)
+        until = _parse(rec.get("skip_until"))
+        if until and _now() < until:
+            rec["skipped"] = rec.get("skipped", 0) + 1
+            return False
+        return True
+
+def ok(url):
+    with _lock:
+        _urls()[url] = {"failures": 0, "last_success": _iso(_now())}
+        _touched.add(url)
+
+def fail(url, e):
+    if rate_limited(e):
+        return
+    with _lock:
+        rec = _urls().setdefault(url, {"failures": 0})
+        _touched.add(url)
+        rec["failures"] = rec.get("failures", 0) + 1
+        rec["error"] = error_class(e) if isinstance(e, BaseException) else str(e)
+        rec["last_error"] = _iso(_now())
+        over = rec["failures"] - QUARANTINE_AFTER
+        if over >= 0:
+            hours = min(MAX_H, BASE_H * (2 ** over))
+            rec["skip_until"] = _iso(_now() + timedelta(hours=hours))
+            print(f"  ! Quarantining {url} for {hours:g}h after {rec['failures']} failures ({rec['error']})")
+
+def touched():
+    """{url: record} for the URLs this process checked or updated (a harvest shard's share)."""
+    with _lock:
+        urls = _urls()
+        return {u: urls[u] for u in sorted(_touched) if u in urls}
+
+def merge(records):
+    """Takes in records from touched() of other processes, replacing ours for those URLs."""
+    with _lock:
+        _urls().update(records)
+
+def quarantined(data, now=None):
+    """[(url, record)] currently skipped, soonest probe first."""
+    now = now or _now()
+    out = [(u, r) for u, r in data.get("urls", {}).items() if (_parse(r.get("skip_until")) or now) > now]
+    return sorted(out, key=lambda ur: ur[1]["skip_until"])
+
+def save(path=None):
+    path = path or HEALTH_PATH
+    with _lock:
+        if _state is None:
+            return
+        _state["updated"] = _iso(_now())
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_state, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, path)
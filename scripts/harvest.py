@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 print("--- Executing harvest.py v1.1 ---")
-import argparse, os, json, csv, re
+import argparse, os, sys, json, re, math, time, subprocess, zlib
 from datetime import datetime, timedelta, timezone
 import requests
 from xml.etree import ElementTree as ET
@@ -8,11 +8,19 @@ try:
     from bs4 import BeautifulSoup
 except Exception:
     BeautifulSoup = None
+import metrics, httpclient, feed_health, news_log, neardup, websub
+from datacache import load_csv, load_json
+from harvest_journal import HarvestJournal, JOURNAL_PATH, MAX_AGE_H
+from tool_registry import load_registry
+from latest_index import INDEX_PATH, load_index, build_index, note_item, save_index
 
 TZ = timezone.utc
 NOW = datetime.now(TZ)
 CUTOFF = NOW - timedelta(days=30)
-HEADERS = {"User-Agent": "psai/1.3"}
+DEADLINE_S = float(os.getenv("PSAI_HARVEST_DEADLINE_S", "0"))
+SAVE_RESERVE_S = float(os.getenv("PSAI_HARVEST_SAVE_RESERVE_S", "30"))
+SHARDS = int(os.getenv("PSAI_HARVEST_SHARDS", "1"))
+SEGMENT_DIR = os.getenv("PSAI_SEGMENT_DIR", ".psai/segments")
 
 def ensure_aware(dt):
     # Force timezone-aware (UTC) datetimes
@@ -54,23 +62,51 @@ def iso_date(s, fallback=None):
             continue
     return ensure_aware(fallback or NOW)
 
-def load_json(path, default):
-    return json.load(open(path, "r", encoding="utf-8")) if os.path.exists(path) else default
-
 def save_json(path, data):
-    json.dump(data, open(path, "w", encoding="utf-8"), ensure_ascii=False, indent=2)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+class Deadline:
+    """Overall time budget for a harvest; 0 means none. `reserve` seconds are kept for saving."""
+    def __init__(self, seconds, reserve):
+        self.end = time.monotonic() + seconds if seconds > 0 else None
+        self.reserve = reserve
+
+    def remaining(self):
+        return None if self.end is None else self.end - self.reserve - time.monotonic()
+
+    def expired(self):
+        left = self.remaining()
+        return left is not None and left <= 0
+
+    def budget(self):
+        """Seconds one fetch (retries and backoff included) may take without running into the reserve."""
+        left = self.remaining()
+        return None if left is None else max(1.0, left)
+
+DEADLINE = Deadline(0, 0)
+HUBS = websub.Hubs(None)
 
 def fetch(url):
-    r = requests.get(url, headers=HEADERS, timeout=30)
+    r = httpclient.get(url, budget_s=DEADLINE.budget())
     r.raise_for_status()
     return r.text
 
 def from_github_releases(repo):
     url = f"https://api.github.com/repos/{repo}/releases"
-    r = requests.get(url, headers=HEADERS, timeout=30)
-    r.raise_for_status()
+    if not feed_health.allow(url):
+        print(f"  - Skipping quarantined {url}")
+        return []
+    try:
+        r = httpclient.get(url, budget_s=DEADLINE.budget())
+        r.raise_for_status()
+        releases = r.json()
+    except (requests.RequestException, ValueError) as e:
+        feed_health.fail(url, e)
+        raise
+    feed_health.ok(url)
     out = []
-    for rel in r.json():
+    for rel in releases:
         dt = rel.get("published_at") or rel.get("created_at") or NOW.isoformat()
         when = iso_date(dt, NOW)
         out.append({
@@ -78,18 +114,15 @@ def from_github_releases(repo):
             "headline": rel.get("name") or rel.get("tag_name") or "Release",
             "link": rel.get("html_url")
         })
+    metrics.count("items_parsed", len(out))
     return out
 
-def from_rss(url):
-    try:
-        text = fetch(url)
-        # Clean up common XML issues like unescaped ampersands before parsing
-        text = re.sub(r'&(?![a-zA-Z]+;|#[0-9]+;)', '&amp;', text)
-        root = ET.fromstring(text)
-        items = []
-    except (requests.RequestException, ET.ParseError) as e:
-        print(f"  ! Failed to fetch/parse RSS feed {url}: {e}")
-        return []
+def parse_feed(text):
+    """(root element, [{"date", "headline", "link"}]) of an RSS or Atom document."""
+    # Clean up common XML issues like unescaped ampersands before parsing
+    text = re.sub(r'&(?![a-zA-Z]+;|#[0-9]+;)', '&amp;', text)
+    root = ET.fromstring(text)
+    items = []
     # Try RSS
     for it in root.findall("./channel/item"):
         title = it.findtext("title") or "Update"
@@ -109,6 +142,23 @@ def from_rss(url):
             pub = pub_el.text if pub_el is not None else ""
             when = iso_date(pub, NOW)
             items.append({"date": when.strftime("%Y-%m-%d"), "headline": title, "link": link})
+    return root, items
+
+def from_rss(url):
+    if not feed_health.allow(url):
+        print(f"  - Skipping quarantined feed {url}")
+        return []
+    try:
+        r = httpclient.get(url, budget_s=DEADLINE.budget())
+        r.raise_for_status()
+        root, items = parse_feed(r.text)
+    except (requests.RequestException, ET.ParseError) as e:
+        print(f"  ! Failed to fetch/parse RSS feed {url}: {e}")
+        feed_health.fail(url, e)
+        return []
+    feed_health.ok(url)
+    HUBS.note(url, *websub.hub_links(root, r.headers))
+    metrics.count("items_parsed", len(items))
     return items
 
 def from_html(cfg):
@@ -127,6 +177,7 @@ def from_html(cfg):
         date = (dte.get("datetime") if dte else "") or ""
         when = iso_date(date, NOW)
         out.append({"date": when.strftime("%Y-%m-%d"), "headline": title, "link": link})
+    metrics.count("items_parsed", len(out))
     return out
 
 def classify_severity(text):
@@ -135,62 +186,311 @@ def classify_severity(text):
     if any(k in t for k in ["major","breaking","incident","outage","downtime","elevated errors","regression","launch","ga","v1.","v2.","released"]): return "Major"
     return "Minor"
 
-def load_csv(path):
-    if not os.path.exists(path): return []
-    return list(csv.DictReader(open(path, 'r', encoding='utf-8')))
+def match_tool(headline, tool_names):
+    """First tracked tool name mentioned as a whole word in headline, or None."""
+    return next((name for name in tool_names if re.search(r'\b' + re.escape(name) + r'\b', headline, re.I)), None)
+
+def press_entry(item, feed_url, tool_map):
+    """Log entry for a press item mentioning an approved tool, else None."""
+    headline = item.get('headline', '')
+    found_tool_name = match_tool(headline, tool_map.keys())
+    if not found_tool_name:
+        return None
+    tool_data = tool_map[found_tool_name]
+    return {
+        "date": item['date'],
+        "tool": tool_data['Tool'],
+        "moniker": tool_data.get('Moniker', ''),
+        "category": tool_data.get('Category', 'Updates'),
+        "severity": classify_severity(headline),
+        "headline": headline,
+        "link": item.get('link', ''),
+        "source": feed_url,
+    }
+
+def tool_entry(tool, u):
+    return {
+        "date": u['date'],
+        "tool": tool['Tool'],
+        "moniker": tool.get('Moniker', ''),
+        "category": tool.get('Category', 'Updates'),
+        "severity": classify_severity(u['headline']),
+        "headline": u['headline'],
+        "link": u.get('link', ''),
+        "source": tool.get('Feed URL') or tool.get('Repo URL'),
+    }
+
+def severity_counts(items):
+    """{tool: {"Security": n, "Major": n, ...}} over the log."""
+    out = {}
+    for it in items:
+        c = out.setdefault(it.get("tool", ""), {})
+        c[it.get("severity", "Minor")] = c.get(it.get("severity", "Minor"), 0) + 1
+    return out
+
+def tool_feed_url(tool):
+    if tool.get('Feed URL') and tool['Feed URL'] != 'N/A':
+        return tool['Feed URL']
+    m = re.search(r'github\.com/([^/]+/[^/]+)', tool.get('Repo URL') or '')
+    return f"https://api.github.com/repos/{m.group(1)}/releases" if m else ""
+
+def staleness(url, health):
+    """0..1: how long since url was last fetched successfully (1 = a week or more, or never)."""
+    last = health.get(url, {}).get("last_success")
+    if not last:
+        return 1.0
+    return min(1.0, (NOW - iso_date(last, NOW)).total_seconds() / (7 * 86400))
+
+def tool_priority(tool, latest, sev, health):
+    """Higher first: recently active tools, tools with a security/major history, feeds not fetched lately."""
+    item = latest["tools"].get(tool['Tool'])
+    recent = 0.0
+    if item and item.get("date"):
+        age = (NOW - iso_date(item["date"], NOW)).days
+        recent = 1.0 / (1 + max(age, 0) / 7)
+    s = sev.get(tool['Tool'], {})
+    return 3 * recent + math.log1p(3 * s.get("Security", 0) + s.get("Major", 0)) + staleness(tool_feed_url(tool), health)
 
 def save_log(log, path):
-    log["items"].sort(key=lambda x: (x.get("date", ""), x.get("tool", "")), reverse=True)
+    # headline/link break ties so the order doesn't depend on fetch order (or on sharding)
+    log["items"].sort(key=lambda x: (x.get("date", ""), x.get("tool", ""), x.get("headline", ""), x.get("link", "")), reverse=True)
     cutoff_date = (NOW - timedelta(days=30)).date().isoformat()
     log["items"] = [it for it in log["items"] if it.get("date", "") >= cutoff_date]
-    save_json(path, log)
+    # "order" goes ahead of "items" so streaming readers (news_log.py) can stop early
+    out = {"order": news_log.ORDER}
+    out.update((k, v) for k, v in log.items() if k not in ("order", "items"))
+    out["items"] = log["items"]
+    save_json(path, out)
+
+# Sharding: --shard I/N polls only the sources and tools whose stable hash
+# lands in shard I and writes what it found (items, feed health, hub notes) to
+# <segment dir>/harvest-I-of-N.json instead of the log. --merge-segments DIR
+# polls nothing and folds every segment into the log, in a fixed order, so N
+# workers (a CI matrix, or --shards N locally) give the same log as one.
+def shard_of(key, n):
+    """Shard of a feed URL or tool name; crc32, so stable across runners and Python versions."""
+    return zlib.crc32(key.strip().lower().encode("utf-8")) % n
+
+def parse_shard(s):
+    try:
+        i, n = (int(x) for x in s.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N, got {s!r}")
+    if not 0 <= i < n:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..{n - 1}")
+    return i, n
+
+def segment_path(seg_dir, i, n):
+    return os.path.join(seg_dir, f"harvest-{i}-of-{n}.json")
+
+def write_segment(path, seg):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(seg, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+
+def load_segments(seg_dir):
+    """Segments in seg_dir, by shard index; warns about shards with no segment."""
+    segs = []
+    names = sorted(os.listdir(seg_dir)) if os.path.isdir(seg_dir) else []
+    for name in names:
+        if not re.match(r"harvest-\d+-of-\d+\.json$", name):
+            continue
+        try:
+            segs.append(load_json(os.path.join(seg_dir, name), None))
+        except (OSError, ValueError) as e:
+            print(f"  ! Ignoring unreadable segment {name}: {e}")
+    segs = sorted((s for s in segs if s and s.get("shard")), key=lambda s: s["shard"])
+    for n in {s["shard"][1] for s in segs}:
+        missing = set(range(n)) - {s["shard"][0] for s in segs if s["shard"][1] == n}
+        if missing:
+            print(f"  ! No segment for shard(s) {', '.join(f'{i}/{n}' for i in sorted(missing))}; their feeds wait for the next run")
+    return segs
 
-def main():
+def without_flag(argv, flag):
+    out, skip = [], False
+    for a in argv:
+        if skip:
+            skip = False
+        elif a == flag:
+            skip = True
+        elif not a.startswith(flag + "="):
+            out.append(a)
+    return out
+
+def fan_out(argv, n, seg_dir):
+    """Runs shards 0..n-1 of this harvest as local processes, each writing its segment to seg_dir."""
+    for name in os.listdir(seg_dir) if os.path.isdir(seg_dir) else []:
+        if name.startswith("harvest-"):
+            os.remove(os.path.join(seg_dir, name))
+    base = [sys.executable, os.path.abspath(__file__)] + without_flag(without_flag(argv, "--shards"), "--segment-dir")
+    procs = []
+    for i in range(n):
+        # Own metrics files: the shards would otherwise race on data/metrics.json
+        env = dict(os.environ, PSAI_HARVEST_SHARDS="1",
+                   PSAI_METRICS_PATH=os.path.join(seg_dir, f"metrics-{i}.json"),
+                   PSAI_METRICS_HISTORY=os.path.join(seg_dir, f"metrics-history-{i}.json"),
+                   PSAI_METRICS_FETCHES=os.path.join(seg_dir, f"metrics-fetches-{i}.json"))
+        procs.append(subprocess.Popen(base + ["--shard", f"{i}/{n}", "--segment-dir", seg_dir], env=env))
+    for i, p in enumerate(procs):
+        if p.wait():
+            print(f"  ! Harvest shard {i}/{n} exited with {p.returncode}")
+
+@metrics.instrumented("harvest")
+def main(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument("--tools", required=True, help="Path to tools.csv")
     ap.add_argument("--sources", required=True, help="Path to sources.csv")
     ap.add_argument("--log", required=True, help="Path to news_log.json")
-    args = ap.parse_args()
+    ap.add_argument("--index", default=INDEX_PATH, help="Path to latest_per_tool.json")
+    ap.add_argument("--new-items", default=news_log.QUEUE_PATH, help="Queue the items added this run are appended to (for alerts)")
+    ap.add_argument("--journal", default=JOURNAL_PATH, help="Checkpoint journal path ('' disables checkpointing)")
+    ap.add_argument("--journal-max-age", type=float, default=MAX_AGE_H, help="Hours after which a leftover journal is discarded")
+    ap.add_argument("--base-url", default=httpclient.BASE_URL, help="Fetch through a stand-in server (see standin_server.py)")
+    ap.add_argument("--deadline", type=float, default=DEADLINE_S, help="Total seconds for the harvest (0 = no limit)")
+    ap.add_argument("--save-reserve", type=float, default=SAVE_RESERVE_S, help="Seconds kept before the deadline for saving")
+    ap.add_argument("--websub-hubs", default=websub.HUBS_PATH, help="Where feeds advertising a WebSub hub are noted ('' disables)")
+    ap.add_argument("--websub-subs", default=websub.SUBS_PATH, help="Subscriptions kept by websub.py serve; those feeds aren't polled")
+    ap.add_argument("--websub-queue", default=websub.QUEUE_PATH, help="Entries pushed by WebSub hubs, drained before polling")
+    ap.add_argument("--drain-only", action="store_true", help="Only take in pushed entries; poll nothing")
+    ap.add_argument("--shard", type=parse_shard, help="Poll only shard I of N (I/N) and write a segment, not the log")
+    ap.add_argument("--shards", type=int, default=SHARDS, help="Run N shard processes side by side, then merge their segments")
+    ap.add_argument("--segment-dir", default=SEGMENT_DIR, help="Where shards write their segments")
+    ap.add_argument("--merge-segments", metavar="DIR", help="Poll nothing; merge the segments in DIR into the log")
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = ap.parse_args(argv)
+    if args.shards > 1 and not (args.shard or args.merge_segments):
+        fan_out(argv, args.shards, args.segment_dir)
+        args.merge_segments = args.segment_dir
+    shard = args.shard
+    if shard:
+        root, ext = os.path.splitext(args.journal)
+        args.journal = args.journal and f"{root}.shard{shard[0]}of{shard[1]}{ext}"
+    elif args.merge_segments:
+        args.journal = ""
+    httpclient.set_base_url(args.base_url)
+    global DEADLINE, HUBS
+    DEADLINE = Deadline(args.deadline, args.save_reserve)
+    HUBS = websub.Hubs(args.websub_hubs)
 
-    tools = load_csv(args.tools)
+    tools = load_registry(args.tools)
     sources = load_csv(args.sources)
     log = load_json(args.log, {"items": []})
+    latest = load_index(args.index)
+    if latest is None:
+        latest = build_index(log.get("items", []))
+    # The same launch via Product Hunt, HN and the tool's own feed is one item listing every link
+    clusters = neardup.NewsClusters(log.get("items", []), {s.get('Feed URL') for s in sources if s.get('Feed URL')})
+    log["items"] = clusters.kept  # fold() appends new items here and swaps in its copies of merged ones
+    if clusters.removed:
+        print(f"Folded {clusters.removed} near-duplicate item(s) already in the log")
     existing = {(it.get("date"), it.get("tool"), it.get("headline")) for it in log.get("items", [])}
+    journal = HarvestJournal.open(args.journal, args.log, args.journal_max_age)
+    added, fresh = [], []
+
+    def add(entry, journaled=True):
+        key = (entry["date"], entry["tool"], entry["headline"])
+        if key in existing: return False
+        existing.add(key)
+        fresh.append(entry)
+        if journaled: journal.add_item(entry)
+        canon = clusters.fold(entry)
+        if canon is not None:
+            note_item(latest, canon)
+            metrics.count("near_duplicates")
+            return False
+        added.append(entry)
+        note_item(latest, entry)
+        metrics.count("items_kept")
+        return True
+
+    # Replay what an interrupted run already fetched
+    for entry in journal.items:
+        add(entry, journaled=False)
+
+    approved_tools = list(tools.approved)
+    tool_map = tools.approved_by_name
+    tools_by_feed = {t['Feed URL']: t for t in approved_tools if t.get('Feed URL') not in ("", "N/A", None)}
+    press_feeds = {s.get('Feed URL') for s in sources if s.get('Feed URL')}
 
-    approved_tools = [t for t in tools if t.get('Status') != 'pending_review']
-    tool_names = {t['Tool'].lower() for t in approved_tools}
-    tool_map = {t['Tool'].lower(): t for t in approved_tools}
+    segments = load_segments(args.merge_segments) if args.merge_segments else []
+    if segments:
+        # Press mentions first, then by date/tool/headline/link: the log doesn't depend on shard timing
+        entries = [e for seg in segments for e in seg.get("items", [])]
+        entries.sort(key=lambda e: (e.get("source") not in press_feeds, e.get("date", ""), e.get("tool", ""),
+                                    e.get("headline", ""), e.get("link", "")))
+        kept = sum(1 for e in entries if add(e, journaled=False))
+        for seg in segments:
+            feed_health.merge(seg.get("health", {}))
+            for u, rec in seg.get("hubs", {}).items():
+                HUBS.note(u, *((rec["hub"], rec["topic"]) if rec else (None,)))
+        deferred = [t for seg in segments for t in seg.get("deferred", [])]
+        metrics.count("shards", len(segments))
+        print(f"Merged {len(segments)} segment(s): {kept} new item(s) of {len(entries)}")
+    elif args.merge_segments:
+        print(f"  ! No harvest segments in {args.merge_segments}")
+
+    # Entries WebSub hubs pushed since the last run (taken in by the unsharded or merging harvest)
+    pushes = [] if shard else websub.drain(args.websub_queue)
+    for feed_url, body in pushes:
+        try:
+            items = parse_feed(body)[1]
+        except ET.ParseError as e:
+            print(f"  ! Unparseable push for {feed_url}: {e}")
+            continue
+        metrics.count("items_parsed", len(items))
+        for item in items:
+            if feed_url in tools_by_feed:
+                add(tool_entry(tools_by_feed[feed_url], item))
+            elif feed_url in press_feeds:
+                entry = press_entry(item, feed_url, tool_map)
+                if entry:
+                    add(entry)
+    if pushes:
+        print(f"Took in {len(pushes)} WebSub push(es)")
+    if not shard:
+        HUBS.keep(set(tools_by_feed) | press_feeds)
+
+    # Most valuable work first, so a slow or cut-short run still lands it
+    health = feed_health.load()["urls"]
+    # Feeds a hub pushes to (verified, unexpired subscription) skip the poll, bar a weekly safety poll
+    pushed = websub.pushed_feeds(args.websub_subs, health)
+    if pushed:
+        print(f"{len(pushed)} feed(s) arrive by WebSub push; not polling them")
+        metrics.count("push_skipped", len(pushed))
+    if args.drain_only or args.merge_segments:
+        sources, approved_tools = [], []
+    elif shard:
+        sources = [s for s in sources if shard_of(s.get('Feed URL') or '', shard[1]) == shard[0]]
+        approved_tools = [t for t in approved_tools if shard_of(t['Tool'], shard[1]) == shard[0]]
+        print(f"Shard {shard[0]}/{shard[1]}: {len(sources)} source(s), {len(approved_tools)} tool(s)")
+    sev = severity_counts(log.get("items", []))
+    approved_tools.sort(key=lambda t: tool_priority(t, latest, sev, health), reverse=True)
+    sources = sorted(sources, key=lambda s: staleness(s.get('Feed URL') or '', health), reverse=True)
+    if not segments:
+        deferred = []
 
     # Phase 1: Scan press sources for mentions of approved tools
     print("--- Phase 1: Scanning press sources ---")
     for source in sources:
         feed_url = source.get('Feed URL')
         if not feed_url: continue
+        if journal.is_done("sources", feed_url) or feed_url in pushed: continue
+        if DEADLINE.expired():
+            deferred.append(source['Tool']); continue
         print(f"Scanning source: {source['Tool']}")
         for item in from_rss(feed_url):
-            headline = item.get('headline', '')
-            found_tool_name = next((name for name in tool_names if re.search(r'\b' + re.escape(name) + r'\b', headline, re.I)), None)
-            if found_tool_name:
-                tool_data = tool_map[found_tool_name]
-                key = (item['date'], tool_data['Tool'], headline)
-                if key in existing: continue
-
-                print(f"  + Found mention of '{tool_data['Tool']}' in: {headline}")
-                log["items"].append({
-                    "date": item['date'],
-                    "tool": tool_data['Tool'],
-                    "moniker": tool_data.get('Moniker', ''),
-                    "category": tool_data.get('Category', 'Updates'),
-                    "severity": classify_severity(headline),
-                    "headline": headline,
-                    "link": item.get('link', ''),
-                    "source": feed_url,
-                })
-                existing.add(key)
+            entry = press_entry(item, feed_url, tool_map)
+            if entry and add(entry):
+                print(f"  + Found mention of '{entry['tool']}' in: {entry['headline']}")
+        journal.mark_done("sources", feed_url)
 
     # Phase 2: Scan direct tool feeds
     print("\n--- Phase 2: Scanning direct tool feeds ---")
     for tool in approved_tools:
+        if journal.is_done("tools", tool['Tool']) or tool.get('Feed URL') in pushed: continue
+        if DEADLINE.expired():
+            deferred.append(tool['Tool']); continue
         updates = []
         try:
             if tool.get('Feed URL') and tool['Feed URL'] != 'N/A':
@@ -205,23 +505,32 @@ def main():
             continue
 
         for u in updates:
-            key = (u['date'], tool['Tool'], u['headline'])
-            if key in existing: continue
-
-            log["items"].append({
-                "date": u['date'],
-                "tool": tool['Tool'],
-                "moniker": tool.get('Moniker', ''),
-                "category": tool.get('Category', 'Updates'),
-                "severity": classify_severity(u['headline']),
-                "headline": u['headline'],
-                "link": u.get('link', ''),
-                "source": tool.get('Feed URL') or tool.get('Repo URL'),
-            })
-            existing.add(key)
-
-    save_log(log, args.log)
-    print(f"\nHarvest complete. Log saved to {args.log}")
+            add(tool_entry(tool, u))
+        journal.mark_done("tools", tool['Tool'])
+
+    if shard:
+        polled = feed_health.touched()
+        path = segment_path(args.segment_dir, *shard)
+        write_segment(path, {"shard": list(shard), "items": fresh, "health": polled,
+                             "hubs": {u: HUBS.feeds.get(u) for u in polled}, "deferred": deferred})
+        print(f"Wrote {len(fresh)} item(s) to segment {path}")
+    else:
+        save_log(log, args.log)
+        save_index(latest, args.index)
+        news_log.append_new(added, args.new_items)
+        websub.drained(args.websub_queue)
+        HUBS.save()
+        feed_health.save()
+    if deferred:
+        # Keep the journal so a re-run within PSAI_JOURNAL_MAX_AGE_H picks up only the deferred work
+        journal.checkpoint()
+        metrics.count("deferred", len(deferred))
+        more = f" and {len(deferred) - 20} more" if len(deferred) > 20 else ""
+        print(f"\nDeadline reached; deferred {len(deferred)} source(s)/tool(s): {', '.join(deferred[:20])}{more}")
+    else:
+        journal.finish()
+    if not shard:
+        print(f"\nHarvest complete. Log saved to {args.log}")
 
 if __name__ == "__main__":
     main()
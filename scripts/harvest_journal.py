@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# PSAI: checkpoint journal for harvest.py.
+#
+# harvest only writes news_log.json once, at the end. The journal records which
+# press sources / tools are finished and the items they produced, and is written
+# every few units of work, so a cancelled or crashed run can be picked up by the
+# next one: finished work is replayed from the journal instead of re-fetched.
+# Journals older than the age limit are discarded; a completed harvest deletes it.
+
+import os, json, time
+from datetime import datetime, timezone
+
+JOURNAL_PATH = os.getenv("PSAI_HARVEST_JOURNAL", ".psai/harvest_journal.json")
+MAX_AGE_H = float(os.getenv("PSAI_JOURNAL_MAX_AGE_H", "12"))
+CHECKPOINT_EVERY = int(os.getenv("PSAI_CHECKPOINT_EVERY", "10"))
+CHECKPOINT_INTERVAL_S = float(os.getenv("PSAI_CHECKPOINT_INTERVAL_S", "30"))
+
+def _now():
+    return datetime.now(timezone.utc)
+
+class HarvestJournal:
+    def __init__(self, path, log_path, every=CHECKPOINT_EVERY, interval_s=CHECKPOINT_INTERVAL_S):
+        self.path = path
+        self.every = max(1, every)
+        self.interval_s = interval_s
+        self.data = {"started": _now().strftime("%Y-%m-%dT%H:%M:%SZ"), "log": os.path.abspath(log_path),
+                     "done": {"sources": [], "tools": []}, "items": []}
+        self._done = {"sources": set(), "tools": set()}
+        self._since = 0
+        self._last = time.monotonic()
+
+    @classmethod
+    def open(cls, path, log_path, max_age_h=MAX_AGE_H):
+        """Resumes a fresh journal for the same log, or starts an empty one."""
+        j = cls(path, log_path)
+        if not path or not os.path.exists(path):
+            return j
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            started = datetime.strptime(data["started"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"  ! Ignoring unreadable harvest journal {path}: {e}")
+            return j
+        age_h = (_now() - started).total_seconds() / 3600
+        if age_h > max_age_h:
+            print(f"Discarding harvest journal from {data['started']} ({age_h:.1f}h old, limit {max_age_h:g}h).")
+            return j
+        if data.get("log") != j.data["log"]:
+            print(f"Discarding harvest journal written for another log ({data.get('log')}).")
+            return j
+        j.data = data
+        j.data.setdefault("items", [])
+        done = j.data.setdefault("done", {})
+        for kind in ("sources", "tools"):
+            j._done[kind] = set(done.setdefault(kind, []))
+        print(f"Resuming harvest from journal of {data['started']}: "
+              f"{len(j._done['sources'])} source(s), {len(j._done['tools'])} tool(s) done, {len(j.data['items'])} item(s).")
+        return j
+
+    @property
+    def items(self):
+        return self.data["items"]
+
+    def is_done(self, kind, key):
+        return key in self._done[kind]
+
+    def add_item(self, item):
+        self.data["items"].append(item)
+
+    def mark_done(self, kind, key):
+        if key in self._done[kind]:
+            return
+        self._done[kind].add(key)
+        self.data["done"][kind].append(key)
+        self._since += 1
+        if self._since >= self.every or time.monotonic() - self._last >= self.interval_s:
+            self.checkpoint()
+
+    def checkpoint(self):
+        if not self.path:
+            return
+        self.data["updated"] = _now().strftime("%Y-%m-%dT%H:%M:%SZ")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self._since = 0
+        self._last = time.monotonic()
+
+    def finish(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
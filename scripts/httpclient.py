@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# PSAI: HTTP access for harvest, discover and rescan.
+#
+# All network calls go through get() (and post() for alert delivery), which
+# times them for metrics and adds:
+#   * one keep-alive requests.Session per thread, a single User-Agent and
+#     gzip (plus brotli when the brotli package is installed) accepted;
+#   * bounded retries on connection errors, timeouts, 429 and 5xx, with
+#     jittered exponential backoff and Retry-After honoured;
+#   * a token bucket per host (PSAI_HOST_RATE requests/s, overridable per host
+#     with PSAI_HOST_RATES="api.github.com=1,example.com=0.5");
+#   * one timeout for everything, PSAI_TIMEOUT_S (default 30), and an optional
+#     overall budget per call (budget_s) that bounds attempts and backoff sleeps;
+#   * record mode  - PSAI_HTTP_RECORD=<dir> saves every response (status,
+#     headers, timing, body) into a cassette directory that
+#     scripts/standin_server.py can serve back;
+#   * base-URL override - PSAI_BASE_URL=http://127.0.0.1:8765 (or --base-url on
+#     each script) rewrites https://host/path?q to <base>/https/host/path?q, so
+#     a run can go end to end against the local stand-in instead of the internet.
+
+import os, random, threading, time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+import metrics, cassette
+
+BASE_URL = os.getenv("PSAI_BASE_URL", "").rstrip("/")
+RECORD_DIR = os.getenv("PSAI_HTTP_RECORD", "")
+TIMEOUT_S = float(os.getenv("PSAI_TIMEOUT_S", "30"))
+RETRIES = int(os.getenv("PSAI_RETRIES", "3"))
+BACKOFF_S = float(os.getenv("PSAI_BACKOFF_S", "0.5"))
+BACKOFF_MAX_S = float(os.getenv("PSAI_BACKOFF_MAX_S", "30"))
+HOST_RATE = float(os.getenv("PSAI_HOST_RATE", "4"))
+HOST_BURST = float(os.getenv("PSAI_HOST_BURST", "4"))
+HOST_RATES = {h.strip(): float(r) for h, _, r in
+              (p.partition("=") for p in os.getenv("PSAI_HOST_RATES", "").split(",") if "=" in p)}
+USER_AGENT = os.getenv("PSAI_USER_AGENT", "psai/2.0 (+https://github.com/uberpu-ntiva/prindle-sprick-ai)")
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes br only when it is importable)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+_local = threading.local()
+
+def set_base_url(url):
+    global BASE_URL
+    BASE_URL = (url or "").rstrip("/")
+
+def rewrite(url):
+    """Maps an absolute URL onto the stand-in server when a base URL is set."""
+    if not BASE_URL:
+        return url
+    p = urlsplit(url)
+    if not p.scheme or not p.netloc:
+        return url
+    out = f"{BASE_URL}/{p.scheme}/{p.netloc}{p.path or '/'}"
+    return out + (f"?{p.query}" if p.query else "")
+
+def session():
+    s = getattr(_local, "session", None)
+    if s is None:
+        s = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
+        s.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+        _local.session = s
+    return s
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.t = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Blocks until a token is available."""
+        if self.rate <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.t) * self.rate)
+            self.t = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+def bucket(host):
+    with _buckets_lock:
+        b = _buckets.get(host)
+        if b is None:
+            rate = HOST_RATES.get(host, HOST_RATE)
+            b = _buckets[host] = TokenBucket(rate, min(HOST_BURST, max(rate, 1.0)))
+        return b
+
+def retry_after(r):
+    """Seconds asked for by a Retry-After header (delta or HTTP date), else None."""
+    v = r.headers.get("Retry-After") if r is not None else None
+    if not v:
+        return None
+    v = v.strip()
+    if v.isdigit():
+        return float(v)
+    try:
+        return max(0.0, (parsedate_to_datetime(v) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def backoff(attempt):
+    # Full jitter: uniform over [0, base * 2^attempt], capped
+    return random.uniform(0, min(BACKOFF_MAX_S, BACKOFF_S * (2 ** attempt)))
+
+def get(url, headers=None, timeout=None, retries=None, budget_s=None):
+    """GET url; returns a requests.Response (status is not checked here).
+
+    Connection errors and timeouts are re-raised once retries are used up; a
+    429/5xx that persists is returned for the caller's raise_for_status().
+    With budget_s the whole call (every attempt and the sleeps between them)
+    ends within that many seconds: attempts are cut to the time left and no
+    retry is started that the backoff would push past it.
+    """
+    target = rewrite(url)
+    host = urlsplit(url).netloc
+    retries = RETRIES if retries is None else retries
+    end = None if budget_s is None else time.monotonic() + budget_s
+    with metrics.fetch(url) as m:
+        attempt = 0
+        while True:
+            bucket(host).take()
+            t = timeout or TIMEOUT_S
+            if end is not None:
+                t = max(0.1, min(t, end - time.monotonic()))
+            try:
+                r, err = session().get(target, headers=headers, timeout=t), None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= retries:
+                    raise
+                r, err = None, e
+            if r is not None and (r.status_code not in RETRY_STATUS or attempt >= retries):
+                break
+            wait = retry_after(r)
+            wait = backoff(attempt) if wait is None else min(wait, BACKOFF_MAX_S)
+            if end is not None and time.monotonic() + wait >= end:
+                # Out of budget: fail (or hand back the 429/5xx) as if the retries were used up
+                if err is not None:
+                    raise err
+                break
+            attempt += 1
+            m.retries = attempt
+            time.sleep(wait)
+        m.response(r)
+    if RECORD_DIR:
+        cassette.save(RECORD_DIR, url, r.status_code, r.headers, r.content, r.elapsed.total_seconds())
+    return r
+
+def post(url, json=None, data=None, headers=None, timeout=None):
+    """POST once (not retried: the request may not be idempotent); returns the requests.Response."""
+    bucket(urlsplit(url).netloc).take()
+    with metrics.fetch(url) as m:
+        r = session().post(rewrite(url), json=json, data=data, headers=headers, timeout=timeout or TIMEOUT_S)
+        m.response(r)
+    return r
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# PSAI: persistent latest-item-per-tool index (data/latest_per_tool.json).
+#
+# harvest.py records every item it appends; tools whose latest item changed are
+# listed under "pending" until update_tracker.py has written their Status and
+# calls mark_applied(). The dashboard reads "Today's Updates" from it as well.
+
+import os, json
+from datetime import datetime, timezone
+
+INDEX_PATH = os.getenv("PSAI_LATEST_INDEX", "data/latest_per_tool.json")
+KEEP_FIELDS = ("date", "tool", "moniker", "category", "severity", "headline", "link")
+
+def empty_index():
+    return {"updated": "", "pending": [], "tools": {}}
+
+def load_index(path=INDEX_PATH):
+    """Returns the index, or None when it has not been built yet."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            idx = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"  ! Ignoring unreadable latest-per-tool index {path}: {e}")
+        return None
+    idx.setdefault("pending", [])
+    idx.setdefault("tools", {})
+    return idx
+
+def note_item(idx, item):
+    """Records item if it is newer than the tool's current latest. Returns True if it was."""
+    tool = item.get("tool")
+    if not tool:
+        return False
+    cur = idx["tools"].get(tool)
+    if cur is not None and item.get("date", "") <= cur.get("date", ""):
+        return False
+    idx["tools"][tool] = {k: item.get(k, "") for k in KEEP_FIELDS}
+    if tool not in idx["pending"]:
+        idx["pending"].append(tool)
+    return True
+
+def build_index(items):
+    """Seeds a fresh index from a full log; every tool starts out pending."""
+    idx = empty_index()
+    for it in items:
+        note_item(idx, it)
+    return idx
+
+def mark_applied(idx, tools):
+    done = set(tools)
+    idx["pending"] = [t for t in idx["pending"] if t not in done]
+
+def save_index(idx, path=INDEX_PATH):
+    idx["updated"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(idx, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
@@ -2,6 +2,8 @@
 import csv, json, re, sys, io, os
 from urllib.parse import urlparse
 from datetime import datetime, timezone
+import metrics
+from articles_store import append_articles
 
 # I/O Configuration
 IN_CANDIDATES = "data/candidates.json"
@@ -86,28 +88,46 @@ def load_csv_to_set(path):
 def monikerize(name):
     return re.sub(r"[^a-z0-9]+","-", (name or "").lower()).strip("-")
 
+def ensure_columns(path, fieldnames):
+    """Returns the file's header, first adding any of fieldnames it lacks (blank in existing rows).
+
+    tools.csv files seeded before "Date Added" existed get the column here, so
+    the date recorded for new tools lands under its heading."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return list(fieldnames)
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    header = rows[0]
+    missing = [c for c in fieldnames if c not in header]
+    if missing:
+        header = header + missing
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(header)
+            w.writerows(r + [""] * (len(header) - len(r)) for r in rows[1:] if r)
+        os.replace(tmp, path)
+        print(f"Added column(s) {', '.join(missing)} to {os.path.basename(path)}.")
+    return header
+
 def save_csv(path, rows):
-    """Saves a list of dicts to a CSV file with a consistent header."""
+    """Appends a list of dicts to a CSV file, in the file's own column order."""
     if not rows:
         print(f"No new rows to save for {os.path.basename(path)}.")
         return
 
-    # Ensure all rows contain all keys from the header.
-    clean_rows = []
-    for r in rows:
-        clean_rows.append({k: r.get(k, "") for k in FIELDNAMES})
-
-    # Check if file exists to decide on writing header
-    file_exists = os.path.exists(path)
+    header = ensure_columns(path, FIELDNAMES)
+    file_exists = os.path.exists(path) and os.path.getsize(path) > 0
 
     with open(path, "a", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=FIELDNAMES)
-        if not file_exists or f.tell() == 0:
+        w = csv.DictWriter(f, fieldnames=header, restval="", extrasaction="ignore")
+        if not file_exists:
             w.writeheader()
-        w.writerows(clean_rows)
+        w.writerows(rows)
 
 # --- Main Logic ---
 
+@metrics.instrumented("merge")
 def main():
     # Load existing data for deduplication
     seen_tools, _ = load_csv_to_set(IN_TOOLS)
@@ -166,6 +186,9 @@ def main():
             new_articles.append(row)
             seen_articles.add(key)
 
+    metrics.count("items_parsed", len(candidates))
+    metrics.count("items_kept", len(new_tools) + len(new_articles))
+
     # Save the results
     if new_tools:
         save_csv(OUT_TOOLS, new_tools)
@@ -174,7 +197,7 @@ def main():
         print("No new tools to append.")
 
     if new_articles:
-        save_csv(OUT_ARTICLES, new_articles)
+        append_articles(OUT_ARTICLES, FIELDNAMES, new_articles)
         print(f"Appended {len(new_articles)} new article(s) to {os.path.basename(OUT_ARTICLES)}.")
     else:
         print("No new articles to append.")
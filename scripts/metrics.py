@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# PSAI: run metrics and profiling hooks.
+#
+# Every script's main() is wrapped with @instrumented("<step>"), which records
+# wall and CPU time for the step. Inside a step, fetch(url) times a network
+# call and records status, bytes, retries and error class; count() bumps item
+# counters (parsed / kept / ...); cache() tracks hit rates. At process exit the
+# run's per-step totals are written to data/metrics.json and summarised, with
+# its slowest fetches, into a rolling data/metrics_history.json; the record of
+# every fetch goes to .psai/metrics_fetches.json, which is not committed.
+# Processes sharing PSAI_RUN_ID (one workflow run invoking several scripts)
+# merge into the same report.
+#
+# PSAI_PROFILE=cpu,mem additionally captures cProfile (.psai/profile/<step>.prof
+# plus the top functions) and tracemalloc peak/top allocations per step.
+
+import os, json, time, atexit, threading, functools, io
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+METRICS_PATH = os.getenv("PSAI_METRICS_PATH", "data/metrics.json")
+HISTORY_PATH = os.getenv("PSAI_METRICS_HISTORY", "data/metrics_history.json")
+FETCHES_PATH = os.getenv("PSAI_METRICS_FETCHES", ".psai/metrics_fetches.json")
+SLOW_KEEP = 10
+HISTORY_KEEP = int(os.getenv("PSAI_METRICS_KEEP", "60"))
+PROFILE = {p.strip() for p in os.getenv("PSAI_PROFILE", "").lower().split(",") if p.strip()}
+PROFILE_DIR = os.getenv("PSAI_PROFILE_DIR", ".psai/profile")
+RUN_ID = os.getenv("PSAI_RUN_ID") or datetime.now(timezone.utc).strftime("local-%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+
+_lock = threading.Lock()
+_local = threading.local()
+_run = {"id": RUN_ID, "started": "", "finished": "", "steps": {}, "fetches": [], "caches": {}}
+_registered = False
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _ensure_registered():
+    global _registered
+    with _lock:
+        if not _registered:
+            _registered = True
+            _run["started"] = _now()
+            atexit.register(write_report)
+
+def current_step():
+    return getattr(_local, "step", None) or "-"
+
+def propagate(fn):
+    """Wraps fn to run under the caller's step, for work handed to a thread pool."""
+    name = getattr(_local, "step", None)
+    @functools.wraps(fn)
+    def inner(*a, **kw):
+        prev = getattr(_local, "step", None)
+        _local.step = name
+        try:
+            return fn(*a, **kw)
+        finally:
+            _local.step = prev
+    return inner
+
+def _step_rec(name):
+    return _run["steps"].setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "status": "ok", "counters": {},
+                                           "fetches": 0, "bytes": 0, "errors": 0, "retries": 0})
+
+def count(name, n=1):
+    """Adds n to a counter of the current step (e.g. count("items_parsed", 20))."""
+    with _lock:
+        c = _step_rec(current_step())["counters"]
+        c[name] = c.get(name, 0) + n
+
+def cache(name, hit):
+    with _lock:
+        rec = _run["caches"].setdefault(name, {"hit": 0, "miss": 0})
+        rec["hit" if hit else "miss"] += 1
+
+class _Fetch:
+    def __init__(self, url):
+        self.url = url
+        self.status = None
+        self.bytes = 0
+        self.retries = 0
+        self.cached = False
+
+    def response(self, r):
+        self.status = getattr(r, "status_code", None)
+        content = getattr(r, "content", None)
+        self.bytes = len(content) if content is not None else 0
+        return r
+
+@contextmanager
+def fetch(url):
+    """Times one network call: `with metrics.fetch(url) as f: f.response(requests.get(url))`."""
+    _ensure_registered()
+    f = _Fetch(url)
+    t0 = time.monotonic()
+    error = None
+    try:
+        yield f
+    except Exception as e:
+        error = type(e).__name__
+        resp = getattr(e, "response", None)
+        if f.status is None and resp is not None:
+            f.status = getattr(resp, "status_code", None)
+        raise
+    finally:
+        rec = {"step": current_step(), "url": url, "status": f.status, "bytes": f.bytes,
+               "seconds": round(time.monotonic() - t0, 3), "retries": f.retries}
+        if f.cached: rec["cached"] = True
+        if error: rec["error"] = error
+        with _lock:
+            _run["fetches"].append(rec)
+            s = _step_rec(rec["step"])
+            s["fetches"] += 1
+            s["bytes"] += f.bytes
+            s["retries"] += f.retries
+            if error: s["errors"] += 1
+
+def _start_profile(name):
+    prof = {}
+    if "cpu" in PROFILE:
+        import cProfile
+        prof["cpu"] = cProfile.Profile()
+        prof["cpu"].enable()
+    if "mem" in PROFILE:
+        import tracemalloc
+        # Left on once started: steps may run concurrently, so peaks are process-wide
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        prof["mem"] = True
+    return prof
+
+def _stop_profile(name, prof):
+    out = {}
+    if "cpu" in prof:
+        import pstats
+        prof["cpu"].disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{name}.prof")
+        prof["cpu"].dump_stats(path)
+        st = pstats.Stats(prof["cpu"], stream=io.StringIO())
+        top = sorted(st.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:15]
+        out["cpu_profile"] = path
+        out["cpu_top"] = [[f"{fn[0]}:{fn[1]}({fn[2]})", round(v[3], 4)] for fn, v in top]
+    if "mem" in prof:
+        import tracemalloc
+        if tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            snap = tracemalloc.take_snapshot()
+            out["mem_peak_kb"] = round(peak / 1024, 1)
+            out["mem_top"] = [[str(s.traceback), round(s.size / 1024, 1)] for s in snap.statistics("lineno")[:10]]
+    return out
+
+@contextmanager
+def step(name):
+    _ensure_registered()
+    prev = getattr(_local, "step", None)
+    _local.step = name
+    prof = _start_profile(name) if PROFILE else {}
+    t0, c0 = time.monotonic(), time.thread_time()
+    status = "ok"
+    try:
+        yield
+    except BaseException as e:
+        if not (isinstance(e, SystemExit) and e.code in (None, 0)):
+            status = "failed"
+        raise
+    finally:
+        wall, cpu = time.monotonic() - t0, time.thread_time() - c0
+        extra = _stop_profile(name, prof) if prof else {}
+        with _lock:
+            rec = _step_rec(name)
+            rec["wall_s"] = round(rec["wall_s"] + wall, 3)
+            rec["cpu_s"] = round(rec["cpu_s"] + cpu, 3)
+            rec["status"] = status
+            rec.update(extra)
+        _local.step = prev
+
+def instrumented(name):
+    """Decorator for a script's main(): runs it as metrics step `name`."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*a, **kw):
+            with step(name):
+                return fn(*a, **kw)
+        return inner
+    return wrap
+
+def _load(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return default
+
+def _dump(path, data, indent=None):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp, path)
+
+def snapshot():
+    with _lock:
+        rep = json.loads(json.dumps(_run))
+    for c in rep["caches"].values():
+        total = c["hit"] + c["miss"]
+        c["rate"] = round(c["hit"] / total, 3) if total else None
+    return rep
+
+def write_report(path=None, history_path=None, fetches_path=None):
+    path = path or METRICS_PATH
+    history_path = history_path or HISTORY_PATH
+    fetches_path = fetches_path or FETCHES_PATH
+    _run["finished"] = _now()
+    rep = snapshot()
+    if not rep["steps"]:
+        return
+    fetches = rep.pop("fetches")
+    mine = set(rep["steps"])
+    prev = _load(path, {})
+    if prev.get("id") == rep["id"]:
+        # Another process of the same workflow run already reported; merge steps in
+        prev["steps"].update(rep["steps"])
+        prev.pop("fetches", None)
+        for k, c in rep["caches"].items():
+            prev.setdefault("caches", {})[k] = c
+        prev["finished"] = rep["finished"]
+        rep = prev
+    _dump(path, rep, indent=1)
+
+    done = _load(fetches_path, {})
+    if done.get("id") == rep["id"]:
+        fetches = [f for f in done.get("fetches", []) if f["step"] not in mine] + fetches
+    _dump(fetches_path, {"id": rep["id"], "fetches": fetches})
+
+    hist = _load(history_path, {"runs": []})
+    # Earlier jobs of the run (on other machines) only left their slowest fetches in the history
+    old = next((r for r in hist.get("runs", []) if r.get("id") == rep["id"]), {})
+    slow = {(f["url"], f["seconds"]): [f["url"], f["seconds"], f["status"], f.get("error")] for f in fetches}
+    for row in old.get("slow_fetches", []):
+        slow.setdefault((row[0], row[1]), row)
+    entry = {"id": rep["id"], "started": rep["started"], "finished": rep["finished"],
+             "steps": {k: {"wall_s": v["wall_s"], "cpu_s": v["cpu_s"], "status": v["status"],
+                           "fetches": v["fetches"], "bytes": v["bytes"], "errors": v["errors"]}
+                       for k, v in rep["steps"].items()},
+             "slow_fetches": sorted(slow.values(), key=lambda row: row[1], reverse=True)[:SLOW_KEEP]}
+    runs = [r for r in hist.get("runs", []) if r.get("id") != entry["id"]] + [entry]
+    hist["runs"] = runs[-HISTORY_KEEP:]
+    _dump(history_path, hist)
+
+def load_report(path=None):
+    return _load(path or METRICS_PATH, {})
+
+def load_history(path=None):
+    return _load(path or HISTORY_PATH, {"runs": []})
+
+def regressions(history, factor=1.5, min_s=1.0):
+    """Steps in the newest run slower than `factor` x their median over earlier runs."""
+    runs = history.get("runs", [])
+    if len(runs) < 2:
+        return []
+    last, earlier = runs[-1], runs[:-1]
+    out = []
+    for name, rec in last.get("steps", {}).items():
+        past = sorted(r["steps"][name]["wall_s"] for r in earlier if name in r.get("steps", {}))
+        if not past:
+            continue
+        med = past[len(past) // 2]
+        if rec["wall_s"] >= min_s and rec["wall_s"] > factor * med:
+            out.append((name, rec["wall_s"], med))
+    return out
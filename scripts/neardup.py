@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# PSAI: near-duplicate detection for headlines and candidates (MinHash LSH).
+#
+# A title is normalized (case, accents, "Show HN:"-style prefixes and
+# punctuation dropped) and cut into character 4-gram shingles. Its MinHash
+# signature uses one-permutation hashing: each shingle's hash picks one of
+# PSAI_MINHASH_BINS bins (default 32) and the bin keeps its smallest hash, so a
+# signature costs one pass over the shingles; empty bins borrow from the next
+# filled one. The signature is split into bands of ROWS values and items that
+# share any band bucket are candidates, confirmed with the exact Jaccard
+# similarity of their shingle sets (>= PSAI_DEDUP_THRESHOLD, default 0.5) or
+# an identical normalized URL. Each item is compared with a handful of others
+# instead of all of them.
+#
+# Items from the same source are never merged, and a cluster holds at most
+# one item per source: one feed listing "v0.8.1" and "v0.8.2" is two
+# releases, while Product Hunt, HN and the tool's own feed announcing the same
+# launch is one.
+
+import os, re, unicodedata, zlib
+from datetime import date
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+BIN_BITS = max(1, int(os.getenv("PSAI_MINHASH_BINS", "32")).bit_length() - 1)
+BINS = 1 << BIN_BITS
+ROWS = 2
+THRESHOLD = float(os.getenv("PSAI_DEDUP_THRESHOLD", "0.5"))
+DEDUP_DAYS = int(os.getenv("PSAI_DEDUP_DAYS", "3"))
+MAX_CANDIDATES = 64
+SHINGLE = 4
+_M64 = (1 << 64) - 1
+_MIX = 0x9E3779B97F4A7C15
+_VALUE_BITS = 64 - BIN_BITS
+_LOW = (1 << _VALUE_BITS) - 1
+
+PREFIX_RX = re.compile(r"^\s*(?:show|launch|ask|tell)\s+hn\s*[:\-–—]\s*|^\s*\[[a-z]\]\s*", re.I)
+TRACKING = ("utm_", "ref", "source", "fbclid", "gclid")
+
+def normalize(title):
+    t = title or ""
+    if not t.isascii():
+        t = "".join(c for c in unicodedata.normalize("NFKD", t) if not unicodedata.combining(c))
+    t = PREFIX_RX.sub("", t).lower()
+    return " ".join(re.findall(r"[a-z0-9]+", t))
+
+def url_key(url):
+    """host/path?query without scheme, www., tracking parameters or trailing slash."""
+    if not url:
+        return ""
+    try:
+        u = urlsplit(url.strip())
+    except ValueError:
+        return ""
+    host = (u.hostname or "").removeprefix("www.")
+    q = urlencode([(k, v) for k, v in parse_qsl(u.query) if not k.lower().startswith(TRACKING)])
+    return f"{host}{u.path.rstrip('/')}" + (f"?{q}" if q else "")
+
+def shingles(title):
+    b = f" {normalize(title)} ".encode("utf-8")
+    if len(b) <= SHINGLE:
+        return frozenset((zlib.crc32(b),)) if b.strip() else frozenset()
+    return frozenset(map(zlib.crc32, [b[i:i + SHINGLE] for i in range(len(b) - SHINGLE + 1)]))
+
+def signature(sh):
+    sig = [None] * BINS
+    shift, low = _VALUE_BITS, _LOW
+    for x in sh:
+        h = (x * _MIX) & _M64
+        b, v = h >> shift, h & low
+        cur = sig[b]
+        if cur is None or v < cur:
+            sig[b] = v
+    if None in sig:
+        # Densify: an empty bin takes the next filled bin's value, tagged with the distance
+        filled = [i for i, v in enumerate(sig) if v is not None]
+        k = 0
+        for i in range(BINS):
+            if sig[i] is None:
+                while k < len(filled) and filled[k] < i:
+                    k += 1
+                j = filled[k] if k < len(filled) else filled[0] + BINS
+                sig[i] = (sig[j % BINS] + j - i) & low
+    return sig
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def doc(title, url="", group=None):
+    """What LSHIndex stores per item: shingles, band keys, normalized URL, group."""
+    sh = shingles(title)
+    if not sh:
+        return sh, (), url_key(url), group
+    sig = signature(sh)
+    return sh, [(group, b, tuple(sig[b * ROWS:(b + 1) * ROWS])) for b in range(BINS // ROWS)], url_key(url), group
+
+class LSHIndex:
+    """Incremental MinHash LSH over doc()s; near() returns confirmed matches."""
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self.buckets = {}
+        self.urls = {}
+        self.sets = []
+
+    def add(self, d):
+        sh, bands, url, group = d
+        i = len(self.sets)
+        self.sets.append(sh)
+        for k in bands:
+            self.buckets.setdefault(k, []).append(i)
+        if url:
+            self.urls.setdefault((group, url), []).append(i)
+        return i
+
+    def near(self, d):
+        """[(id, similarity)] best first; an identical URL counts as similarity 1."""
+        sh, bands, url, group = d
+        hits = {}
+        for k in bands:
+            for i in self.buckets.get(k, ()):
+                hits[i] = hits.get(i, 0) + 1
+        out = {i: 1.0 for i in self.urls.get((group, url), ())} if url else {}
+        # Most shared bands first; a huge bucket (many near-identical titles) is only sampled
+        for i, _ in sorted(hits.items(), key=lambda kv: -kv[1])[:MAX_CANDIDATES]:
+            if i not in out:
+                s = jaccard(sh, self.sets[i])
+                if s >= self.threshold:
+                    out[i] = s
+        return sorted(out.items(), key=lambda kv: -kv[1])
+
+def cluster(titles, urls=None, groups=None, sources=None, compatible=None, threshold=THRESHOLD):
+    """Clusters of indices (first-seen order) over parallel lists; compatible(i, j) can veto a pair."""
+    n = len(titles)
+    urls = urls or [""] * n
+    groups = groups or [None] * n
+    parent = list(range(n))
+    members = [{sources[i]} if sources else set() for i in range(n)]
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    idx = LSHIndex(threshold)
+    for i in range(n):
+        d = doc(titles[i], urls[i], groups[i])
+        for j, _ in idx.near(d):
+            a, b = find(i), find(j)
+            if a == b or (members[a] & members[b]) or (compatible and not compatible(i, j)):
+                continue
+            parent[b] = a
+            members[a] |= members[b]
+        idx.add(d)
+    out = {}
+    for i in range(n):
+        out.setdefault(find(i), []).append(i)
+    return sorted(out.values(), key=lambda c: c[0])
+
+SEVERITY_RANK = {"Minor": 0, "Major": 1, "Security": 2}
+
+class NewsClusters:
+    """Near-duplicate merging for news_log items of the same tool within DEDUP_DAYS.
+
+    The canonical item keeps every member's link and source in "links" and
+    "sources". An item from the tool's own feed (a source outside press_sources)
+    takes over the canonical link and source from a press mention; its headline
+    and date go in "feed_headline" and "feed_date", so the (date, tool, headline)
+    identity news_log.item_key hashes stays put. Items passed in are never
+    modified (they may be datacache's shared dicts): a canonical item is copied
+    the first time something folds into it, and kept holds the copy. After
+    construction, fold() appends items it keeps to kept.
+    """
+    def __init__(self, items, press_sources=(), days=DEDUP_DAYS, threshold=THRESHOLD):
+        self.press = set(press_sources)
+        self.days = days
+        self.index = LSHIndex(threshold)
+        self.owner = []   # index entry -> slot
+        self.slots = []   # slot -> its canonical item
+        self._copied = set()
+        self._pos = None  # slot -> position in kept
+        # Own-feed items first so they become canonical; duplicates already in items are folded in
+        order = sorted(items, key=lambda it: (it.get("source") in self.press, it.get("date", "")))
+        slot_of, self.removed = {}, 0
+        for it in order:
+            if self.fold(it) is None:
+                slot_of[id(it)] = len(self.slots) - 1
+            else:
+                self.removed += 1
+        self.kept, self._pos = [], {}
+        for it in items:
+            slot = slot_of.get(id(it))
+            if slot is not None:
+                self._pos[slot] = len(self.kept)
+                self.kept.append(self.slots[slot])
+
+    def _close(self, a, b):
+        try:
+            return abs((date.fromisoformat(a[:10]) - date.fromisoformat(b[:10])).days) <= self.days
+        except ValueError:
+            return False
+
+    def _own(self, slot):
+        if slot not in self._copied:
+            self._copied.add(slot)
+            self.slots[slot] = dict(self.slots[slot])
+            if self._pos is not None:
+                self.kept[self._pos[slot]] = self.slots[slot]
+        return self.slots[slot]
+
+    def fold(self, it):
+        """Folds it into a near-duplicate canonical item and returns that item; a new item is kept and gets None."""
+        d = doc(it.get("headline", ""), it.get("link", ""), it.get("tool", ""))
+        src, link = it.get("source", ""), it.get("link", "")
+        for i, _ in self.index.near(d):
+            slot = self.owner[i]
+            canon = self.slots[slot]
+            links = canon.get("links") or [canon.get("link", "")]
+            sources = canon.get("sources") or [canon.get("source", "")]
+            if (link, src) in zip(links, sources) and ((link, src) != (canon.get("link"), canon.get("source")) or
+                    (it.get("headline"), it.get("date")) == (canon.get("feed_headline"), canon.get("feed_date"))):
+                return canon  # a member already folded in, fetched again
+            if src in sources or not self._close(canon.get("date", ""), it.get("date", "")):
+                continue
+            canon = self._own(slot)
+            if src not in self.press and canon.get("source") in self.press:
+                canon["link"], canon["source"] = link, src
+                canon["feed_headline"], canon["feed_date"] = it.get("headline", ""), it.get("date", "")
+                self.index.add(d)
+                self.owner.append(slot)
+            if SEVERITY_RANK.get(it.get("severity"), 0) > SEVERITY_RANK.get(canon.get("severity"), 0):
+                canon["severity"] = it["severity"]
+            canon["links"] = links + [link]
+            canon["sources"] = sources + [src]
+            return canon
+        self.index.add(d)
+        self.owner.append(len(self.slots))
+        if self._pos is not None:
+            self._pos[len(self.slots)] = len(self.kept)
+            self.kept.append(it)
+        self.slots.append(it)
+        return None
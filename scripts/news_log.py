@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# PSAI: streaming reader for data/news_log.json.
+#
+# The log is {"order": "date-desc", "items": [...]}; harvest writes the items
+# newest first and says so in "order", ahead of "items". iter_items() decodes
+# one item at a time from a chunked read instead of json.load()ing the file,
+# applies the tool/severity filters per item, and when the log is known to be
+# date-ordered stops at the first item older than `since`. Logs without the
+# marker (hand-edited, or written before it existed) are read fully and sorted.
+#
+# Items harvest adds are also appended to data/new_items.jsonl, one per line;
+# consumers (alerts.py) read it from a byte offset they keep, so they only
+# ever look at what was appended since their last run.
+
+import hashlib, json, os
+from datetime import datetime, timezone
+
+ORDER = "date-desc"
+QUEUE_PATH = os.getenv("PSAI_NEW_ITEMS", "data/new_items.jsonl")
+CHUNK = 1 << 16
+_decoder = json.JSONDecoder()
+_WS = " \t\n\r"
+
+class _Stream:
+    """Character buffer over a text file that refills on demand."""
+    def __init__(self, f, chunk):
+        self.f, self.chunk = f, chunk
+        self.buf, self.pos, self.eof = "", 0, False
+
+    def more(self):
+        if self.eof:
+            return False
+        data = self.f.read(self.chunk)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character (not consumed), or '' at EOF."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ValueError(f"news_log: expected {ch!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                v, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.more():
+                    continue
+                raise
+            # A number or literal cut off by the buffer end decodes "successfully"; make sure it's complete
+            if end == len(self.buf) and not self.eof and self.more():
+                continue
+            self.pos = end
+            return v
+
+def _raw_items(path, chunk=CHUNK):
+    """Yields ("meta", {key: value}) once the header keys before "items" are read, then each item."""
+    with open(path, "r", encoding="utf-8") as f:
+        s = _Stream(f, chunk)
+        s.expect("{")
+        meta = {}
+        while s.peek() not in ("}", ""):
+            key = s.value()
+            s.expect(":")
+            if key != "items":
+                meta[key] = s.value()
+            else:
+                yield "meta", meta
+                s.expect("[")
+                while s.peek() not in ("]", ""):
+                    yield "item", s.value()
+                    if s.peek() == ",":
+                        s.pos += 1
+                s.expect("]")
+            if s.peek() == ",":
+                s.pos += 1
+
+def _match(it, until, tools, severities):
+    if until and it.get("date", "") > until:
+        return False
+    if tools is not None and it.get("tool") not in tools:
+        return False
+    return severities is None or it.get("severity") in severities
+
+def iter_items(path, since=None, until=None, tools=None, severities=None):
+    """Items newest first, filtered by date range (inclusive ISO dates), tool and severity."""
+    tools = set(tools) if tools is not None else None
+    severities = set(severities) if severities is not None else None
+    ordered, rest = False, []
+    for kind, v in _raw_items(path):
+        if kind == "meta":
+            ordered = v.get("order") == ORDER
+            continue
+        if since and v.get("date", "") < since:
+            if ordered:
+                return
+            continue
+        if not _match(v, until, tools, severities):
+            continue
+        if ordered:
+            yield v
+        else:
+            rest.append(v)
+    rest.sort(key=lambda x: x.get("date", ""), reverse=True)
+    yield from rest
+
+def latest_per_tool(path, tools=None):
+    """{tool: newest item}; on an ordered log this is the first item seen per tool."""
+    out = {}
+    for it in iter_items(path, tools=tools):
+        out.setdefault(it.get("tool"), it)
+        if tools is not None and len(out) == len(tools):
+            break
+    return out
+
+def item_key(it):
+    """Stable id of an item: the (date, tool, headline) identity harvest dedups on."""
+    key = "|".join([it.get("date", ""), it.get("tool", ""), it.get("headline", "")])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+def append_new(items, path=QUEUE_PATH):
+    if not items:
+        return
+    queued = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    with open(path, "a", encoding="utf-8") as f:
+        for it in items:
+            f.write(json.dumps(dict(it, queued=queued), ensure_ascii=False) + "\n")
+
+def read_new(path=QUEUE_PATH, offset=0):
+    """(items appended after byte offset, new offset). A partly written last line is left for next time."""
+    if not os.path.exists(path):
+        return [], 0
+    items = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if line.strip():
+                items.append(json.loads(line))
+    return items, offset
+
+def queue_head(path=QUEUE_PATH):
+    """First line of the queue, so a reader can tell the file was truncated and restarted."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.readline()).hexdigest()[:16]
+    except OSError:
+        return ""
@@ -1,69 +1,43 @@
 #!/usr/bin/env python
-import csv, os, sys
-from datetime import datetime, timedelta, timezone
+import os, sys
+import metrics
+from articles_store import ARCHIVE_PATH, prune
 
-def prune_csv(file_path, days):
+def prune_csv(file_path, days, archive_path=ARCHIVE_PATH):
     """
-    Prunes a CSV file by removing rows where the 'Date Added' is older than a specified number of days.
+    Prunes a CSV file by moving rows where the 'Date Added' is older than a specified number of days
+    into a gzip archive. The file is kept date-ordered by articles_store, so the cutoff is found with a
+    binary search and the expired rows are a prefix.
     """
     if not os.path.exists(file_path):
         print(f"File not found: {file_path}. Nothing to prune.")
         return
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            fieldnames = reader.fieldnames or []
-            rows = list(reader)
+        pruned_count, kept_count = prune(file_path, days, archive_path)
+    except ValueError:
+        print("Warning: 'Date Added' column not found. Cannot prune based on date.")
+        return
     except Exception as e:
-        print(f"Error reading {file_path}: {e}")
+        print(f"Error pruning {file_path}: {e}")
         return
 
-    if not rows:
+    metrics.count("items_pruned", pruned_count)
+    metrics.count("items_kept", kept_count)
+    if not pruned_count and not kept_count:
         print("No rows to prune.")
         return
 
-    if "Date Added" not in fieldnames:
-        print("Warning: 'Date Added' column not found. Cannot prune based on date.")
-        return
-
-    kept_rows = []
-    pruned_count = 0
-    now = datetime.now(timezone.utc)
-    cutoff_date = now - timedelta(days=days)
-
-    for row in rows:
-        date_str = row.get("Date Added")
-        if not date_str:
-            kept_rows.append(row) # Keep rows with no date
-            continue
-        try:
-            # Assuming date is in YYYY-MM-DD format
-            row_date = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-            if row_date >= cutoff_date:
-                kept_rows.append(row)
-            else:
-                pruned_count += 1
-        except ValueError:
-            kept_rows.append(row) # Keep rows with malformed dates
-
-    try:
-        with open(file_path, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(kept_rows)
-    except Exception as e:
-        print(f"Error writing back to {file_path}: {e}")
-        return
-
-    print(f"Pruned {pruned_count} articles older than {days} days from {os.path.basename(file_path)}. {len(kept_rows)} remain.")
+    print(f"Pruned {pruned_count} articles older than {days} days from {os.path.basename(file_path)} into {os.path.basename(archive_path)}. {kept_count} remain.")
 
-def main():
+@metrics.instrumented("prune")
+def main(argv=None):
     # Basic command-line argument parsing
     file_path = "data/articles.csv"
     days = 15
+    archive_path = ARCHIVE_PATH
 
-    args = sys.argv[1:]
+    args = sys.argv[1:] if argv is None else list(argv)
     if "--file" in args:
         try:
             file_path = args[args.index("--file") + 1]
@@ -77,7 +51,14 @@ def main():
             print("Error: --days argument needs an integer value.")
             sys.exit(1)
 
-    prune_csv(file_path, days)
+    if "--archive" in args:
+        try:
+            archive_path = args[args.index("--archive") + 1]
+        except IndexError:
+            print("Error: --archive argument needs a value.")
+            sys.exit(1)
+
+    prune_csv(file_path, days, archive_path)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# PSAI pipeline runner: runs the daily steps in one process as a DAG.
+#
+#   python scripts/psai.py run [--site URL] [--only a,b] [--from STEP] [--resume] [--jobs N] [--drain-only]
+#                       [--shard I/N | --shards N | --merge-segments DIR] [--segment-dir DIR]
+#   python scripts/psai.py steps
+#   python scripts/psai.py search QUERY [--kind news] [--since DATE] [--severity S] [--category C] [--status S]
+#
+# Each step declares the datasets it reads and writes. A step waits for every
+# earlier step that writes something it reads or writes; steps without such an
+# edge (prune, harvest and rescan) run concurrently. Writers replace files
+# atomically, so a concurrent reader sees either the old or the new version.
+# Parsed data files are shared between steps through datacache, and per-step
+# results go to .psai/pipeline_state.json so --resume re-runs only the steps
+# that failed or never ran.
+
+import argparse, importlib, json, os, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone
+
+DATA = os.getenv("PSAI_DATA_DIR", "data")
+STATE_DIR = os.getenv("PSAI_STATE_DIR", ".psai")
+STATE_PATH = os.path.join(STATE_DIR, "pipeline_state.json")
+
+def data(name):
+    return os.path.join(DATA, name)
+
+def net(o):
+    return ["--base-url", o.base_url] if o.base_url else []
+
+def shards(o):
+    out = ["--shard", o.shard] if o.shard else (["--shards", str(o.shards)] if o.shards else [])
+    if o.segment_dir:
+        out += ["--segment-dir", o.segment_dir]
+    return out + (["--merge-segments", o.merge_segments] if o.merge_segments else [])
+
+class Step:
+    def __init__(self, name, module, reads=(), writes=(), argv=None):
+        self.name = name
+        self.module = module
+        self.reads = set(reads)
+        self.writes = set(writes)
+        self.argv = argv
+
+    def run(self, opts):
+        # Imported lazily so requests/bs4 load once, and only if a step needs them
+        mod = importlib.import_module(self.module)
+        if self.argv is None:
+            return mod.main()
+        return mod.main(self.argv(opts))
+
+STEPS = [
+    Step("discover", "discover", reads=["sources", "filters", "tools", "articles"], writes=["candidates"], argv=net),
+    Step("merge", "merge_candidates", reads=["candidates", "tools", "articles"], writes=["tools", "articles"]),
+    Step("prune", "prune_articles", reads=["articles"], writes=["articles", "articles_archive"],
+         argv=lambda o: ["--file", data("articles.csv"), "--days", str(o.prune_days)]),
+    Step("harvest", "harvest", reads=["tools", "sources", "log", "latest"], writes=["log", "latest", "new_items"],
+         argv=lambda o: ["--tools", data("tools.csv"), "--sources", data("sources.csv"),
+                         "--log", data("news_log.json"), "--index", data("latest_per_tool.json"),
+                         "--new-items", data("new_items.jsonl"), "--websub-hubs", data("websub_hubs.json")]
+                        + (["--drain-only"] if o.drain_only else []) + shards(o) + net(o)),
+    Step("rescan", "rescan_sites", reads=["tools", "filters"], writes=["tools"], argv=net),
+    Step("repo_meta", "refresh_repo_meta", reads=["tools", "repo_meta"], writes=["tools", "repo_meta"],
+         argv=lambda o: ["--tools", data("tools.csv"), "--meta", data("repo_meta.json")] + net(o)),
+    Step("tracker", "update_tracker", reads=["tools", "log", "latest"], writes=["tools", "latest"],
+         argv=lambda o: ["--tracker", data("tools.csv"), "--log", data("news_log.json"),
+                         "--index", data("latest_per_tool.json"), "--out", data("tools.csv")]),
+    Step("build_feed", "build_feed_from_log", reads=["log"], writes=["site_feed"],
+         argv=lambda o: ["--site", o.site] if o.site else []),
+    Step("analytics", "build_analytics", reads=["log"], writes=["analytics"],
+         argv=lambda o: ["--log", data("news_log.json"), "--out", data("analytics.json")]),
+    Step("search_index", "search_index", reads=["log", "tools", "articles", "search"], writes=["search"],
+         argv=lambda o: ["--db", data("search.sqlite"), "--log", data("news_log.json"),
+                         "--tools", data("tools.csv"), "--articles", data("articles.csv")]),
+    Step("parquet", "export_parquet", reads=["log", "tools", "articles", "parquet"], writes=["parquet"],
+         argv=lambda o: ["--out", data("parquet"), "--log", data("news_log.json"),
+                         "--tools", data("tools.csv"), "--articles", data("articles.csv")]),
+    Step("build_sources", "build_sources_pages", reads=["tools", "log", "latest", "analytics"], writes=["site_sources"]),
+    Step("build_articles", "build_articles_page", reads=["articles"], writes=["site_articles"]),
+]
+STEP_BY_NAME = {s.name: s for s in STEPS}
+
+def direct_deps(steps=STEPS):
+    deps = {}
+    for i, b in enumerate(steps):
+        deps[b.name] = {a.name for a in steps[:i] if a.writes & (b.reads | b.writes)}
+    return deps
+
+def ancestors(deps):
+    out = {}
+    for s in STEPS:  # declaration order is a topological order
+        acc = set(deps[s.name])
+        for d in deps[s.name]:
+            acc |= out[d]
+        out[s.name] = acc
+    return out
+
+class StepOutput:
+    """sys.stdout proxy that prefixes lines printed from a step thread with the step name."""
+
+    def __init__(self, out):
+        self.out = out
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def begin(self, name):
+        self.local.step, self.local.buf = name, ""
+
+    def end(self):
+        if getattr(self.local, "buf", ""):
+            self.write("\n")
+        self.local.step = None
+
+    def write(self, s):
+        name = getattr(self.local, "step", None)
+        if not name:
+            with self.lock:
+                return self.out.write(s)
+        *lines, self.local.buf = (self.local.buf + s).split("\n")
+        with self.lock:
+            for line in lines:
+                self.out.write(f"[{name}] {line}\n")
+        return len(s)
+
+    def flush(self):
+        self.out.flush()
+
+def load_state():
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"steps": {}}
+
+def save_state(state):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    tmp = STATE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, STATE_PATH)
+
+def run_step(step, opts, out):
+    out.begin(step.name)
+    t0 = time.monotonic()
+    status = "ok"
+    try:
+        step.run(opts)
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            print(f"! exited with {e.code}")
+            status = "failed"
+    except Exception as e:
+        print(f"! {type(e).__name__}: {e}")
+        status = "failed"
+    finally:
+        out.end()
+    return status, time.monotonic() - t0
+
+def select_steps(opts, anc):
+    names = [s.name for s in STEPS]
+    if opts.only:
+        wanted = [n.strip() for n in opts.only.split(",") if n.strip()]
+        unknown = [n for n in wanted if n not in STEP_BY_NAME]
+        if unknown:
+            raise SystemExit(f"Unknown step(s): {', '.join(unknown)}. Known: {', '.join(names)}")
+        names = [n for n in names if n in wanted]
+    if opts.from_step:
+        if opts.from_step not in STEP_BY_NAME:
+            raise SystemExit(f"Unknown step: {opts.from_step}. Known: {', '.join(s.name for s in STEPS)}")
+        names = [n for n in names if n == opts.from_step or opts.from_step in anc[n]]
+    if opts.resume:
+        prev = load_state().get("steps", {})
+        names = [n for n in names if prev.get(n, {}).get("status") != "ok"]
+    return [STEP_BY_NAME[n] for n in names]
+
+def cmd_run(opts):
+    deps = direct_deps()
+    anc = ancestors(deps)
+    selected = select_steps(opts, anc)
+    if not selected:
+        print("Nothing to run.")
+        return 0
+    chosen = {s.name for s in selected}
+    waits = {s.name: anc[s.name] & chosen for s in selected}
+
+    state = load_state() if opts.resume else {"steps": {}}
+    state["started"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    out = StepOutput(sys.stdout)
+    sys.stdout = out
+    results = {}
+    pending = list(selected)
+    running = {}
+    t0 = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, opts.jobs), thread_name_prefix="psai") as ex:
+            while pending or running:
+                for s in list(pending):
+                    need = waits[s.name]
+                    if any(results.get(d, "ok") != "ok" for d in need):
+                        results[s.name] = "skipped"
+                        state["steps"][s.name] = {"status": "skipped"}
+                        pending.remove(s)
+                        print(f"- {s.name}: skipped (upstream step did not succeed)")
+                    elif need <= results.keys():
+                        running[ex.submit(run_step, s, opts, out)] = s
+                        pending.remove(s)
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    s = running.pop(fut)
+                    status, secs = fut.result()
+                    results[s.name] = status
+                    state["steps"][s.name] = {"status": status, "seconds": round(secs, 2),
+                                              "finished": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")}
+                    save_state(state)
+                    print(f"{'✓' if status == 'ok' else '✗'} {s.name}: {status} in {secs:.1f}s")
+    finally:
+        sys.stdout = out.out
+        save_state(state)
+
+    failed = [n for n, r in results.items() if r != "ok"]
+    print(f"Pipeline finished in {time.monotonic() - t0:.1f}s: {len(results) - len(failed)} ok, {len(failed)} not ok.")
+    if failed:
+        print("Re-run the rest with: python scripts/psai.py run --resume")
+        return 1
+    return 0
+
+def cmd_steps(opts):
+    deps = direct_deps()
+    for s in STEPS:
+        after = ", ".join(sorted(deps[s.name])) or "—"
+        print(f"{s.name:<15} after: {after}")
+    return 0
+
+def cmd_search(opts):
+    import search_index
+    if not os.path.exists(opts.db):
+        print(f"No search index at {opts.db}; build it with: python scripts/psai.py run --only search_index")
+        return 1
+    con = search_index.connect(opts.db)
+    try:
+        t0 = time.perf_counter()
+        hits = search_index.search(con, opts.query, kind=opts.kind, since=opts.since, until=opts.until,
+                                   severity=opts.severity, category=opts.category, status=opts.status, limit=opts.limit)
+        ms = (time.perf_counter() - t0) * 1000
+    finally:
+        con.close()
+    if opts.json:
+        print(json.dumps(hits, ensure_ascii=False, indent=1))
+        return 0
+    for h in hits:
+        tags = " ".join(f"[{v}]" for v in (h["severity"], h["category"], h["status"]) if v)
+        who = f"{h['tool']}: " if h["kind"] == "news" and h["tool"] else ""
+        print(f"{h['date'][:10] or '----------'}  {h['kind']:<7} {who}{h['snippet']} {tags}")
+        if h["url"]:
+            print(f"{'':19}{h['url']}")
+    print(f"{len(hits)} result(s) in {ms:.1f} ms")
+    return 0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="psai", description="PSAI pipeline runner")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run", help="Run the pipeline (or part of it)")
+    r.add_argument("--site", default=os.getenv("PSAI_SITE_URL", ""), help="Public site URL for feed links")
+    r.add_argument("--only", help="Comma-separated steps to run (their upstream steps are assumed done)")
+    r.add_argument("--from", dest="from_step", help="Run this step and everything downstream of it")
+    r.add_argument("--resume", action="store_true", help="Skip steps that succeeded in the last run")
+    r.add_argument("--jobs", type=int, default=int(os.getenv("PSAI_JOBS", "4")), help="Max concurrent steps")
+    r.add_argument("--base-url", default=os.getenv("PSAI_BASE_URL", ""), help="Send discover/harvest/rescan traffic to a stand-in server")
+    r.add_argument("--prune-days", type=int, default=15, help="Article retention for the prune step")
+    r.add_argument("--drain-only", action="store_true", help="harvest only takes in WebSub pushes (see websub.py); nothing is polled")
+    r.add_argument("--shard", help="harvest polls only shard I/N and writes a segment (use with --only harvest)")
+    r.add_argument("--shards", type=int, help="harvest runs N shard processes locally, then merges them")
+    r.add_argument("--segment-dir", help="Where harvest shards write their segments")
+    r.add_argument("--merge-segments", metavar="DIR", help="harvest polls nothing and merges the segments in DIR")
+    r.set_defaults(func=cmd_run)
+    s = sub.add_parser("steps", help="List steps and their dependencies")
+    s.set_defaults(func=cmd_steps)
+    q = sub.add_parser("search", help="Full-text search over news, tools and articles")
+    q.add_argument("query", help="FTS5 query: words, \"phrases\", prefix*, OR, NOT, tool:name")
+    q.add_argument("--kind", choices=["news", "tool", "article"])
+    q.add_argument("--since", help="Earliest date (YYYY-MM-DD)")
+    q.add_argument("--until", help="Latest date (YYYY-MM-DD)")
+    q.add_argument("--severity")
+    q.add_argument("--category")
+    q.add_argument("--status")
+    q.add_argument("--limit", type=int, default=20)
+    q.add_argument("--json", action="store_true", help="Print results as JSON")
+    q.add_argument("--db", default=os.getenv("PSAI_SEARCH_DB", data("search.sqlite")))
+    q.set_defaults(func=cmd_search)
+    opts = ap.parse_args(argv)
+    return opts.func(opts)
+
+if __name__ == "__main__":
+    sys.exit(main())
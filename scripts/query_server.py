@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# PSAI: read-only JSON query API over tools, news and articles.
+#
+#   python scripts/query_server.py --port 8780
+#   curl 'http://127.0.0.1:8780/api/news?severity=Security&q=mcp&since=2026-10-12'
+#   curl 'http://127.0.0.1:8780/api/tools?added_since=2026-10-13&category=Agent'
+#
+# news_log.json, tools.csv and articles.csv are loaded into in-memory tables:
+# rows newest first, an index per filterable field (value -> row positions) and
+# a token index over the text fields, so a query intersects the smallest
+# candidate lists and bisects the date range instead of scanning. The files are
+# polled every PSAI_API_POLL_S seconds (default 2); a changed file is re-loaded
+# in a worker thread and swapped in whole.
+#
+# Endpoints (GET/HEAD): /api/news, /api/tools, /api/articles, /api/status.
+# Filters take comma-separated values (any of them matches); q= matches rows
+# containing every word; since/until are inclusive ISO dates; limit (max 500)
+# and offset paginate, and the response's "next" links the following page.
+# The ETag is derived from the file's mtime/size and the normalized query, so
+# an If-None-Match revalidation is answered 304 without running the query;
+# bodies are kept in an LRU cache (gzip-compressed too when asked for).
+# Bound to 127.0.0.1 unless --host says otherwise; asyncio and stdlib only.
+
+import argparse, asyncio, bisect, gzip, hashlib, json, os, re, time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import news_log
+from datacache import load_csv
+
+LOG_PATH = os.getenv("PSAI_LOG_PATH", "data/news_log.json")
+TOOLS_PATH = os.getenv("PSAI_TOOLS_CSV", "data/tools.csv")
+ARTICLES_PATH = os.getenv("PSAI_ARTICLES_CSV", "data/articles.csv")
+PORT = int(os.getenv("PSAI_API_PORT", "8780"))
+POLL_S = float(os.getenv("PSAI_API_POLL_S", "2"))
+MAX_AGE = int(os.getenv("PSAI_API_MAX_AGE", "0"))
+CACHE_SIZE = int(os.getenv("PSAI_API_CACHE", "256"))
+DEFAULT_LIMIT, MAX_LIMIT = 50, 500
+IDLE_S = 15
+MAX_HEADERS = 64
+GZIP_MIN = 1024
+WORD_RX = re.compile(r"[a-z0-9]+")
+
+def words(*texts):
+    return set(WORD_RX.findall(" ".join(t or "" for t in texts).lower()))
+
+class Table:
+    """Rows newest first, with value indexes per field and a word index."""
+    def __init__(self, rows, date_of, fields, text_of):
+        self.rows = sorted(rows, key=date_of, reverse=True)  # stable: ties keep load order
+        self.asc = [date_of(r) for r in reversed(self.rows)]
+        self.fields = fields
+        self.index = {f: {} for f in fields}
+        self.words = {}
+        for i, r in enumerate(self.rows):
+            for f, values_of in fields.items():
+                for v in values_of(r):
+                    if v:
+                        self.index[f].setdefault(v.lower(), []).append(i)
+            for w in words(*text_of(r)):
+                self.words.setdefault(w, []).append(i)
+
+    def span(self, since, until):
+        """Positions [lo, hi) of rows dated within [since, until]."""
+        n = len(self.rows)
+        a = bisect.bisect_left(self.asc, since) if since else 0
+        b = bisect.bisect_right(self.asc, until + "\uffff") if until else n
+        return n - b, n - a
+
+    def query(self, filters, terms, since, until):
+        lo, hi = self.span(since, until)
+        if lo >= hi:
+            return []
+        lists = []
+        for f, values in filters.items():
+            idx = self.index[f]
+            lists.append(sorted({i for v in values for i in idx.get(v, ())}))
+        for t in terms:
+            lists.append(self.words.get(t, []))
+        if not lists:
+            return range(lo, hi)
+        lists.sort(key=len)
+        keep = [set(l) for l in lists[1:]]
+        return [i for i in lists[0] if lo <= i < hi and all(i in s for s in keep)]
+
+def _split(v):
+    return [v] if v else []
+
+def news_table(path):
+    items = list(news_log.iter_items(path)) if os.path.exists(path) else []
+    return Table(items, lambda it: it.get("date", ""),
+                 {"tool": lambda it: [it.get("tool"), it.get("moniker")], "severity": lambda it: _split(it.get("severity")),
+                  "category": lambda it: _split(it.get("category")), "source": lambda it: _split(it.get("source"))},
+                 lambda it: (it.get("tool"), it.get("headline")))
+
+def _state(r):
+    return "pending" if (r.get("Status") or "").lower() == "pending_review" else "approved"
+
+def registry_table(path):
+    rows = sorted(load_csv(path), key=lambda r: (r.get("Tool") or "").lower())
+    return Table(rows, lambda r: r.get("Date Added") or "",
+                 {"category": lambda r: _split(r.get("Category")), "severity": lambda r: _split(r.get("Severity")),
+                  "state": lambda r: [_state(r)], "repo_status": lambda r: _split(r.get("Repo Status")),
+                  "source_type": lambda r: _split(r.get("Source Type")),
+                  "tracking": lambda r: _split(r.get("Tracking Method")), "tool": lambda r: [r.get("Tool"), r.get("Moniker")]},
+                 lambda r: (r.get("Tool"), r.get("Moniker"), r.get("Website URL")))
+
+# Query parameters that aren't field filters; since/until/added_since select by date
+COMMON = {"q", "since", "until", "added_since", "limit", "offset"}
+
+class Dataset:
+    def __init__(self, name, path, build):
+        self.name, self.path, self.build = name, path, build
+        self.table, self.stamp, self.loaded = None, None, None
+
+    def current_stamp(self):
+        try:
+            st = os.stat(self.path)
+            return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+        except OSError:
+            return "missing"
+
+    def build_table(self):
+        """(table, stamp) read from the file; the stamp is taken first so a write during the read triggers another reload."""
+        stamp = self.current_stamp()
+        t0 = time.perf_counter()
+        table = self.build(self.path)
+        print(f"Loaded {self.name}: {len(table.rows)} rows in {time.perf_counter() - t0:.2f}s")
+        return table, stamp
+
+    def swap(self, table, stamp):
+        self.table, self.stamp = table, stamp
+        self.loaded = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class BadRequest(Exception):
+    pass
+
+class QueryServer:
+    def __init__(self, log_path=LOG_PATH, tools_path=TOOLS_PATH, articles_path=ARTICLES_PATH, quiet=False):
+        self.datasets = {d.name: d for d in (Dataset("news", log_path, news_table),
+                                             Dataset("tools", tools_path, registry_table),
+                                             Dataset("articles", articles_path, registry_table))}
+        self.cache = OrderedDict()
+        self.quiet = quiet
+        for d in self.datasets.values():
+            d.swap(*d.build_table())
+
+    async def watch(self, every=POLL_S):
+        while True:
+            await asyncio.sleep(every)
+            for d in self.datasets.values():
+                if d.current_stamp() != d.stamp:
+                    try:
+                        built = await asyncio.to_thread(d.build_table)
+                    except Exception as e:  # a half-written or bad file: keep serving the old table
+                        print(f"  ! reloading {d.name} failed: {e}")
+                        continue
+                    # Swapped on the event loop, so no request sees a new table with the old stamp
+                    d.swap(*built)
+
+    def parse_query(self, d, query):
+        params = {}
+        for k, v in parse_qsl(query, keep_blank_values=False):
+            params.setdefault(k, []).extend(x.strip() for x in v.split(",") if x.strip())
+        unknown = sorted(set(params) - COMMON - set(d.table.fields))
+        if unknown:
+            raise BadRequest(f"unknown parameter(s): {', '.join(unknown)}; filters for {d.name}: "
+                             + ", ".join(sorted(d.table.fields)))
+        def one(k, default=None):
+            return params[k][-1] if params.get(k) else default
+        try:
+            limit = min(MAX_LIMIT, max(1, int(one("limit", DEFAULT_LIMIT))))
+            offset = max(0, int(one("offset", 0)))
+        except ValueError:
+            raise BadRequest("limit and offset must be integers")
+        since = one("since") or one("added_since")
+        until = one("until")
+        for v in (since, until):
+            if v and not re.match(r"^\d{4}-\d{2}-\d{2}", v):
+                raise BadRequest(f"expected an ISO date, got {v!r}")
+        filters = {k: {x.lower() for x in vs} for k, vs in params.items() if k in d.table.fields and vs}
+        terms = sorted(words(*params.get("q", [])))
+        return filters, terms, since, until, limit, offset
+
+    def run_query(self, d, query):
+        filters, terms, since, until, limit, offset = self.parse_query(d, query)
+        hits = d.table.query(filters, terms, since, until)
+        page = [d.table.rows[i] for i in hits[offset:offset + limit]]
+        nxt = None
+        if offset + limit < len(hits):
+            q = [(k, v) for k, v in parse_qsl(query) if k != "offset"] + [("offset", str(offset + limit))]
+            nxt = f"/api/{d.name}?{urlencode(q)}"
+        return {"total": len(hits), "offset": offset, "limit": limit, "next": nxt, "items": page}
+
+    def status(self):
+        return {name: {"rows": len(d.table.rows), "loaded": d.loaded, "path": d.path,
+                       "filters": sorted(d.table.fields)} for name, d in self.datasets.items()}
+
+    def respond(self, method, target, headers):
+        """(status, headers, body) for one request."""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+        url = urlsplit(target)
+        path = url.path.rstrip("/")
+        query = "&".join(sorted(p for p in url.query.split("&") if p))
+        if path == "/api/status":
+            return self.json(200, self.status())
+        d = self.datasets.get(path[len("/api/"):]) if path.startswith("/api/") else None
+        if d is None:
+            return self.json(404, {"error": "not found", "endpoints": [f"/api/{n}" for n in self.datasets] + ["/api/status"]})
+        etag = '"' + hashlib.sha1(f"{d.name}|{d.stamp}|{query}".encode("utf-8")).hexdigest()[:20] + '"'
+        cache_headers = {"ETag": etag, "Vary": "Accept-Encoding",
+                         "Cache-Control": f"public, max-age={MAX_AGE}" if MAX_AGE else "no-cache"}
+        if etag in [t.strip() for t in headers.get("if-none-match", "").split(",")]:
+            return 304, cache_headers, b""
+        hit = self.cache.get(etag)
+        if hit is None:
+            try:
+                body = json.dumps(self.run_query(d, query), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            except BadRequest as e:
+                return self.json(400, {"error": str(e)})
+            hit = [body, None]
+            self.cache[etag] = hit
+            if len(self.cache) > CACHE_SIZE:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(etag)
+        body, out = hit[0], {"Content-Type": "application/json; charset=utf-8", **cache_headers}
+        if len(body) >= GZIP_MIN and "gzip" in headers.get("accept-encoding", ""):
+            if hit[1] is None:
+                hit[1] = gzip.compress(body, 6)
+            body = hit[1]
+            out["Content-Encoding"] = "gzip"
+        return 200, out, body
+
+    def json(self, status, obj):
+        return status, {"Content-Type": "application/json; charset=utf-8", "Cache-Control": "no-store"}, \
+            json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await asyncio.wait_for(reader.readline(), IDLE_S)
+                if not line:
+                    return
+                parts = line.decode("latin-1").split()
+                if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+                    return await self.send(writer, "HTTP/1.1", 400, {}, b"bad request line", close=True)
+                method, target, version = parts
+                headers = {}
+                while True:
+                    h = await asyncio.wait_for(reader.readline(), IDLE_S)
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                    if len(headers) > MAX_HEADERS:
+                        return await self.send(writer, version, 431, {}, b"too many headers", close=True)
+                conn = headers.get("connection", "").lower()
+                close = conn == "close" or (version == "HTTP/1.0" and conn != "keep-alive") \
+                    or int(headers.get("content-length") or 0) > 0
+                t0 = time.perf_counter()
+                status, out, body = self.respond(method, target, headers)
+                if not self.quiet:
+                    print(f"{method} {target} {status} {len(body)}B {1000 * (time.perf_counter() - t0):.1f}ms")
+                await self.send(writer, version, status, out, b"" if method == "HEAD" else body, close, len(body))
+                if close:
+                    return
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer, version, status, headers, body, close=False, length=None):
+        reason = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+                  405: "Method Not Allowed", 431: "Request Header Fields Too Large"}.get(status, "")
+        head = [f"{version if version == 'HTTP/1.0' else 'HTTP/1.1'} {status} {reason}",
+                "Server: psai-query/1.0", "Access-Control-Allow-Origin: *"]
+        head += [f"{k}: {v}" for k, v in headers.items()]
+        if status != 304:
+            head.append(f"Content-Length: {len(body) if length is None else length}")
+        head.append("Connection: close" if close else "Connection: keep-alive")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+async def serve(opts):
+    app = QueryServer(opts.log, opts.tools, opts.articles, opts.quiet)
+    server = await asyncio.start_server(app.handle, opts.host, opts.port)
+    print(f"Serving PSAI query API on http://{opts.host}:{server.sockets[0].getsockname()[1]} (Ctrl-C to stop)")
+    watcher = asyncio.create_task(app.watch(opts.poll))
+    async with server:
+        try:
+            await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve read-only JSON queries over tools, news and articles")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--log", default=LOG_PATH)
+    ap.add_argument("--tools", default=TOOLS_PATH)
+    ap.add_argument("--articles", default=ARTICLES_PATH)
+    ap.add_argument("--poll", type=float, default=POLL_S, help="Seconds between checks for changed data files")
+    ap.add_argument("--quiet", action="store_true")
+    opts = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(opts))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# PSAI: keeps Stars, Contributors and Repo Status in tools.csv current from the
+# GitHub API.
+#
+# Repo stats are cached per repo in data/repo_meta.json with their ETags. Each
+# run refreshes only repos whose entry is older than PSAI_REPO_META_TTL_H
+# (default 72), stalest first, and at most PSAI_GITHUB_BUDGET requests
+# (default 120), so the whole list is covered over a few runs without
+# touching the rate limit. Requests go out in concurrent batches of
+# PSAI_GITHUB_BATCH and are conditional (If-None-Match), so unchanged repos
+# answer 304; the run also stops early when X-RateLimit-Remaining drops below
+# PSAI_GITHUB_RESERVE. tools.csv is rewritten only if a value changed.
+#
+# Goes through httpclient, so --base-url points it at standin_server.py.
+
+import argparse, csv, json, os, re, threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import requests
+import metrics, httpclient
+from tool_registry import load_registry, repo_of
+
+TOOLS_PATH = os.getenv("PSAI_TOOLS_CSV", "data/tools.csv")
+META_PATH = os.getenv("PSAI_REPO_META", "data/repo_meta.json")
+TTL_H = float(os.getenv("PSAI_REPO_META_TTL_H", "72"))
+BUDGET = int(os.getenv("PSAI_GITHUB_BUDGET", "120"))
+BATCH = int(os.getenv("PSAI_GITHUB_BATCH", "8"))
+RESERVE = int(os.getenv("PSAI_GITHUB_RESERVE", "100"))
+API = "https://api.github.com"
+# Repo Status values this script owns; anything else ("Closed-source", "Merged into Cursor") is curated and kept
+DERIVED_STATUS = {"", "Active", "Semi-active", "Inactive", "Archived", "Not found"}
+
+NOW = datetime.now(timezone.utc)
+
+def api_headers(etag=None):
+    h = {"Accept": "application/vnd.github+json"}
+    token = os.getenv("GITHUB_TOKEN")
+    if token:
+        h["Authorization"] = f"Bearer {token}"
+    if etag:
+        h["If-None-Match"] = etag
+    return h
+
+def repo_status(info):
+    if info.get("archived"):
+        return "Archived"
+    pushed = info.get("pushed_at")
+    if not pushed:
+        return ""
+    age = (NOW - datetime.fromisoformat(pushed.replace("Z", "+00:00"))).days
+    return "Active" if age <= 30 else "Semi-active" if age <= 180 else "Inactive"
+
+def contributor_count(r):
+    # per_page=1: the rel="last" page number is the contributor count
+    m = re.search(r'[?&]page=(\d+)>;\s*rel="last"', r.headers.get("Link", ""))
+    if m:
+        return int(m.group(1))
+    try:
+        return len(r.json())
+    except ValueError:
+        return 0
+
+class Budget:
+    def __init__(self, requests_left, reserve):
+        self.left = requests_left
+        self.reserve = reserve
+        self.rate_remaining = None
+        self.lock = threading.Lock()
+
+    def spend(self, r):
+        rem = r.headers.get("X-RateLimit-Remaining", "")
+        with self.lock:
+            self.left -= 1
+            if rem.isdigit():
+                self.rate_remaining = int(rem)
+
+    def exhausted(self):
+        return self.left <= 0 or (self.rate_remaining is not None and self.rate_remaining < self.reserve)
+
+def refresh_one(repo, entry, budget):
+    """Refreshes one cache entry in place. Returns False when it could not (budget or error)."""
+    if budget.exhausted():
+        return False
+    try:
+        r = httpclient.get(f"{API}/repos/{repo}", headers=api_headers(entry.get("etag")))
+        budget.spend(r)
+        if r.status_code == 404:
+            entry.update({"status": "Not found", "etag": "", "fetched": NOW.isoformat()})
+            return True
+        if r.status_code == 304:
+            metrics.count("not_modified")
+            # Unchanged repo, but activity ages: re-derive the status from the cached push date
+            if entry.get("status") not in ("Archived", "Not found"):
+                entry["status"] = repo_status({"pushed_at": entry.get("pushed_at")})
+        else:
+            r.raise_for_status()
+            info = r.json()
+            entry.update({"stars": info.get("stargazers_count", 0), "status": repo_status(info),
+                          "etag": r.headers.get("ETag", ""), "pushed_at": info.get("pushed_at", "")})
+        if budget.exhausted():
+            return False
+        r = httpclient.get(f"{API}/repos/{repo}/contributors?per_page=1&anon=1",
+                           headers=api_headers(entry.get("contributors_etag")))
+        budget.spend(r)
+        if r.status_code == 304:
+            metrics.count("not_modified")
+        elif r.status_code == 204:
+            entry.update({"contributors": 0, "contributors_etag": ""})
+        else:
+            r.raise_for_status()
+            entry.update({"contributors": contributor_count(r), "contributors_etag": r.headers.get("ETag", "")})
+    except (requests.RequestException, ValueError) as e:
+        print(f"  ! Could not refresh {repo}: {e}")
+        return False
+    entry["fetched"] = NOW.isoformat()
+    return True
+
+def due(entries, repos, ttl_h):
+    """Repos whose cache entry is missing or older than ttl_h, stalest first."""
+    cutoff = (NOW - timedelta(hours=ttl_h)).isoformat()
+    stale = [r for r in repos if entries.get(r, {}).get("fetched", "") < cutoff]
+    return sorted(stale, key=lambda r: entries.get(r, {}).get("fetched", ""))
+
+def load_meta(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"updated": "", "repos": {}}
+
+def save_json_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+def apply_to_tracker(path, entries):
+    """Writes cached stats into tools.csv; returns the number of cells changed."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        return 0
+    header = rows[0]
+    col = {name: i for i, name in enumerate(header)}
+    if not {"Repo URL", "Stars", "Contributors", "Repo Status"} <= col.keys():
+        print("  ! tools.csv lacks Repo URL/Stars/Contributors/Repo Status columns")
+        return 0
+    changed = 0
+    for row in rows[1:]:
+        if len(row) < len(header):
+            row.extend([""] * (len(header) - len(row)))
+        e = entries.get(repo_of(row[col["Repo URL"]]) or "")
+        if not e:
+            continue
+        new = {}
+        if "stars" in e: new["Stars"] = str(e["stars"])
+        if "contributors" in e: new["Contributors"] = str(e["contributors"])
+        if e.get("status") and row[col["Repo Status"]] in DERIVED_STATUS: new["Repo Status"] = e["status"]
+        for name, v in new.items():
+            if row[col[name]] != v:
+                row[col[name]] = v
+                changed += 1
+    if changed:
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            csv.writer(f).writerows(rows)
+        os.replace(tmp, path)
+    return changed
+
+@metrics.instrumented("repo_meta")
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tools", default=TOOLS_PATH, help="Path to tools.csv")
+    ap.add_argument("--meta", default=META_PATH, help="Path to repo_meta.json cache")
+    ap.add_argument("--ttl-hours", type=float, default=TTL_H, help="Refresh repos whose stats are older than this")
+    ap.add_argument("--budget", type=int, default=BUDGET, help="Max GitHub requests this run")
+    ap.add_argument("--batch", type=int, default=BATCH, help="Concurrent requests per batch")
+    ap.add_argument("--base-url", default=httpclient.BASE_URL, help="Fetch through a stand-in server (see standin_server.py)")
+    args = ap.parse_args(argv)
+    httpclient.set_base_url(args.base_url)
+
+    if not os.path.exists(args.tools):
+        print(f"Tracker not found at {args.tools}. Skipping."); return
+    repos = sorted(load_registry(args.tools).by_repo)
+    meta = load_meta(args.meta)
+    entries = meta.setdefault("repos", {})
+    todo = due(entries, repos, args.ttl_hours)
+    print(f"{len(repos)} GitHub repos tracked, {len(todo)} due for refresh (budget {args.budget} requests)")
+
+    budget = Budget(args.budget, RESERVE)
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.batch)) as pool:
+        for i in range(0, len(todo), args.batch):
+            if budget.exhausted():
+                break
+            batch = todo[i:i + args.batch]
+            ok = pool.map(metrics.propagate(lambda repo: refresh_one(repo, entries.setdefault(repo, {}), budget)), batch)
+            done += sum(1 for x in ok if x)
+    for repo in [r for r, e in entries.items() if not e]:
+        del entries[repo]
+    metrics.count("repos_refreshed", done)
+    if len(todo) > done:
+        print(f"  Deferred {len(todo) - done} repo(s) to a later run")
+
+    meta["updated"] = NOW.strftime("%Y-%m-%dT%H:%M:%SZ")
+    save_json_atomic(args.meta, meta)
+    changed = apply_to_tracker(args.tools, entries)
+    print(f"Refreshed {done} repo(s); {changed} tools.csv value(s) changed")
+
+if __name__ == "__main__":
+    main()
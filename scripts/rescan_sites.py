@@ -1,46 +1,57 @@
-import os, csv, re, requests
+import argparse, os, csv, re, requests
 from bs4 import BeautifulSoup
+import metrics, httpclient, feed_health
+from datacache import load_csv
+from tool_registry import load_registry
 
 TOOLS_PATH = os.getenv("PSAI_TOOLS_CSV", "data/tools.csv")
 FILTERS_PATH = os.getenv("PSAI_FILTERS_CSV", "data/filters.csv")
-HEADERS = {"User-Agent": "psai-rescan/1.0"}
-
-def load_csv(path):
-    if not os.path.exists(path): return []
-    return list(csv.DictReader(open(path, 'r', encoding='utf-8')))
 
 def save_csv(path, data, headers):
-    with open(path, 'w', encoding='utf-8', newline='') as f:
+    # Write-then-rename so a concurrent reader (harvest under psai.py) never sees a half-written file
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=headers)
         writer.writeheader()
         writer.writerows(data)
+    os.replace(tmp, path)
+
+@metrics.instrumented("rescan")
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--base-url", default=httpclient.BASE_URL, help="Fetch through a stand-in server (see standin_server.py)")
+    args = ap.parse_args(argv)
+    httpclient.set_base_url(args.base_url)
 
-def main():
-    tools = load_csv(TOOLS_PATH)
+    tools = load_registry(TOOLS_PATH)
     filters = load_csv(FILTERS_PATH)
-    if not tools or not filters:
+    if not len(tools) or not filters:
         print("Missing tools or filters CSV. Skipping.")
         return
 
-    approved_tools = [t for t in tools if t.get('Status', '').lower() != 'pending_review' and t.get('Website URL')]
+    approved_tools = [t for t in tools.approved if t.get('Website URL')]
     include_rx = re.compile(next((f['pattern'] for f in filters if f['type'] == 'include'), '.*'), re.I)
     exclude_rx = re.compile(next((f['pattern'] for f in filters if f['type'] == 'exclude'), '^$'), re.I)
 
-    existing_urls = {t['Website URL'] for t in tools if t.get('Website URL')}
-    existing_names = {t['Tool'].lower() for t in tools}
+    found_urls = set()
 
     new_candidates = []
     print(f"Scanning {len(approved_tools)} approved tool websites...")
 
     for tool in approved_tools:
         url = tool.get('Website URL')
+        if not feed_health.allow(url):
+            print(f" -> Skipping quarantined {url}")
+            continue
         print(f" -> Scanning {url}")
         try:
-            r = requests.get(url, headers=HEADERS, timeout=20)
+            r = httpclient.get(url)
             r.raise_for_status()
             soup = BeautifulSoup(r.text, 'html.parser')
 
-            for a in soup.find_all('a', href=True):
+            links = soup.find_all('a', href=True)
+            metrics.count("items_parsed", len(links))
+            for a in links:
                 link_text = a.get_text(strip=True)
                 link_href = a['href']
 
@@ -48,7 +59,7 @@ def main():
                     continue
 
                 if include_rx.search(link_text) and not exclude_rx.search(link_text):
-                    if link_href in existing_urls or link_text.lower() in existing_names:
+                    if link_href in found_urls or tools.find_url(link_href) or tools.find_name(link_text):
                         continue
 
                     moniker = re.sub(r'[^a-z0-9]+', '-', link_text.lower()).strip('-')
@@ -62,19 +73,20 @@ def main():
                         'Category': 'pending_review'
                     }
 
-                    # Avoid adding duplicates in the same run
-                    if candidate['Website URL'] not in {c['Website URL'] for c in new_candidates}:
-                        new_candidates.append(candidate)
-                        existing_urls.add(candidate['Website URL']) # Add to set to prevent re-adding
-                        print(f"    + Found potential new tool: {link_text} ({link_href})")
+                    new_candidates.append(candidate)
+                    metrics.count("items_kept")
+                    found_urls.add(link_href) # Avoid adding duplicates in the same run
+                    print(f"    + Found potential new tool: {link_text} ({link_href})")
 
+            feed_health.ok(url)
         except requests.RequestException as e:
             print(f"    ! Could not fetch {url}: {e}")
+            feed_health.fail(url, e)
 
     if new_candidates:
         print(f"\nFound {len(new_candidates)} new candidates. Appending to tools file.")
-        all_tools_updated = tools + new_candidates
-        tool_headers = tools[0].keys() if tools else new_candidates[0].keys()
+        all_tools_updated = tools.dicts() + new_candidates
+        tool_headers = tools.columns
         # Fill in missing keys for new candidates
         for c in new_candidates:
             for h in tool_headers:
@@ -83,6 +95,7 @@ def main():
         save_csv(TOOLS_PATH, all_tools_updated, tool_headers)
     else:
         print("\nNo new candidates found.")
+    feed_health.save()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# PSAI: full-text search over news items, tools and articles (SQLite FTS5).
+#
+# data/search.sqlite holds one row per document in `docs` (kind news / tool /
+# article, a stable key, date, severity, category, status, title, body) and an
+# external-content FTS5 table kept in step by triggers. sync() runs as a
+# pipeline step after harvest, merge, rescan and the tracker: files whose
+# mtime/size are unchanged since the last sync are skipped, new documents are
+# inserted, and changed ones (e.g. a tool's Status) are updated in place. News
+# items stay searchable after they age out of the 30-day log.
+#
+#   python scripts/psai.py search "mcp server" --kind news --since 2026-01-01 --severity Security
+
+import argparse, json, os, sqlite3
+import metrics, news_log
+from datacache import load_csv
+from tool_registry import load_registry
+
+DB_PATH = os.getenv("PSAI_SEARCH_DB", "data/search.sqlite")
+LOG_PATH = os.getenv("PSAI_LOG_PATH", "data/news_log.json")
+TOOLS_PATH = os.getenv("PSAI_TOOLS_CSV", "data/tools.csv")
+ARTICLES_PATH = os.getenv("PSAI_ARTICLES_CSV", "data/articles.csv")
+FIELDS = ("kind", "key", "date", "severity", "category", "status", "tool", "title", "body", "url")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs(
+  id INTEGER PRIMARY KEY, kind TEXT NOT NULL, key TEXT NOT NULL UNIQUE, date TEXT, severity TEXT,
+  category TEXT, status TEXT, tool TEXT, title TEXT, body TEXT, url TEXT);
+CREATE INDEX IF NOT EXISTS docs_kind_date ON docs(kind, date);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+  title, tool, body, content='docs', content_rowid='id', tokenize='porter unicode61');
+CREATE TRIGGER IF NOT EXISTS docs_ai AFTER INSERT ON docs BEGIN
+  INSERT INTO docs_fts(rowid, title, tool, body) VALUES (new.id, new.title, new.tool, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_ad AFTER DELETE ON docs BEGIN
+  INSERT INTO docs_fts(docs_fts, rowid, title, tool, body) VALUES ('delete', old.id, old.title, old.tool, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_au AFTER UPDATE ON docs BEGIN
+  INSERT INTO docs_fts(docs_fts, rowid, title, tool, body) VALUES ('delete', old.id, old.title, old.tool, old.body);
+  INSERT INTO docs_fts(rowid, title, tool, body) VALUES (new.id, new.title, new.tool, new.body);
+END;
+CREATE TABLE IF NOT EXISTS sources(path TEXT PRIMARY KEY, stamp TEXT);
+"""
+
+def connect(path=None):
+    path = path or DB_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    con = sqlite3.connect(path, timeout=30)
+    con.executescript(SCHEMA)
+    return con
+
+def news_doc(it):
+    return {"kind": "news", "key": "news:" + news_log.item_key(it),
+            "date": it.get("date", ""), "severity": it.get("severity", ""), "category": it.get("category", ""),
+            "status": "", "tool": it.get("tool", ""), "title": it.get("headline", ""),
+            "body": it.get("source", ""), "url": it.get("link", "")}
+
+def tool_doc(r):
+    name = (r.get("Tool") or "").strip()
+    body = " ".join(v for v in (r.get("Moniker"), r.get("Source Type"), r.get("Website URL"), r.get("Repo URL")) if v)
+    return {"kind": "tool", "key": "tool:" + name.lower(), "date": r.get("Date Added") or "",
+            "severity": r.get("Severity") or "", "category": r.get("Category") or "", "status": r.get("Status") or "",
+            "tool": name, "title": name, "body": body, "url": r.get("Website URL") or r.get("Repo URL") or ""}
+
+def article_doc(r):
+    title = (r.get("Tool") or "").strip()
+    url = r.get("Website URL") or ""
+    return {"kind": "article", "key": "article:" + (url or title.lower()), "date": r.get("Date Added") or "",
+            "severity": "", "category": r.get("Source Type") or "", "status": "", "tool": "",
+            "title": title, "body": r.get("Moniker") or "", "url": url}
+
+def upsert(con, docs):
+    """Inserts new docs and updates changed ones; returns the number of rows written."""
+    cols = ", ".join(FIELDS)
+    changed = ", ".join(f"{f} = excluded.{f}" for f in FIELDS[2:])
+    differs = " OR ".join(f"{f} IS NOT excluded.{f}" for f in FIELDS[2:])
+    seen = set()
+    def rows():
+        # First row wins when a key repeats (duplicate tool names), as in ToolRegistry.by_name
+        for d in docs:
+            if d["title"] and d["key"] not in seen:
+                seen.add(d["key"])
+                yield [d[f] for f in FIELDS]
+    cur = con.executemany(f"INSERT INTO docs({cols}) VALUES ({', '.join('?' * len(FIELDS))}) "
+                          f"ON CONFLICT(key) DO UPDATE SET {changed} WHERE {differs}", rows())
+    return cur.rowcount
+
+def _stamp(path):
+    st = os.stat(path)
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+def _changed(con, path):
+    row = con.execute("SELECT stamp FROM sources WHERE path = ?", (os.path.normpath(path),)).fetchone()
+    return os.path.exists(path) and (row is None or row[0] != _stamp(path))
+
+def _mark(con, path):
+    con.execute("INSERT OR REPLACE INTO sources(path, stamp) VALUES (?, ?)", (os.path.normpath(path), _stamp(path)))
+
+def sync(con, log_path=LOG_PATH, tools_path=TOOLS_PATH, articles_path=ARTICLES_PATH):
+    """Indexes whatever changed in the data files since the last sync. Returns rows written per kind."""
+    out = {}
+    with con:
+        if _changed(con, log_path):
+            out["news"] = upsert(con, (news_doc(it) for it in news_log.iter_items(log_path)))
+            _mark(con, log_path)
+        if _changed(con, tools_path):
+            out["tool"] = upsert(con, (tool_doc(r) for r in load_registry(tools_path)))
+            _mark(con, tools_path)
+        if _changed(con, articles_path):
+            out["article"] = upsert(con, (article_doc(r) for r in load_csv(articles_path)))
+            _mark(con, articles_path)
+    return out
+
+def _fts_query(q):
+    # Plain words are ANDed; anything FTS5 can't parse is retried as quoted terms
+    return " ".join('"' + t.replace('"', '""') + '"' for t in q.split())
+
+def search(con, q, kind=None, since=None, until=None, severity=None, category=None, status=None, limit=20):
+    where, args = ["docs_fts MATCH ?"], []
+    for col, val in (("d.kind", kind), ("d.severity", severity), ("d.category", category), ("d.status", status)):
+        if val:
+            where.append(f"{col} = ? COLLATE NOCASE"); args.append(val)
+    if since:
+        where.append("d.date >= ?"); args.append(since)
+    if until:
+        where.append("substr(d.date, 1, 10) <= ?"); args.append(until)
+    sql = (f"SELECT d.kind, d.date, d.severity, d.category, d.status, d.tool, d.title, d.url, "
+           f"bm25(docs_fts, 10.0, 5.0, 1.0) AS rank, snippet(docs_fts, 0, '[', ']', '…', 12) "
+           f"FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid WHERE {' AND '.join(where)} "
+           f"ORDER BY rank LIMIT ?")
+    names = ("kind", "date", "severity", "category", "status", "tool", "title", "url", "rank", "snippet")
+    try:
+        rows = con.execute(sql, [q] + args + [limit]).fetchall()
+    except sqlite3.OperationalError:
+        rows = con.execute(sql, [_fts_query(q)] + args + [limit]).fetchall()
+    return [dict(zip(names, r)) for r in rows]
+
+@metrics.instrumented("search_index")
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Sync the PSAI search index with the data files")
+    ap.add_argument("--db", default=DB_PATH)
+    ap.add_argument("--log", default=LOG_PATH)
+    ap.add_argument("--tools", default=TOOLS_PATH)
+    ap.add_argument("--articles", default=ARTICLES_PATH)
+    ap.add_argument("--rebuild", action="store_true", help="Drop the index and re-index everything")
+    args = ap.parse_args(argv)
+    if args.rebuild and os.path.exists(args.db):
+        os.remove(args.db)
+    con = connect(args.db)
+    try:
+        written = sync(con, args.log, args.tools, args.articles)
+        total = con.execute("SELECT count(*) FROM docs").fetchone()[0]
+    finally:
+        con.close()
+    metrics.count("items_kept", sum(written.values()))
+    print(f"Search index {args.db}: {total} documents; written this run: {json.dumps(written) if written else 'nothing changed'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# PSAI: every press-feed entry discover has judged, so it is judged once.
+#
+# data/discover_seen.json maps an entry's canonical link (scheme, www. and
+# tracking parameters dropped; the normalized title when there is no link) to
+# its verdict and when it was first and last seen:
+#   {"updated": "...", "filters": "<hash of the filter rules>",
+#    "items": {key: [verdict, first_seen, last_seen]},
+#    "feeds": {feed_url: {"etag": ..., "last_modified": ...}}}
+# Verdicts: accepted, known_tool, known_article, duplicate, rejected:include,
+# rejected:exclude. Entries not seen for PSAI_SEEN_TTL_D days (default 30)
+# expire; when filters.csv changes, the rejected:* verdicts are dropped so those
+# entries are judged again under the new rules. Feed validators let discover
+# send conditional requests and skip feeds that answer 304.
+
+import os, json, hashlib
+from datetime import datetime, timedelta, timezone
+import neardup
+
+SEEN_PATH = os.getenv("PSAI_DISCOVER_SEEN", "data/discover_seen.json")
+TTL_D = int(os.getenv("PSAI_SEEN_TTL_D", "30"))
+
+def canonical(link, title=""):
+    return neardup.url_key(link) or "title:" + neardup.normalize(title)
+
+def filters_stamp(filters):
+    rules = sorted((f.get("type", ""), f.get("pattern", "")) for f in filters)
+    return hashlib.sha1(json.dumps(rules).encode("utf-8")).hexdigest()[:12]
+
+class SeenStore:
+    def __init__(self, path, data):
+        self.path = path
+        self.items = data.get("items", {})
+        self.feeds = data.get("feeds", {})
+        self.filters = data.get("filters", "")
+        self.today = datetime.now(timezone.utc).date().isoformat()
+        self.hits = 0
+
+    @classmethod
+    def open(cls, path=SEEN_PATH, filters=""):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        store = cls(path, data)
+        cut = (datetime.now(timezone.utc) - timedelta(days=TTL_D)).date().isoformat()
+        changed = filters and filters != store.filters
+        store.items = {k: v for k, v in store.items.items()
+                       if v[2] >= cut and not (changed and v[0].startswith("rejected:"))}
+        if changed:
+            store.feeds = {}  # refetch in full so the dropped entries are seen again
+        store.filters = filters or store.filters
+        return store
+
+    def get(self, key):
+        """The verdict for key, or None when it is new; a known key is marked seen today."""
+        rec = self.items.get(key)
+        if rec is None:
+            return None
+        rec[2] = self.today
+        self.hits += 1
+        return rec[0]
+
+    def record(self, key, verdict):
+        rec = self.items.get(key)
+        if rec is None:
+            self.items[key] = [verdict, self.today, self.today]
+        else:
+            rec[0], rec[2] = verdict, self.today
+
+    def validators(self, feed_url):
+        v = self.feeds.get(feed_url, {})
+        h = {}
+        if v.get("etag"):
+            h["If-None-Match"] = v["etag"]
+        if v.get("last_modified"):
+            h["If-Modified-Since"] = v["last_modified"]
+        return h
+
+    def note_feed(self, feed_url, headers):
+        v = {"etag": headers.get("ETag", ""), "last_modified": headers.get("Last-Modified", "")}
+        if any(v.values()):
+            self.feeds[feed_url] = v
+        else:
+            self.feeds.pop(feed_url, None)
+
+    def counts(self):
+        out = {}
+        for v in self.items.values():
+            out[v[0]] = out.get(v[0], 0) + 1
+        return out
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"updated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"), "filters": self.filters,
+                       "items": self.items, "feeds": self.feeds}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
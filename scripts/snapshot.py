@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# PSAI: on-disk snapshots of parsed data files, used by datacache on a miss.
+#
+# The parsed form of a file (rows of tools.csv, the news_log dict, a
+# ToolRegistry, ...) is pickled to PSAI_SNAPSHOT_DIR (default .psai/snapshots)
+# with a header holding the BLAKE2 hash, mtime and size of the source, the
+# parser and a hash of its module's source, and the format version. A snapshot is used
+# when the source's mtime/size still match, or failing that its content hash
+# does (e.g. after a checkout touched the file); otherwise the file is
+# re-parsed and the snapshot rewritten. Changing a parser's module, the Python
+# version or SNAPSHOT_VERSION invalidates old snapshots. PSAI_SNAPSHOT_DIR=""
+# turns snapshots off.
+
+import os, sys, pickle, hashlib, threading
+
+SNAPSHOT_DIR = os.getenv("PSAI_SNAPSHOT_DIR", ".psai/snapshots")
+SNAPSHOT_VERSION = 1
+_parser_ids = {}
+
+def file_hash(path):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _parser_id(parse):
+    # Hash of the parser's module source rather than its mtime: CI checkouts touch every file
+    name = f"{parse.__module__}.{parse.__qualname__}"
+    if name not in _parser_ids:
+        src = getattr(sys.modules.get(parse.__module__), "__file__", None)
+        try:
+            _parser_ids[name] = file_hash(src) if src else None
+        except OSError:
+            _parser_ids[name] = None
+    return name, _parser_ids[name]
+
+def _snap_path(path, name):
+    key = hashlib.sha1(f"{os.path.abspath(path)}|{name}".encode("utf-8")).hexdigest()[:20]
+    return os.path.join(SNAPSHOT_DIR, f"{os.path.basename(path)}.{key}.pickle")
+
+def _header(path, parse, content_hash=None):
+    name, parser_stamp = _parser_id(parse)
+    st = os.stat(path)
+    return {"version": SNAPSHOT_VERSION, "python": sys.version_info[:2], "parser": name,
+            "parser_stamp": parser_stamp, "stamp": (st.st_mtime_ns, st.st_size), "hash": content_hash}
+
+def load(path, parse):
+    """The snapshotted parse(path), or None when there is no valid snapshot."""
+    if not SNAPSHOT_DIR:
+        return None
+    want = _header(path, parse)
+    snap = _snap_path(path, want["parser"])
+    try:
+        with open(snap, "rb") as f:
+            head = pickle.load(f)
+            if any(head.get(k) != want[k] for k in ("version", "python", "parser", "parser_stamp")):
+                return None
+            if head.get("stamp") != want["stamp"]:
+                if head.get("hash") != file_hash(path):
+                    return None
+                # Same content, new mtime: refresh the header so the next load skips hashing
+                value = pickle.load(f)
+                save(path, parse, value, head["hash"])
+                return value
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError):
+        return None
+
+def save(path, parse, value, content_hash=None):
+    if not SNAPSHOT_DIR:
+        return
+    head = _header(path, parse, content_hash or file_hash(path))
+    snap = _snap_path(path, head["parser"])
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp = f"{snap}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(head, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snap)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+        print(f"  ! Could not snapshot {path}: {e}")
+
+def clear():
+    if SNAPSHOT_DIR and os.path.isdir(SNAPSHOT_DIR):
+        for n in os.listdir(SNAPSHOT_DIR):
+            if n.endswith(".pickle"):
+                os.remove(os.path.join(SNAPSHOT_DIR, n))
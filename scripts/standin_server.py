@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# PSAI: local stand-in for the feeds, GitHub API and web pages harvest,
+# discover and rescan talk to.
+#
+# Serves a cassette recorded with PSAI_HTTP_RECORD=<dir>. Requests arrive in
+# the form the scripts produce under --base-url / PSAI_BASE_URL:
+#   GET /https/api.github.com/repos/o/r/releases  ->  https://api.github.com/repos/o/r/releases
+# Latency, random errors and 304s are configurable so slow or flaky days can be
+# reproduced offline:
+#
+#   python scripts/standin_server.py --cassette .psai/cassette --port 8765 --latency 0.2 --error-rate 0.05
+#   PSAI_BASE_URL=http://127.0.0.1:8765 python scripts/psai.py run --only discover,harvest,rescan
+#
+# For the alert sinks, POSTs (GitHub issues, webhooks) are answered 201 and
+# appended to <cassette>/posts.jsonl, and --smtp-port starts a minimal SMTP
+# server (no TLS; any AUTH PLAIN accepted) that saves messages to
+# <cassette>/mail/.
+#
+# It is also a WebSub hub for scripts/websub.py: a form POST with hub.mode=
+# subscribe/unsubscribe is answered 202 and verified against the callback with
+# a challenge GET, and hub.mode=publish&hub.url=<topic> pushes the topic's
+# cassette body to every verified subscriber, signed with its hub.secret.
+
+import argparse, hmac, json, os, random, secrets, socketserver, sys, threading, time
+import urllib.request
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl, urlencode
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import cassette
+
+def original_url(path):
+    """/https/host/p?q -> https://host/p?q"""
+    parts = path.lstrip("/").split("/", 2)
+    if len(parts) < 2 or parts[0] not in ("http", "https"):
+        return None
+    rest = parts[2] if len(parts) > 2 else ""
+    return f"{parts[0]}://{parts[1]}/{rest}"
+
+def not_modified(req_headers, meta):
+    h = {k.lower(): v for k, v in meta.get("headers", {}).items()}
+    inm = req_headers.get("If-None-Match")
+    if inm and h.get("etag") and inm.strip() == h["etag"].strip():
+        return True
+    ims = req_headers.get("If-Modified-Since")
+    if ims and h.get("last-modified"):
+        try:
+            return parsedate_to_datetime(h["last-modified"]) <= parsedate_to_datetime(ims)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def make_handler(cassette_dir, opts):
+    rng = random.Random(opts.seed)
+    rng_lock = threading.Lock()
+
+    def roll(p):
+        with rng_lock:
+            return p > 0 and rng.random() < p
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "psai-standin/1.0"
+
+        def log_message(self, fmt, *args):
+            if not opts.quiet:
+                sys.stderr.write("%s - %s\n" % (self.address_string(), fmt % args))
+
+        def _send(self, status, body=b"", headers=None):
+            self.send_response(status)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def do_HEAD(self):
+            self.do_GET()
+
+        def do_GET(self):
+            if self.path == "/__health":
+                return self._send(200, b"ok", {"Content-Type": "text/plain"})
+            url = original_url(self.path)
+            if url is None:
+                return self._send(400, b"expected /<scheme>/<host>/<path>", {"Content-Type": "text/plain"})
+            meta, body = cassette.load(cassette_dir, url)
+            delay = opts.latency + (meta.get("elapsed_s", 0) * opts.replay_timing if meta else 0)
+            if delay > 0:
+                time.sleep(delay)
+            if roll(opts.error_rate):
+                return self._send(opts.error_status, b"injected error", {"Content-Type": "text/plain", "Retry-After": "1"})
+            if meta is None:
+                return self._send(404, f"not in cassette: {url}".encode("utf-8"), {"Content-Type": "text/plain"})
+            headers = dict(meta.get("headers", {}))
+            if not_modified(self.headers, meta) or roll(opts.not_modified_rate):
+                return self._send(304, b"", {k: v for k, v in headers.items() if k.lower() in ("etag", "last-modified", "cache-control")})
+            return self._send(meta.get("status", 200), body, headers)
+
+        def do_POST(self):
+            url = original_url(self.path) or self.path
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.headers.get("Content-Type", "").startswith("application/x-www-form-urlencoded"):
+                form = dict(parse_qsl(body.decode("utf-8", "replace")))
+                if form.get("hub.mode"):
+                    return self._send(*hub_request(url, form))
+            with post_lock:
+                path = os.path.join(cassette_dir, "posts.jsonl")
+                n = sum(1 for _ in open(path, "rb")) + 1 if os.path.exists(path) else 1
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"url": url, "headers": dict(self.headers), "body": body.decode("utf-8", "replace")}) + "\n")
+            if roll(opts.error_rate):
+                return self._send(opts.error_status, b"injected error", {"Content-Type": "text/plain"})
+            out = json.dumps({"number": n, "html_url": f"{url.rstrip('/')}/{n}"}).encode("utf-8")
+            return self._send(201, out, {"Content-Type": "application/json"})
+
+    post_lock = threading.Lock()
+    hub_subs, hub_lock = {}, threading.Lock()  # topic -> {callback: secret}
+
+    def verify(mode, topic, callback, secret, lease):
+        time.sleep(opts.hub_delay)
+        challenge = secrets.token_hex(8)
+        q = urlencode({"hub.mode": mode, "hub.topic": topic, "hub.challenge": challenge, "hub.lease_seconds": lease})
+        try:
+            with urllib.request.urlopen(f"{callback}{'&' if '?' in callback else '?'}{q}", timeout=10) as r:
+                ok = r.status == 200 and r.read().decode("utf-8", "replace") == challenge
+        except Exception:
+            ok = False
+        with hub_lock:
+            subs = hub_subs.setdefault(topic, {})
+            if ok and mode == "subscribe":
+                subs[callback] = secret
+            elif ok:
+                subs.pop(callback, None)
+        if not opts.quiet:
+            sys.stderr.write(f"hub: {mode} {topic} -> {callback}: {'verified' if ok else 'not verified'}\n")
+
+    def publish(hub_url, topic):
+        meta, body = cassette.load(cassette_dir, topic)
+        if meta is None:
+            return 0
+        with hub_lock:
+            targets = dict(hub_subs.get(topic, {}))
+        ctype = {k.lower(): v for k, v in meta.get("headers", {}).items()}.get("content-type", "application/atom+xml")
+        for callback, secret in targets.items():
+            h = {"Content-Type": ctype, "Link": f'<{hub_url}>; rel="hub", <{topic}>; rel="self"'}
+            if secret:
+                h["X-Hub-Signature"] = "sha256=" + hmac.new(secret.encode("utf-8"), body, "sha256").hexdigest()
+            try:
+                urllib.request.urlopen(urllib.request.Request(callback, data=body, headers=h, method="POST"), timeout=10).close()
+            except Exception as e:
+                sys.stderr.write(f"hub: push to {callback} failed: {e}\n")
+        return len(targets)
+
+    def hub_request(hub_url, form):
+        mode, topic = form.get("hub.mode"), form.get("hub.topic") or form.get("hub.url", "")
+        if mode in ("subscribe", "unsubscribe") and topic and form.get("hub.callback"):
+            lease = str(opts.hub_lease or form.get("hub.lease_seconds") or 86400)
+            threading.Thread(target=verify, args=(mode, topic, form["hub.callback"], form.get("hub.secret", ""), lease),
+                             daemon=True).start()
+            return 202, b"", {"Content-Type": "text/plain"}
+        if mode == "publish" and topic:
+            n = publish(hub_url, topic)
+            return 200, f"pushed to {n} subscriber(s)".encode("utf-8"), {"Content-Type": "text/plain"}
+        return 400, b"bad hub request", {"Content-Type": "text/plain"}
+
+    return Handler
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO, AUTH PLAIN, MAIL, RCPT, DATA, QUIT."""
+    def reply(self, *lines):
+        for i, line in enumerate(lines):
+            sep = "-" if i < len(lines) - 1 else " "
+            self.wfile.write(f"{line[:3]}{sep}{line[4:]}\r\n".encode("utf-8"))
+
+    def handle(self):
+        self.reply("220 psai-standin ESMTP")
+        rcpt = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line[:4].decode("ascii", "replace").upper()
+            if verb == "EHLO":
+                self.reply("250 psai-standin", "250 AUTH PLAIN", "250 8BITMIME")
+            elif verb == "HELO":
+                self.reply("250 psai-standin")
+            elif verb == "AUTH":
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb == "RCPT":
+                rcpt.append(line[8:].decode("utf-8", "replace").strip())
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                for l in self.rfile:
+                    if l in (b".\r\n", b".\n"):
+                        break
+                    data.append(l[1:] if l.startswith(b"..") else l)
+                self.server.save_mail(rcpt, b"".join(data))
+                rcpt = []
+                self.reply("250 OK queued")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            elif verb in ("MAIL", "RSET", "NOOP"):
+                self.reply("250 OK")
+            else:
+                self.reply("502 Command not implemented")
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, addr, mail_dir):
+        super().__init__(addr, SMTPHandler)
+        self.mail_dir = mail_dir
+        self.lock = threading.Lock()
+
+    def save_mail(self, rcpt, data):
+        with self.lock:
+            os.makedirs(self.mail_dir, exist_ok=True)
+            n = len(os.listdir(self.mail_dir)) + 1
+            with open(os.path.join(self.mail_dir, f"{n:04d}.eml"), "wb") as f:
+                f.write(b"X-Rcpt-To: " + ", ".join(rcpt).encode("utf-8") + b"\r\n" + data)
+
+def serve(opts):
+    return ThreadingHTTPServer((opts.host, opts.port), make_handler(opts.cassette, opts))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve a recorded PSAI HTTP cassette")
+    ap.add_argument("--cassette", required=True, help="Directory written by PSAI_HTTP_RECORD")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="Extra seconds added to every response")
+    ap.add_argument("--replay-timing", type=float, default=0.0, help="Also sleep this multiple of the recorded response time")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with --error-status")
+    ap.add_argument("--error-status", type=int, default=503)
+    ap.add_argument("--not-modified-rate", type=float, default=0.0, help="Share of requests answered 304 regardless of validators")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--smtp-port", type=int, default=0, help="Also accept mail on this port (saved under <cassette>/mail/)")
+    ap.add_argument("--hub-delay", type=float, default=0.2, help="Seconds before the hub verifies a (un)subscription")
+    ap.add_argument("--hub-lease", type=int, default=0, help="Lease the hub grants, overriding the requested one")
+    ap.add_argument("--quiet", action="store_true")
+    opts = ap.parse_args(argv)
+    httpd = serve(opts)
+    print(f"Serving {opts.cassette} on http://{opts.host}:{httpd.server_address[1]} (Ctrl-C to stop)")
+    if opts.smtp_port:
+        smtp = SMTPServer((opts.host, opts.smtp_port), os.path.join(opts.cassette, "mail"))
+        threading.Thread(target=smtp.serve_forever, daemon=True).start()
+        print(f"SMTP stand-in on {opts.host}:{smtp.server_address[1]}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# PSAI: compact, indexed view of tools.csv shared by the scripts.
+#
+# Rows are ToolRecord objects (__slots__, one tuple of values per row) instead
+# of 19-key dicts; categorical columns (Category, Status, Source Type, ...)
+# are interned so each distinct value is stored once. Lookups by name,
+# moniker, website URL and GitHub repo, and the approved / pending / has-feed
+# views, are built once per registry. load_registry() goes through datacache,
+# so steps in one psai.py process share a registry until tools.csv changes.
+# Registries and records are read-only.
+
+import csv, re, sys
+from functools import cached_property
+import datacache
+
+CATEGORICAL = ("Category", "Severity", "RSS Available", "Tracking Method", "Repo Status", "Source Type",
+               "Discovery Method", "Launch Status", "Status", "Date Added")
+# First path segments on github.com that are not owners
+NOT_OWNERS = {"marketplace", "orgs", "topics", "sponsors", "features", "apps", "settings", "collections"}
+
+def repo_of(url):
+    """'https://github.com/Owner/Repo.git' -> 'owner/repo', else None."""
+    m = re.search(r'github\.com/([^/\s]+)/([^/\s#?]+)', url or "")
+    if not m or m.group(1).lower() in NOT_OWNERS:
+        return None
+    return f"{m.group(1)}/{m.group(2).removesuffix('.git')}".lower()
+
+def header_columns(header):
+    """Header cells with only the trailing blanks dropped; a blank cell in the
+    middle stays as a placeholder so row values keep their positions."""
+    cols = list(header)
+    while cols and not cols[-1].strip():
+        cols.pop()
+    return cols
+
+def url_key(url):
+    return (url or "").strip().rstrip("/").lower()
+
+class ToolRecord:
+    """One tools.csv row; reads like the csv.DictReader dict it replaces."""
+    __slots__ = ("_cols", "_values")
+
+    def __init__(self, cols, values):
+        self._cols = cols
+        self._values = values
+
+    def __getitem__(self, col):
+        return self._values[self._cols[col]]
+
+    def get(self, col, default=None):
+        i = self._cols.get(col)
+        return default if i is None else self._values[i]
+
+    def keys(self):
+        return self._cols.keys()
+
+    def as_dict(self):
+        return {c: self._values[i] for c, i in self._cols.items()}
+
+    def __repr__(self):
+        return f"ToolRecord({self.get('Tool')!r})"
+
+class ToolRegistry:
+    def __init__(self, columns, rows):
+        self.columns = tuple(header_columns(columns))
+        # Blank placeholder columns keep their slot in each row but are not addressable
+        self._cols = {c: i for i, c in enumerate(self.columns) if c}
+        width = len(self.columns)
+        cat = [i for i, c in enumerate(self.columns) if c in CATEGORICAL]
+        intern, cols = sys.intern, self._cols
+        self.records = records = []
+        for row in rows:
+            if len(row) != width:
+                row = row[:width] + [""] * (width - len(row))
+            for i in cat:
+                row[i] = intern(row[i])
+            records.append(ToolRecord(cols, tuple(row)))
+
+    @classmethod
+    def from_csv(cls, path):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            return cls(header, (r for r in reader if r))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def _index(self, key_of, records=None):
+        idx = {}
+        for r in self.records if records is None else records:
+            k = key_of(r)
+            if k and k not in idx:
+                idx[k] = r
+        return idx
+
+    @cached_property
+    def by_name(self):
+        return self._index(lambda r: (r.get("Tool") or "").strip().lower())
+
+    @cached_property
+    def by_moniker(self):
+        return self._index(lambda r: (r.get("Moniker") or "").strip().lower())
+
+    @cached_property
+    def by_url(self):
+        return self._index(lambda r: url_key(r.get("Website URL")))
+
+    @cached_property
+    def by_repo(self):
+        return self._index(lambda r: repo_of(r.get("Repo URL")))
+
+    @cached_property
+    def approved(self):
+        return [r for r in self.records if (r.get("Status") or "").lower() != "pending_review"]
+
+    @cached_property
+    def pending(self):
+        return [r for r in self.records if (r.get("Status") or "").lower() == "pending_review"]
+
+    @cached_property
+    def with_feed(self):
+        return [r for r in self.approved if r.get("Feed URL") not in ("", "N/A", None)]
+
+    @cached_property
+    def approved_by_name(self):
+        return self._index(lambda r: (r.get("Tool") or "").strip().lower(), self.approved)
+
+    def find_name(self, name):
+        return self.by_name.get((name or "").strip().lower())
+
+    def find_url(self, url):
+        return self.by_url.get(url_key(url))
+
+    def dicts(self):
+        return [r.as_dict() for r in self.records]
+
+def _parse_registry(path):
+    # A plain function: datacache matches cache entries by parser identity, and
+    # ToolRegistry.from_csv is a new bound method on every access
+    return ToolRegistry.from_csv(path)
+
+def load_registry(path):
+    """Shared ToolRegistry for tools.csv at path (empty when the file is missing)."""
+    return datacache.load_parsed(path, _parse_registry) or ToolRegistry([], [])
@@ -1,5 +1,8 @@
 #!/usr/bin/env python
 import argparse, csv, json
+import metrics, news_log
+from latest_index import INDEX_PATH, load_index, build_index, mark_applied, save_index
+from tool_registry import header_columns
 def latest_per_tool(items):
     by={}
     for it in items:
@@ -7,49 +10,65 @@ def latest_per_tool(items):
         if k not in by or it["date"]>by[k]["date"]:
             by[k]=it
     return by
-def main():
+def status_of(item):
+    return f'{item.get("severity", "Minor")}: {item.get("headline", "")} ({item.get("date", "")})'
+def load_full_index(log_path):
+    # Fallback when harvest hasn't built the index yet: one streamed scan of the log.
+    try:
+        return build_index(news_log.latest_per_tool(log_path).values())
+    except FileNotFoundError:
+        print(f"Log file not found at {log_path}. No statuses will be updated.")
+    except (json.JSONDecodeError, ValueError):
+        print(f"Error decoding JSON from {log_path}. No statuses will be updated.")
+    return None
+@metrics.instrumented("tracker")
+def main(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument("--tracker", required=True, help="Input CSV file for tool tracking")
     ap.add_argument("--log", required=True, help="Input JSON file with news items")
     ap.add_argument("--out", required=True, help="Output CSV file")
-    args = ap.parse_args()
+    ap.add_argument("--index", default=INDEX_PATH, help="latest_per_tool.json maintained by harvest")
+    args = ap.parse_args(argv)
 
-    # Load the latest news items
-    try:
-        with open(args.log, "r", encoding="utf-8") as f:
-            log = json.load(f)
-        latest = latest_per_tool(log.get("items", []))
-    except FileNotFoundError:
-        print(f"Log file not found at {args.log}. No statuses will be updated.")
-        latest = {}
-    except json.JSONDecodeError:
-        print(f"Error decoding JSON from {args.log}. No statuses will be updated.")
-        latest = {}
+    # Only tools whose latest item changed since the last tracker run need a new Status
+    idx = load_index(args.index)
+    if idx is None:
+        idx = load_full_index(args.log)
+    pending = set(idx["pending"]) if idx else set()
+    latest = idx["tools"] if idx else {}
 
-    # Read the tracker CSV, update statuses, and clean the data
+    # Read the tracker CSV, update statuses of pending tools, and clean the data
+    changed = 0
     try:
-        with open(args.tracker, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-
-            # Sanitize fieldnames to remove any None keys from blank columns
-            original_fields = reader.fieldnames or []
-            clean_fields = [field for field in original_fields if field is not None]
+        with open(args.tracker, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
 
+            # Sanitize fieldnames to remove blank trailing columns; rows are sliced by
+            # position, so a blank column in the middle stays
+            clean_fields = header_columns(header)
+            dirty = clean_fields != header
             if "Status" not in clean_fields:
                 clean_fields.append("Status")
+                dirty = True
+            width = len(clean_fields)
+            tool_col = clean_fields.index("Tool") if "Tool" in clean_fields else None
+            status_col = clean_fields.index("Status")
 
             updated_rows = []
             for row in reader:
-                # Create a new row dictionary, filtering out the None key if it exists
-                clean_row = {k: v for k, v in row.items() if k is not None}
-
-                tool_name = clean_row.get("Tool")
-                if tool_name:
+                if len(row) != width:
+                    row = (row + [""] * width)[:width]
+                    dirty = True
+                tool_name = row[tool_col] if tool_col is not None else ""
+                if tool_name in pending:
                     latest_item = latest.get(tool_name)
                     if latest_item:
-                        clean_row["Status"] = f'{latest_item.get("severity", "Minor")}: {latest_item.get("headline", "")} ({latest_item.get("date", "")})'
-
-                updated_rows.append(clean_row)
+                        status = status_of(latest_item)
+                        if row[status_col] != status:
+                            row[status_col] = status
+                            changed += 1
+                updated_rows.append(row)
     except FileNotFoundError:
         print(f"Tracker file not found at {args.tracker}. Cannot proceed.")
         return
@@ -57,15 +76,25 @@ def main():
         print(f"An unexpected error occurred while reading {args.tracker}: {e}")
         return
 
-    # Write the cleaned and updated data back to the output file
-    try:
-        with open(args.out, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=clean_fields)
-            writer.writeheader()
-            writer.writerows(updated_rows)
-        print(f"Successfully updated tracker status and wrote to {args.out}.")
-    except Exception as e:
-        print(f"An unexpected error occurred while writing to {args.out}: {e}")
+    metrics.count("statuses_changed", changed)
+
+    # Write back only when something actually changed (or a different output was asked for)
+    if changed or dirty or args.out != args.tracker:
+        try:
+            with open(args.out, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(clean_fields)
+                writer.writerows(updated_rows)
+            print(f"Successfully updated {changed} tracker status(es) and wrote to {args.out}.")
+        except Exception as e:
+            print(f"An unexpected error occurred while writing to {args.out}: {e}")
+            return
+    else:
+        print(f"No tracker statuses changed ({len(pending)} tool(s) with new items). {args.out} left untouched.")
+
+    if idx is not None:
+        mark_applied(idx, pending)
+        save_index(idx, args.index)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# PSAI: WebSub subscriber, so feeds that advertise a hub push new entries
+# instead of waiting for the daily poll.
+#
+# harvest notes every feed whose XML (<atom:link rel="hub">) or Link header
+# names a hub in data/websub_hubs.json. The subscriber runs on a host the hubs
+# can reach:
+#
+#   python scripts/websub.py serve --callback-url https://psai.example.org/websub --port 8790
+#
+# Every PSAI_WEBSUB_CHECK_S seconds (default 300) it subscribes to the hub
+# feeds it has no subscription for, renews leases in their last quarter, and
+# unsubscribes from feeds no longer listed. Each subscription gets its own
+# callback path and HMAC secret; the hub's verification GET must name the
+# topic and mode we asked for, and pushed content without a valid
+# X-Hub-Signature is acknowledged and dropped. Accepted pushes are appended to
+# .psai/websub_queue.jsonl, which harvest drains before polling; harvest skips
+# polling a feed while its subscription is verified and unexpired, except for
+# a safety poll once every PSAI_WEBSUB_SAFETY_POLL_H hours (default 168).
+# Feeds without a hub, or whose hub denied or never verified us, are polled as
+# before. For minute-level latency run `psai.py run --from harvest
+# --drain-only` from cron; it only processes the queue.
+#
+# .psai/websub_subs.json (written by serve only; holds the secrets, never committed):
+#   {"subs": {callback_id: {"feed", "topic", "hub", "secret", "want", "state",
+#                           "requested", "attempts", "lease", "expires", "error"}}}
+#
+# scripts/standin_server.py also acts as a hub (subscribe, unsubscribe and
+# hub.mode=publish), so the whole loop can be run locally.
+
+import argparse, hmac, json, os, re, secrets, threading, time
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+
+try:
+    import fcntl
+except ImportError:  # POSIX only; elsewhere the queue is appended to unlocked
+    fcntl = None
+
+HUBS_PATH = os.getenv("PSAI_WEBSUB_HUBS", "data/websub_hubs.json")
+SUBS_PATH = os.getenv("PSAI_WEBSUB_SUBS", ".psai/websub_subs.json")
+QUEUE_PATH = os.getenv("PSAI_WEBSUB_QUEUE", ".psai/websub_queue.jsonl")
+CALLBACK_URL = os.getenv("PSAI_WEBSUB_CALLBACK", "")
+LEASE_S = int(os.getenv("PSAI_WEBSUB_LEASE_S", str(10 * 86400)))
+CHECK_S = float(os.getenv("PSAI_WEBSUB_CHECK_S", "300"))
+SAFETY_POLL_H = float(os.getenv("PSAI_WEBSUB_SAFETY_POLL_H", "168"))
+RETRY_S = 3600
+MAX_ATTEMPTS = 5
+ATOM_LINK = "{http://www.w3.org/2005/Atom}link"
+LINK_RX = re.compile(r'<([^>]+)>\s*;[^,]*?\brel="?([^";,]+)"?')
+SIG_ALGOS = ("sha1", "sha256", "sha384", "sha512")
+TS = "%Y-%m-%dT%H:%M:%SZ"
+
+def _now():
+    return datetime.now(timezone.utc)
+
+def _parse(s):
+    try:
+        return datetime.strptime(s, TS).replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+def _load(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return default
+
+def _save(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+# --- harvest side ---
+
+def hub_links(root, headers=None):
+    """(hub, self) URLs advertised by a parsed feed or its Link header; hub is None when there is none."""
+    hub = topic = None
+    for m in LINK_RX.finditer((headers or {}).get("Link", "") or ""):
+        rels = m.group(2).split()
+        if "hub" in rels:
+            hub = hub or m.group(1).strip()
+        if "self" in rels:
+            topic = topic or m.group(1).strip()
+    for el in root.iter():
+        if el.tag not in (ATOM_LINK, "link"):
+            continue
+        href = (el.get("href") or "").strip()
+        if href and el.get("rel") == "hub":
+            hub = hub or href
+        elif href and el.get("rel") == "self":
+            topic = topic or href
+    return hub, topic
+
+class Hubs:
+    """Feeds seen advertising a hub: {feed_url: {"hub", "topic"}}; written by harvest."""
+    def __init__(self, path=HUBS_PATH):
+        self.path = path
+        self.feeds = _load(path, {}).get("feeds", {}) if path else {}
+        self.changed = False
+        self.lock = threading.Lock()
+
+    def note(self, feed_url, hub, topic=None):
+        with self.lock:
+            if hub:
+                rec = {"hub": hub, "topic": topic or feed_url}
+                if self.feeds.get(feed_url) != rec:
+                    self.feeds[feed_url] = rec
+                    self.changed = True
+            elif self.feeds.pop(feed_url, None) is not None:
+                self.changed = True
+
+    def keep(self, feed_urls):
+        """Forgets feeds no longer tracked, so serve unsubscribes from them."""
+        gone = set(self.feeds) - set(feed_urls)
+        for u in gone:
+            del self.feeds[u]
+        self.changed = self.changed or bool(gone)
+
+    def save(self):
+        if self.path and self.changed:
+            _save(self.path, {"feeds": self.feeds})
+            self.changed = False
+
+def pushed_feeds(path=SUBS_PATH, health=None, now=None):
+    """Feeds harvest need not poll: verified, unexpired subscriptions whose last poll is within SAFETY_POLL_H."""
+    now = now or _now()
+    health = health or {}
+    out = set()
+    for s in _load(path, {}).get("subs", {}).values():
+        if s.get("want") != "subscribe" or s.get("state") != "active" or (_parse(s.get("expires")) or now) <= now:
+            continue
+        last = _parse(health.get(s["feed"], {}).get("last_success"))
+        if last and now - last < timedelta(hours=SAFETY_POLL_H):
+            out.add(s["feed"])
+    return out
+
+def _append(path, line):
+    """Appends one line under an exclusive lock, following a rename by drain()."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    while True:
+        with open(path, "a", encoding="utf-8") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    if os.fstat(f.fileno()).st_ino != os.stat(path).st_ino:
+                        continue  # drained meanwhile: write to the new file
+                except FileNotFoundError:
+                    continue
+            f.write(line)
+            return
+
+def drain(path=QUEUE_PATH):
+    """Pushed notifications not yet harvested, as [(feed_url, body)]; call drained() once they are saved.
+
+    The queue is moved aside first, so pushes arriving meanwhile go to a new
+    file; a batch left over by a failed run is returned again."""
+    work = path + ".draining"
+    if os.path.exists(path) and not os.path.exists(work):
+        os.replace(path, work)
+    if not os.path.exists(work):
+        return []
+    out = []
+    with open(work, "r", encoding="utf-8") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_SH)  # waits for a push written just before the rename
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            out.append((rec.get("feed", ""), rec.get("body", "")))
+    return out
+
+def drained(path=QUEUE_PATH):
+    try:
+        os.remove(path + ".draining")
+    except FileNotFoundError:
+        pass
+
+# --- subscriber ---
+
+class Subscriber:
+    def __init__(self, callback_url, subs_path=SUBS_PATH, hubs_path=HUBS_PATH, queue_path=QUEUE_PATH, lease=LEASE_S):
+        self.callback = callback_url.rstrip("/")
+        self.subs_path, self.hubs_path, self.queue_path = subs_path, hubs_path, queue_path
+        self.lease = lease
+        self.subs = _load(subs_path, {}).get("subs", {})
+        self.lock = threading.Lock()
+
+    def save(self):
+        with self.lock:
+            os.makedirs(os.path.dirname(self.subs_path) or ".", exist_ok=True)
+            _save(self.subs_path, {"subs": self.subs})
+
+    def due(self, now):
+        """[(callback_id, mode)] requests to send now; updates the subscription table."""
+        hubs = _load(self.hubs_path, {}).get("feeds", {})
+        out = []
+        with self.lock:
+            current = {}
+            for cb, s in list(self.subs.items()):
+                want = hubs.get(s["feed"])
+                if s["want"] == "subscribe" and (want is None or (want["hub"], want["topic"]) != (s["hub"], s["topic"])):
+                    s.update(want="unsubscribe", attempts=0, requested="")  # feed dropped, or its hub moved
+                if s["want"] == "subscribe":
+                    current[s["feed"]] = cb
+            for feed, h in hubs.items():
+                if feed not in current:
+                    cb = secrets.token_urlsafe(12)
+                    self.subs[cb] = {"feed": feed, "topic": h["topic"], "hub": h["hub"], "secret": secrets.token_hex(20),
+                                     "want": "subscribe", "state": "new", "requested": "", "attempts": 0}
+            for cb, s in list(self.subs.items()):
+                requested = _parse(s.get("requested"))
+                # Retry hourly, then daily once a hub has ignored or denied us a few times
+                wait = RETRY_S if s.get("attempts", 0) < MAX_ATTEMPTS and s.get("state") != "denied" else 24 * 3600
+                waited = requested is None or (now - requested).total_seconds() >= wait
+                if s["want"] == "unsubscribe":
+                    if s.get("state") != "active" or s.get("attempts", 0) >= MAX_ATTEMPTS:
+                        del self.subs[cb]  # nothing confirmed, or the hub doesn't answer: let the lease lapse
+                    elif waited:
+                        out.append((cb, "unsubscribe"))
+                elif s.get("state") == "active":
+                    expires = _parse(s.get("expires")) or now
+                    if (expires - now).total_seconds() < s.get("lease", self.lease) / 4 and waited:
+                        out.append((cb, "subscribe"))
+                elif waited:
+                    out.append((cb, "subscribe"))
+        return out
+
+    def request(self, cb, mode, now):
+        import httpclient  # needs requests; only the subscriber loop loads it
+        s = self.subs[cb]
+        data = {"hub.mode": mode, "hub.topic": s["topic"], "hub.callback": f"{self.callback}/{cb}"}
+        if mode == "subscribe":
+            data.update({"hub.secret": s["secret"], "hub.lease_seconds": str(self.lease)})
+        try:
+            r = httpclient.post(s["hub"], data=data)
+            err = "" if 200 <= r.status_code < 300 else f"hub answered {r.status_code}: {r.text[:200]}"
+        except Exception as e:
+            err = f"{type(e).__name__}: {e}"
+        with self.lock:
+            s.update(requested=now.strftime(TS), attempts=s.get("attempts", 0) + 1, error=err)
+        print(f"  {'!' if err else '>'} {mode} {s['topic']} via {s['hub']}{': ' + err if err else ''}")
+
+    def sync(self, now=None):
+        now = now or _now()
+        for cb, mode in self.due(now):
+            self.request(cb, mode, now)
+        self.save()
+
+    def verify(self, cb, q):
+        """Answers a hub's verification GET: (status, body)."""
+        mode, topic = q.get("hub.mode", ""), q.get("hub.topic", "")
+        with self.lock:
+            s = self.subs.get(cb)
+            if s is None or topic != s["topic"]:
+                return 404, b""
+            if mode == "denied":
+                s.update(state="denied", error=q.get("hub.reason", "denied by hub"))
+            elif mode != s["want"] or not q.get("hub.challenge"):
+                return 404, b""
+            elif mode == "unsubscribe":
+                del self.subs[cb]
+            else:
+                lease = int(q.get("hub.lease_seconds") or self.lease)
+                now = _now()
+                s.update(state="active", lease=lease, expires=(now + timedelta(seconds=lease)).strftime(TS),
+                         verified=now.strftime(TS), attempts=0, error="")
+        self.save()
+        print(f"  + {mode} verified for {topic}")
+        return 200, q.get("hub.challenge", "").encode("utf-8")
+
+    def receive(self, cb, body, signature):
+        """Takes a content distribution POST: queues it when the signature checks out. Returns the status."""
+        with self.lock:
+            s = dict(self.subs.get(cb) or {})
+        if not s or s.get("want") != "subscribe":
+            return 410  # tells the hub to drop this callback
+        algo, _, digest = (signature or "").partition("=")
+        if algo not in SIG_ALGOS or not hmac.compare_digest(hmac.new(s["secret"].encode(), body, algo).hexdigest(), digest):
+            print(f"  ! dropped push for {s['topic']}: bad or missing X-Hub-Signature")
+            return 202  # acknowledged, as the spec asks, but ignored
+        _append(self.queue_path, json.dumps({"feed": s["feed"], "topic": s["topic"], "received": _now().strftime(TS),
+                                             "body": body.decode("utf-8", "replace")}, ensure_ascii=False) + "\n")
+        print(f"  + queued {len(body)} bytes pushed for {s['topic']}")
+        return 202
+
+def make_handler(sub):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "psai-websub/1.0"
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, status, body=b""):
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            u = urlsplit(self.path)
+            self._send(*sub.verify(u.path.rstrip("/").rsplit("/", 1)[-1], dict(parse_qsl(u.query))))
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            cb = urlsplit(self.path).path.rstrip("/").rsplit("/", 1)[-1]
+            self._send(sub.receive(cb, body, self.headers.get("X-Hub-Signature")))
+    return Handler
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="WebSub subscriber for hub-enabled feeds")
+    sp = ap.add_subparsers(dest="cmd", required=True)
+    s = sp.add_parser("serve", help="Receive hub callbacks and keep subscriptions current")
+    s.add_argument("--callback-url", default=CALLBACK_URL, help="Public URL hubs reach this server at (PSAI_WEBSUB_CALLBACK)")
+    s.add_argument("--host", default="0.0.0.0")
+    s.add_argument("--port", type=int, default=8790)
+    s.add_argument("--every", type=float, default=CHECK_S, help="Seconds between subscription checks")
+    s.add_argument("--lease", type=int, default=LEASE_S, help="Lease to ask hubs for, in seconds")
+    s.add_argument("--base-url", default=os.getenv("PSAI_BASE_URL", ""), help="Send hub requests to a stand-in server")
+    sp.add_parser("status", help="List subscriptions")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "status":
+        for cb, x in sorted(_load(SUBS_PATH, {}).get("subs", {}).items(), key=lambda kv: kv[1]["feed"]):
+            print(f"{x['state']:8} {x['want']:11} {x.get('expires', '-'):20} {x['feed']}  via {x['hub']}"
+                  + (f"  ({x['error']})" if x.get("error") else ""))
+        return
+    if not args.callback_url:
+        ap.error("--callback-url (or PSAI_WEBSUB_CALLBACK) is required")
+    if args.base_url:
+        import httpclient
+        httpclient.set_base_url(args.base_url)
+    sub = Subscriber(args.callback_url, lease=args.lease)
+    httpd = ThreadingHTTPServer((args.host, args.port), make_handler(sub))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    print(f"WebSub callbacks on http://{args.host}:{httpd.server_address[1]} as {sub.callback}/<id> (Ctrl-C to stop)")
+    try:
+        while True:
+            sub.sync()
+            time.sleep(args.every)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Offline smoke test: runs the build steps of the psai DAG (each through its
+# Step argv) on a copy of data/ in a temp directory and checks they succeed.
+#
+#   python -m unittest discover -s tests
+
+import os, shutil, subprocess, sys, tempfile, unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PSAI = os.path.join(ROOT, "scripts", "psai.py")
+BUILD_STEPS = "tracker,build_feed,analytics,search_index,parquet,build_sources,build_articles"
+
+class PipelineSmokeTest(unittest.TestCase):
+    def setUp(self):
+        self.work = tempfile.mkdtemp(prefix="psai-smoke-")
+        data = os.path.join(self.work, "data")
+        os.makedirs(data)
+        src = os.path.join(ROOT, "data")
+        for name, seed in (("tools.csv", "init_tools.csv"), ("sources.csv", "init_sources.csv"),
+                           ("filters.csv", "init_filters.csv"), ("articles.csv", None), ("news_log.json", None)):
+            path = os.path.join(src, name)
+            if not os.path.exists(path) and seed:
+                path = os.path.join(src, seed)
+            if os.path.exists(path):
+                shutil.copyfile(path, os.path.join(data, name))
+            else:
+                open(os.path.join(data, name), "w").close()
+
+    def tearDown(self):
+        shutil.rmtree(self.work, ignore_errors=True)
+
+    def run_psai(self, only):
+        env = dict(os.environ, PSAI_SNAPSHOT_DIR="", PSAI_RUN_ID="", PSAI_BASE_URL="http://127.0.0.1:9")
+        env.pop("PSAI_DATA_DIR", None)
+        p = subprocess.run([sys.executable, PSAI, "run", "--only", only, "--site", "https://smoke.invalid"],
+                           cwd=self.work, env=env, capture_output=True, text=True, timeout=600)
+        self.assertEqual(p.returncode, 0, p.stdout[-4000:] + p.stderr[-4000:])
+        return p.stdout
+
+    def exists(self, *parts):
+        self.assertTrue(os.path.exists(os.path.join(self.work, *parts)), os.path.join(*parts))
+
+    def test_analytics_feeds_sources_page(self):
+        self.run_psai("analytics,build_sources")
+        self.exists("data", "analytics.json")
+        self.exists("public", "sources.json")
+        self.exists("public", "index.html")
+
+    def test_build_steps(self):
+        self.run_psai(BUILD_STEPS)
+        for f in ("feed.json", "rss.xml", "news_feed.html", "sources.html", "sources_table.html", "articles.html"):
+            self.exists("public", f)
+        self.exists("data", "search.sqlite")
+        self.exists("data", "metrics.json")
+
+if __name__ == "__main__":
+    unittest.main()